@@ -0,0 +1,62 @@
+"""Measure how the parallel regression fit scales with the worker count.
+
+Usage:
+    python benchmarks/fit_scaling.py [rows] [max_workers]
+
+Run from the src directory. The pool is started once per worker count
+and warmed up, so the timings exclude process start-up.
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_management.parallelFit import (  # noqa: E402
+    MIN_PARALLEL_ROWS,
+    fit_parallel,
+)
+from data_management.regressionEngine import fit_simple  # noqa: E402
+
+
+def _best_of(function, repeat: int = 3) -> float:
+    """Return the fastest of several timings of function, in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000_000
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count()
+
+    rng = np.random.default_rng(0)
+    x = rng.normal(0.0, 1.0, rows)
+    y = 3.0 * x + 2.0 + rng.normal(0.0, 0.5, rows)
+
+    baseline = _best_of(lambda: fit_simple(x, y))
+    print(f'{rows:,} rows')
+    print(f'{"workers":>8} {"seconds":>9} {"speed-up":>9}')
+    print(f'{1:>8} {baseline:>9.3f} {1.0:>9.2f}')
+
+    workers = 2
+    while workers <= max_workers:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # Smaller inputs are fitted on one core and would not start
+            # the workers
+            warm_up = slice(MIN_PARALLEL_ROWS)
+            fit_parallel(x[warm_up], y[warm_up], workers, pool)
+            elapsed = _best_of(lambda: fit_parallel(x, y, workers, pool))
+        print(f'{workers:>8} {elapsed:>9.3f} {baseline / elapsed:>9.2f}')
+        workers *= 2
+
+
+if __name__ == '__main__':
+    main()
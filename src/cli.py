@@ -0,0 +1,171 @@
+"""
+Command-line interface of the application, for batch jobs without a GUI.
+
+It fits models, scores files and profiles datasets through the
+data_management package, without importing PySide6 or matplotlib. Each
+command imports what it needs when it runs, so help and argument errors
+are immediate; commands reading data still import pandas, which takes
+about half a second. Run it as `python src/cli.py <command> --help`.
+"""
+
+import argparse
+import sys
+from typing import List, Optional
+
+
+def fit(args: argparse.Namespace) -> int:
+    """Fit a model on the columns of a file and optionally save it.
+
+    Without a NaN strategy the file is streamed chunk by chunk, so it does
+    not need to fit in memory, and rows with NaN values are an error.
+    Otherwise the columns are loaded and processed first.
+    """
+    from data_management import DataManager, FileReader, Model, save_model
+
+    reader = FileReader()
+    inputs = args.input[0] if len(args.input) == 1 else args.input
+    columns = args.input + [args.output]
+    model = Model()
+
+    if args.nan == 'error':
+        chunks = reader.iter_chunks(args.file, args.chunk_size, columns,
+                                    args.table)
+        model.create_from_chunks(chunks, inputs, args.output,
+                                 degree=args.degree)
+    else:
+        manager = DataManager(
+            reader.parse_file(args.file, columns=columns, table=args.table))
+        if args.nan == 'delete':
+            manager.delete(columns)
+        else:
+            manager.replace(columns, value=args.nan)
+        model.create_from_data(manager.data, inputs, args.output,
+                               degree=args.degree)
+
+    print(model.formula)
+    print(f'R2: {model.r2:.6f}')
+    print(f'MSE: {model.mse:.6f}')
+
+    if args.save:
+        save_model(
+            file_path=args.save,
+            formula=model.formula,
+            input=model.x_name,
+            output=model.y_name,
+            r2=model.r2,
+            mse=model.mse,
+            description=args.description,
+            slope=model.slope,
+            intercept=model.intercept,
+            inputs=model.x_names,
+            coefficients=model.coefficients,
+            degree=model.degree,
+            statistics=model.statistics
+        )
+    return 0
+
+
+def predict(args: argparse.Namespace) -> int:
+    """Write the predictions of a saved model for every row of a file."""
+    from data_management import load_model
+    from data_management.scoring import score_file
+
+    model = load_model(args.model)
+    rows = score_file(model, args.file, args.output, table=args.table,
+                      keep_columns=not args.inputs_only,
+                      chunk_size=args.chunk_size)
+    print(f'{rows} rows scored')
+    return 0
+
+
+def profile(args: argparse.Namespace) -> int:
+    """Print the column profiles of a file as CSV."""
+    from data_management import DataManager, FileReader
+
+    data = FileReader().parse_file(args.file, columns=args.columns,
+                                   table=args.table)
+    DataManager(data).profile().to_csv(sys.stdout,
+                                       index_label='column')
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Create the parser of the command line.
+
+    Returns:
+        Parser with the fit, predict and profile commands.
+    """
+    parser = argparse.ArgumentParser(
+        description='Fit and apply linear regression models without '
+                    'the graphical interface.'
+    )
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    fit_parser = commands.add_parser(
+        'fit', help='fit a model on the columns of a file')
+    fit_parser.add_argument('file', help='CSV, Excel or SQLite file')
+    fit_parser.add_argument('-i', '--input', action='append', required=True,
+                            help='input column, repeated for several')
+    fit_parser.add_argument('-o', '--output', required=True,
+                            help='output column')
+    fit_parser.add_argument('--degree', type=int, default=1,
+                            help='highest power of the inputs')
+    fit_parser.add_argument('--nan', default='error',
+                            choices=['error', 'delete', 'mean', 'median'],
+                            help='how to handle rows with NaN values')
+    fit_parser.add_argument('--save', help='file where the model is saved')
+    fit_parser.add_argument('--description', default='',
+                            help='description saved with the model')
+    fit_parser.set_defaults(handler=fit)
+
+    predict_parser = commands.add_parser(
+        'predict', help='score every row of a file with a saved model')
+    predict_parser.add_argument('model', help='saved model file')
+    predict_parser.add_argument('file', help='CSV, Excel or SQLite file')
+    predict_parser.add_argument('-o', '--output', required=True,
+                                help='CSV file written')
+    predict_parser.add_argument('--inputs-only', action='store_true',
+                                help='write only the inputs and '
+                                     'predictions')
+    predict_parser.set_defaults(handler=predict)
+
+    profile_parser = commands.add_parser(
+        'profile', help='print summary statistics of the columns')
+    profile_parser.add_argument('file', help='CSV, Excel or SQLite file')
+    profile_parser.add_argument('-c', '--column', action='append',
+                                dest='columns',
+                                help='column to profile, all by default')
+    profile_parser.set_defaults(handler=profile)
+
+    for command in (fit_parser, predict_parser, profile_parser):
+        command.add_argument('--table',
+                             help='table of SQLite files, the first one '
+                                  'by default')
+    for command in (fit_parser, predict_parser):
+        command.add_argument('--chunk-size', type=int, default=100_000,
+                             help='rows processed at a time')
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run a command of the command line.
+
+    Args:
+        argv: Arguments after the program name, those of the process by
+            default (optional).
+
+    Returns:
+        Exit status, 0 on success and 1 if the command failed.
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        return args.handler(args)
+    except Exception as e:
+        print(f'{parser.prog} {args.command}: error: {e}', file=sys.stderr)
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
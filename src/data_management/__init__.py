@@ -1,15 +1,20 @@
 # dataManagement/__init__.py
 from data_management.dataManager import DataManager
-from data_management.fileReader import FileReader, ParseError
+from data_management.datasetCache import DatasetCache
+from data_management.fileReader import FileReader, ParseError, LoadCancelled
+from data_management.sqliteReader import SQLiteReader
 from data_management.linearRegression import Model, UnexpectedError
 from data_management.modelFileManager import save_model, load_model
 
 __all__ = [
     "DataManager",
     "FileReader",
+    "DatasetCache",
+    "SQLiteReader",
     "Model",
     "save_model",
     "load_model",
     "UnexpectedError",
-    "ParseError"
+    "ParseError",
+    "LoadCancelled"
 ]
\ No newline at end of file
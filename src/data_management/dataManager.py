@@ -1,12 +1,128 @@
 """Module for managing data operations and transformations.
 
 This module provides a DataManager class for handling data operations,
-including NaN detection and handling.
+including NaN detection and handling. Each operation records a Change
+describing what it modified, so views can update only what changed.
+
+Operations are kept in a history of versions that can be undone and
+redone. Only the cells an operation changed are stored: the positions of
+the filled cells with their fill values, or the removed rows. Columns an
+operation does not touch are shared between versions.
+
+Column profiles (NaN counts, range, mean, median) are cached by version
+and only recomputed for the columns an operation touched.
 """
 
-from typing import List, Union, Optional
+import warnings
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple, Union
+
+import numpy as np
 import pandas as pd
 
+from data_management import imputation
+from data_management.profiling import ColumnProfile, profile_columns
+
+
+class Change(NamedTuple):
+    """Description of the last modification of the data.
+
+    Attributes:
+        kind: 'fill' when values of some columns were replaced, 'delete'
+            when rows were removed or 'insert' when removed rows were
+            restored.
+        columns: Names of the columns whose values were replaced.
+        rows: Positions of the removed rows in the previous data, or of
+            the restored rows in the new data.
+    """
+
+    kind: str
+    columns: Tuple[str, ...] = ()
+    rows: Optional[np.ndarray] = None
+
+
+def _write(column: pd.Series, positions: np.ndarray,
+           values: np.ndarray) -> pd.Series:
+    """Return a copy of a column with values written at some positions.
+
+    Float columns keep their dtype; other columns become float64.
+    """
+    dtype = column.dtype
+    if not (isinstance(dtype, np.dtype) and dtype.kind == 'f'):
+        dtype = np.float64
+    array = column.to_numpy(dtype=dtype, na_value=np.nan, copy=True)
+    array[positions] = values
+    return pd.Series(array, index=column.index, name=column.name)
+
+
+class _Version:
+    """A state of the data in the history of a DataManager.
+
+    A version stores the operation leading to it from its parent: the
+    fill value, or values, and filled positions of each column, or the positions
+    and values of the removed rows. It also caches the profiles and the
+    NaN counts of the columns of its data.
+    """
+
+    def __init__(self, number: int, parent: Optional['_Version'] = None,
+                 kind: Optional[str] = None,
+                 fills: Optional[Dict[str, Tuple[object, np.ndarray]]] = None,
+                 rows: Optional[np.ndarray] = None,
+                 removed: Optional[pd.DataFrame] = None):
+        self.number = number
+        self.parent = parent
+        self.kind = kind
+        self.fills = fills
+        self.rows = rows
+        self.removed = removed
+        self.profiles = {}
+        self.nan_counts = {}
+        # Child reached by redo, the last one created or left by undo
+        self.next = None
+
+    def apply(self, data: pd.DataFrame) -> Tuple[pd.DataFrame, Change]:
+        """Apply the operation of this version to the data of its parent."""
+        if self.kind == 'fill':
+            # Only the filled columns are copied, the others are shared
+            data = data.copy(deep=False)
+            for column, (value, positions) in self.fills.items():
+                if np.ndim(value) == 0:
+                    values = data[column]
+                    # Categorical columns only accept known categories
+                    if (isinstance(values.dtype, pd.CategoricalDtype)
+                            and value not in values.cat.categories):
+                        values = values.cat.add_categories([value])
+                    data[column] = values.fillna(value)
+                else:
+                    data[column] = _write(data[column], positions, value)
+            return data, Change('fill', tuple(self.fills))
+
+        keep = np.ones(len(data), dtype=bool)
+        keep[self.rows] = False
+        return (data[keep].reset_index(drop=True),
+                Change('delete', rows=self.rows))
+
+    def revert(self, data: pd.DataFrame) -> Tuple[pd.DataFrame, Change]:
+        """Restore the data of the parent from the data of this version."""
+        if self.kind == 'fill':
+            data = data.copy(deep=False)
+            for column, (_, positions) in self.fills.items():
+                values = data[column].copy()
+                values.iloc[positions] = np.nan
+                data[column] = values
+            return data, Change('fill', tuple(self.fills))
+
+        kept = len(data)
+        rows = len(self.rows)
+        order = np.ones(kept + rows, dtype=bool)
+        order[self.rows] = False
+        positions = np.empty(kept + rows, dtype=np.intp)
+        positions[order] = np.arange(kept)
+        positions[self.rows] = np.arange(kept, kept + rows)
+
+        combined = pd.concat([data, self.removed], ignore_index=True)
+        return (combined.iloc[positions].reset_index(drop=True),
+                Change('insert', rows=self.rows))
+
 
 class DataManager:
     """Class for managing data operations and transformations.
@@ -14,6 +130,11 @@ class DataManager:
     This class implements methods and variables needed by the application
     for operating with user-loaded data and maintains the data model
     shown on the interface.
+
+    Setting new data starts a new history. Each delete or replace that
+    changes the data creates a version; undo and redo move between a
+    version and its parent, and an operation made after an undo starts a
+    new branch, so every version stays reachable through checkout.
     """
 
     def __init__(self, data: Optional[pd.DataFrame] = None):
@@ -23,6 +144,8 @@ class DataManager:
             data: Initial pandas DataFrame (optional)
         """
         self._data = data
+        self._last_change = None
+        self._reset_history()
 
     @property
     def data(self) -> pd.DataFrame:
@@ -45,9 +168,138 @@ class DataManager:
         """
         if isinstance(new_data, pd.DataFrame):
             self._data = new_data
+            self._last_change = None
+            self._reset_history()
         else:
             raise ValueError('Data must be a pandas DataFrame')
 
+    def _reset_history(self) -> None:
+        """Start a new history with the current data as its only version."""
+        self._current = _Version(0)
+        self._versions = {0: self._current}
+
+    def _commit(self, version: _Version, data: pd.DataFrame,
+                change: Change) -> None:
+        """Make a new version, child of the current one, current."""
+        if change.kind == 'fill':
+            version.profiles = {
+                column: profile
+                for column, profile in self._current.profiles.items()
+                if column not in change.columns
+            }
+            version.nan_counts = {
+                column: count
+                for column, count in self._current.nan_counts.items()
+                if column not in change.columns
+            }
+        self._versions[version.number] = version
+        self._current.next = version
+        self._current = version
+        self._data = data
+        self._last_change = change
+
+    @property
+    def version(self) -> int:
+        """Get the number of the current version, 0 for the loaded data."""
+        return self._current.number
+
+    def versions(self) -> Dict[int, Optional[int]]:
+        """List the versions of the history.
+
+        Returns:
+            Dictionary mapping each version number to the number of its
+            parent, None for the loaded data
+        """
+        return {
+            number: version.parent.number if version.parent else None
+            for number, version in self._versions.items()
+        }
+
+    @property
+    def can_undo(self) -> bool:
+        """Whether the current version has a parent to go back to."""
+        return self._current.parent is not None
+
+    @property
+    def can_redo(self) -> bool:
+        """Whether an undone version can be applied again."""
+        return self._current.next is not None
+
+    def undo(self) -> bool:
+        """Go back to the parent of the current version.
+
+        Returns:
+            True if an operation was undone
+        """
+        if not self.can_undo:
+            return False
+
+        version = self._current
+        self._data, self._last_change = version.revert(self._data)
+        self._current = version.parent
+        self._current.next = version
+        return True
+
+    def redo(self) -> bool:
+        """Apply again the last undone operation.
+
+        Returns:
+            True if an operation was redone
+        """
+        if not self.can_redo:
+            return False
+
+        self._current = self._current.next
+        self._data, self._last_change = self._current.apply(self._data)
+        return True
+
+    def checkout(self, number: int) -> None:
+        """Move to any version of the history.
+
+        The operations are undone up to the closest common ancestor and
+        applied again down to the requested version.
+
+        Args:
+            number: Number of the version
+
+        Raises:
+            ValueError: If the version does not exist
+        """
+        if number not in self._versions:
+            raise ValueError(f'unknown version: {number}')
+
+        target = self._versions[number]
+        path = []
+        ancestors = set()
+        version = target
+        while version is not None:
+            ancestors.add(version)
+            path.append(version)
+            version = version.parent
+
+        steps = 0
+        while self._current not in ancestors:
+            self.undo()
+            steps += 1
+
+        for version in reversed(path[:path.index(self._current)]):
+            self._current.next = version
+            self.redo()
+            steps += 1
+
+        if steps > 1:
+            self._last_change = None
+
+    @property
+    def last_change(self) -> Optional[Change]:
+        """Get the change made by the last operation.
+
+        Returns:
+            The Change of the last delete or replace, or None if the data
+            was replaced as a whole
+        """
+        return self._last_change
+
     def get_columns(self, index: int) -> str:
         """Get column name by index.
 
@@ -63,14 +315,51 @@ class DataManager:
     def detect(self, column: str) -> int:
         """Count NaN values in a column.
 
+        The count is read from the column profile if there is one;
+        otherwise only this column is counted, and the count is cached
+        until an operation changes the column.
+
         Args:
             column: Name of the column to examine
 
         Returns:
             Number of NaN values in the column
         """
-        nan_count = self._data[column].isna().sum()
-        return nan_count
+        profiles = self._current.profiles
+        if column in profiles:
+            return profiles[column].nan_count
+
+        counts = self._current.nan_counts
+        if column not in counts:
+            counts[column] = int(self._data[column].isna().sum())
+        return counts[column]
+
+    def profile(self, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Get summary statistics of columns.
+
+        Columns without a cached profile are profiled together, in
+        batches of columns; the profiles are kept until an operation
+        changes them.
+
+        Args:
+            columns: Names of the columns, every column by default
+                (optional)
+
+        Returns:
+            DataFrame indexed by column name with the fields of
+            ColumnProfile as columns
+        """
+        if columns is None:
+            columns = list(self._data.columns)
+
+        profiles = self._current.profiles
+        missing = [column for column in columns if column not in profiles]
+        if missing:
+            profiles.update(profile_columns(self._data, missing))
+
+        return pd.DataFrame.from_records(
+            [profiles[column] for column in columns],
+            index=list(columns), columns=ColumnProfile._fields)
 
     def delete(self, columns: List[str]) -> None:
         """Delete rows containing NaN values in specified columns.
@@ -78,14 +367,56 @@ class DataManager:
         Args:
             columns: List of column names whose NaN rows should be removed
         """
-        new_df = self._data.dropna(subset=columns)
-        new_df.reset_index(drop=True, inplace=True)
-        self._data = new_df
+        missing = self._data[columns].isna().any(axis=1).to_numpy()
+        rows = np.flatnonzero(missing)
+        if len(rows) == 0:
+            self._last_change = Change('delete', rows=rows)
+            return
+
+        version = _Version(len(self._versions), self._current, 'delete',
+                           rows=rows, removed=self._data.iloc[rows])
+        self._commit(version, *version.apply(self._data))
+
+    def _statistic(self, columns: List[str], statistic: str) -> List[float]:
+        """Compute the mean or median of columns, ignoring NaN values.
+
+        Cached profiles are used when available; the other columns are
+        reduced together in one NumPy call.
+
+        Args:
+            columns: Names of numeric columns
+            statistic: 'mean' or 'median'
+
+        Returns:
+            The statistic of each column
+        """
+        profiles = self._current.profiles
+        uncached = [col for col in columns if col not in profiles]
+        computed = {}
+
+        if uncached:
+            block = self._data[uncached].to_numpy(dtype=np.float64,
+                                                  na_value=np.nan)
+            reduce = np.nanmean if statistic == 'mean' else np.nanmedian
+            # Columns without values give NaN with a warning
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', RuntimeWarning)
+                computed = dict(zip(uncached,
+                                    reduce(block, axis=0).tolist()))
+
+        return [
+            computed[col] if col in computed
+            else getattr(profiles[col], statistic)
+            for col in columns
+        ]
 
     def replace(self, columns: List[str], 
                 value: Union[str, int, float] = 'mean') -> None:
         """Replace NaN values in specified columns.
 
+        The NaN values of every column are found with one mask and only
+        the columns holding some are copied and filled.
+
         Args:
             columns: List of columns whose values should be replaced
             value: Replacement strategy or value:
@@ -93,22 +424,162 @@ class DataManager:
                   'median' - replace with column median
                   number - replace with specific value
         """
-        nan_cols = [col for col in columns if self.detect(col) > 0]
+        if not (value in ('mean', 'median')
+                or isinstance(value, (int, float))):
+            self._last_change = Change('fill')
+            return
 
+        # One mask gives both the columns to fill and the cells to fill
+        missing = self._data[columns].isna().to_numpy()
+        filled = np.flatnonzero(missing.any(axis=0))
+        nan_cols = [columns[i] for i in filled]
 
-        if value == 'mean':
-            replacement_values = [self._data[col].mean() for col in nan_cols]
-        elif value == 'median':
-            replacement_values = [self._data[col].median() for col in nan_cols]
-        elif isinstance(value, (int, float)):
-            replacement_values = [value for _ in nan_cols]
-        else:
+        if not nan_cols:
+            self._last_change = Change('fill')
             return
 
-        col_value_dict = dict(zip(nan_cols, replacement_values))
+        if isinstance(value, str):
+            replacement_values = self._statistic(nan_cols, value)
+        else:
+            replacement_values = [value for _ in nan_cols]
+
+        fills = {
+            col: (fill, np.flatnonzero(missing[:, i]))
+            for col, fill, i in zip(nan_cols, replacement_values, filled)
+        }
 
         try:
-            new_df = self._data.fillna(col_value_dict)
-            self._data = new_df
+            version = _Version(len(self._versions), self._current, 'fill',
+                               fills=fills)
+            self._commit(version, *version.apply(self._data))
         except:
-            raise Exception  # Maintain current state if replacement fails
\ No newline at end of file
+            raise Exception  # Maintain current state if replacement fails
+
+    @staticmethod
+    def _coordinates(values: pd.Series) -> np.ndarray:
+        """Convert a numeric or time column to float64, NaN where missing."""
+        if pd.api.types.is_datetime64_any_dtype(values):
+            coordinates = values.to_numpy(dtype='datetime64[ns]')
+            return np.where(np.isnat(coordinates), np.nan,
+                            coordinates.astype(np.int64).astype(np.float64))
+        return values.to_numpy(dtype=np.float64, na_value=np.nan)
+
+    def impute(self, columns: List[str], method: str,
+               by: Optional[str] = None, limit: Optional[int] = None,
+               progress: Optional[Callable[[int, int, int], None]] = None,
+               cancel: Optional[Callable[[], bool]] = None) -> None:
+        """Impute NaN values of numeric columns with a kernel of imputation.
+
+        Values a method cannot estimate, such as those before the first
+        known value of an interpolation, stay NaN. The imputation is a
+        version of the history like replace, and can be undone. It is
+        compute_imputation followed by apply_imputation.
+
+        Args:
+            columns: List of columns whose values should be imputed
+            method: One of imputation.METHODS, see compute_imputation
+            by: Column used by the time, group_mean and regression methods
+            limit: Largest number of consecutive values filled by ffill and
+                bfill (optional)
+            progress: Callback receiving rows processed, work done and
+                total work (optional)
+            cancel: Callable returning True to abort (optional)
+
+        Raises:
+            LoadCancelled: If the imputation was cancelled through cancel
+            ValueError: If the method is unknown or lacks its by column
+        """
+        self.apply_imputation(self.compute_imputation(
+            columns, method, by, limit, progress, cancel))
+
+    def compute_imputation(
+            self, columns: List[str], method: str,
+            by: Optional[str] = None, limit: Optional[int] = None,
+            progress: Optional[Callable[[int, int, int], None]] = None,
+            cancel: Optional[Callable[[], bool]] = None
+    ) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+        """Compute the values imputing NaN values, leaving the data as is.
+
+        The data is only read, so the computation can run in a worker
+        thread as long as nothing replaces the data meanwhile. The result
+        is written by apply_imputation.
+
+        Args:
+            columns: List of columns whose values should be imputed
+            method: One of imputation.METHODS:
+                  'linear' - interpolate between neighbouring rows
+                  'time' - interpolate along the time column by
+                  'ffill' - propagate the last known value
+                  'bfill' - propagate the next known value
+                  'group_mean' - mean of the rows with the same value of by
+                  'regression' - linear regression on the column by
+            by: Column used by the time, group_mean and regression methods
+            limit: Largest number of consecutive values filled by ffill and
+                bfill (optional)
+            progress: Callback receiving rows processed, work done and
+                total work (optional)
+            cancel: Callable returning True to abort (optional)
+
+        Returns:
+            Dictionary mapping each column with imputed values to those
+            values and their positions
+
+        Raises:
+            LoadCancelled: If the imputation was cancelled through cancel
+            ValueError: If the method is unknown or lacks its by column
+        """
+        if method not in imputation.METHODS:
+            raise ValueError(f'unknown imputation method: {method}')
+        if imputation.METHODS[method] and by is None:
+            raise ValueError(
+                f'{method} imputation needs a {imputation.METHODS[method]}')
+
+        data = self._data
+        missing = data[columns].isna().to_numpy()
+        nan_cols = [columns[i] for i in np.flatnonzero(missing.any(axis=0))]
+
+        kernels = {
+            'linear': lambda v, **k: imputation.interpolate(v, **k),
+            'time': lambda v, **k: imputation.interpolate(
+                v, self._coordinates(data[by]), **k),
+            'ffill': lambda v, **k: imputation.fill_forward(v, limit, **k),
+            'bfill': lambda v, **k: imputation.fill_backward(v, limit, **k),
+            'group_mean': lambda v, **k: imputation.group_mean(
+                v, data[by], **k),
+            'regression': lambda v, **k: imputation.regression_fill(
+                v, self._coordinates(data[by]), **k),
+        }
+
+        fills = {}
+        for i, col in enumerate(nan_cols):
+            column_progress = None
+            if progress is not None:
+                # Progress over every column rather than the current one
+                column_progress = (
+                    lambda rows, done, total, i=i: progress(
+                        rows, i * total + done, len(nan_cols) * total))
+
+            values = data[col].to_numpy(dtype=np.float64, na_value=np.nan)
+            imputed = kernels[method](values, progress=column_progress,
+                                      cancel=cancel)
+            positions = np.flatnonzero(np.isnan(values) & ~np.isnan(imputed))
+            if len(positions):
+                fills[col] = (imputed[positions], positions)
+
+        return fills
+
+    def apply_imputation(
+            self, fills: Dict[str, Tuple[np.ndarray, np.ndarray]]) -> None:
+        """Write the values of compute_imputation as a new version.
+
+        Args:
+            fills: Imputed values and positions of each column, computed
+                from the current data
+        """
+        if not fills:
+            self._last_change = Change('fill')
+            return
+
+        version = _Version(len(self._versions), self._current, 'fill',
+                           fills=fills)
+        self._commit(version, *version.apply(self._data))
@@ -0,0 +1,194 @@
+"""Module for caching parsed datasets in a columnar binary format.
+
+This module provides a DatasetCache class that stores the DataFrames
+parsed by FileReader as uncompressed Feather (Arrow IPC) files, so they
+can be memory-mapped on later loads instead of being parsed again.
+pyarrow is an optional dependency: without it the cache is disabled.
+"""
+
+import hashlib
+import os
+from pathlib import Path
+from typing import List, Optional
+
+import pandas as pd
+
+try:
+    import pyarrow.feather as feather
+except ImportError:  # pragma: no cover - depends on the environment
+    feather = None
+
+
+# Default location and size limit of the cache
+DEFAULT_CACHE_DIR = Path.home() / '.cache' / 'trendline' / 'datasets'
+DEFAULT_MAX_BYTES = 4 * 1024 ** 3
+
+# Bytes hashed at the start and at the end of every source file
+_SAMPLE_BYTES = 1024 ** 2
+
+
+class DatasetCache:
+    """Content-addressed on-disk cache of parsed datasets.
+
+    Entries are keyed by the absolute path, modification time and size
+    of the source file plus a hash of its first and last megabyte, so
+    any change to the file produces a new key. Least recently used
+    entries are evicted once the cache grows beyond max_bytes.
+    """
+
+    def __init__(self, directory: Optional[str] = None,
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        """Initialize the cache.
+
+        Args:
+            directory: Folder where entries are stored (optional).
+            max_bytes: Maximum total size of the stored entries.
+        """
+        self._directory = Path(directory or DEFAULT_CACHE_DIR)
+        self._max_bytes = max_bytes
+
+    @property
+    def available(self) -> bool:
+        """Whether pyarrow is installed and the cache can be used."""
+        return feather is not None
+
+    @property
+    def directory(self) -> Path:
+        """Get the folder where entries are stored."""
+        return self._directory
+
+    def key(self, file_name: str) -> str:
+        """Compute the cache key of a source file.
+
+        Args:
+            file_name: Path to the source file.
+
+        Returns:
+            Hexadecimal digest identifying the current file contents.
+        """
+        path = Path(file_name).resolve()
+        stat = path.stat()
+
+        digest = hashlib.sha256()
+        digest.update(str(path).encode())
+        digest.update(f'{stat.st_mtime_ns}:{stat.st_size}'.encode())
+
+        with open(path, 'rb') as handle:
+            digest.update(handle.read(_SAMPLE_BYTES))
+            if stat.st_size > 2 * _SAMPLE_BYTES:
+                handle.seek(-_SAMPLE_BYTES, os.SEEK_END)
+                digest.update(handle.read(_SAMPLE_BYTES))
+
+        return digest.hexdigest()
+
+    def _entry_path(self, key: str, columns: Optional[List[str]],
+                    table: Optional[str] = None) -> Path:
+        """Return the file storing a full or column-projected entry."""
+        if table is not None:
+            key = f'{key}-{hashlib.sha256(table.encode()).hexdigest()[:16]}'
+        if columns is not None:
+            projection = hashlib.sha256(
+                '\x00'.join(map(str, columns)).encode()).hexdigest()[:16]
+            key = f'{key}-{projection}'
+        return self._directory / f'{key}.feather'
+
+    def get(self, file_name: str, columns: Optional[List[str]] = None,
+            table: Optional[str] = None) -> Optional[pd.DataFrame]:
+        """Load a cached dataset, memory-mapping its file.
+
+        A projected request is served from the full entry if it exists,
+        reading only the requested columns.
+
+        Args:
+            file_name: Path to the source file.
+            columns: Subset of columns to load (optional).
+            table: Table of a SQLite source file (optional).
+
+        Returns:
+            The cached DataFrame, or None if it is not cached.
+        """
+        if not self.available:
+            return None
+
+        try:
+            key = self.key(file_name)
+        except OSError:
+            return None
+
+        candidates = [self._entry_path(key, None, table)]
+        if columns is not None:
+            candidates.append(self._entry_path(key, columns, table))
+
+        for entry in candidates:
+            if not entry.exists():
+                continue
+            try:
+                arrow_table = feather.read_table(entry, columns=columns,
+                                                 memory_map=True)
+                df = arrow_table.to_pandas(split_blocks=True)
+            except Exception:
+                continue
+            os.utime(entry)
+            return df
+
+        return None
+
+    def put(self, file_name: str, data: pd.DataFrame,
+            columns: Optional[List[str]] = None,
+            table: Optional[str] = None) -> None:
+        """Store a parsed dataset, evicting old entries if needed.
+
+        Caching is best effort: frames that cannot be converted to Arrow
+        are silently skipped.
+
+        Args:
+            file_name: Path to the source file.
+            data: The parsed DataFrame.
+            columns: Subset of columns the frame was projected to (optional).
+            table: Table of a SQLite source file (optional).
+        """
+        if not self.available:
+            return
+
+        partial = None
+        try:
+            entry = self._entry_path(self.key(file_name), columns, table)
+            self._directory.mkdir(parents=True, exist_ok=True)
+            partial = entry.with_suffix(f'.{os.getpid()}.tmp')
+            feather.write_feather(data.reset_index(drop=True), partial,
+                                  compression='uncompressed')
+            os.replace(partial, entry)
+        except Exception:
+            if partial is not None and partial.exists():
+                partial.unlink()
+            return
+
+        self._evict()
+
+    def _evict(self) -> None:
+        """Remove least recently used entries beyond the size limit."""
+        entries = []
+        for entry in self._directory.glob('*.feather'):
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries):
+            if total <= self._max_bytes:
+                break
+            try:
+                entry.unlink()
+                total -= size
+            except OSError:
+                pass
+
+    def clear(self) -> None:
+        """Remove every entry of the cache."""
+        for entry in self._directory.glob('*.feather'):
+            try:
+                entry.unlink()
+            except OSError:
+                pass
@@ -0,0 +1,87 @@
+"""Module for shrinking the memory footprint of parsed DataFrames.
+
+This module provides an optimize_dtypes function that downcasts the
+columns of a DataFrame to the narrowest dtype able to hold their values
+without losing information.
+"""
+
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401
+    _ARROW_STRINGS = True
+except ImportError:  # pragma: no cover - depends on the environment
+    _ARROW_STRINGS = False
+
+
+def _memory(data: pd.DataFrame) -> int:
+    """Return the bytes used by a DataFrame, including string contents."""
+    return int(data.memory_usage(index=True, deep=True).sum())
+
+
+def _downcast_float(column: pd.Series) -> pd.Series:
+    """Convert a float64 column to float32 only if no value changes."""
+    narrow = column.astype(np.float32)
+    if np.array_equal(narrow.to_numpy(dtype=np.float64),
+                      column.to_numpy(dtype=np.float64), equal_nan=True):
+        return narrow
+    return column
+
+
+def _optimize_strings(column: pd.Series, category_ratio: float,
+                      arrow_strings: bool) -> pd.Series:
+    """Store a text column as a categorical or an Arrow-backed string."""
+    if pd.api.types.infer_dtype(column, skipna=True) != 'string':
+        return column
+
+    if column.nunique(dropna=True) <= category_ratio * len(column):
+        return column.astype('category')
+    if isinstance(column.dtype, pd.StringDtype):
+        return column
+    if arrow_strings and _ARROW_STRINGS:
+        return column.astype(pd.StringDtype('pyarrow'))
+    return column
+
+
+def optimize_dtypes(data: pd.DataFrame, category_ratio: float = 0.5,
+                    arrow_strings: bool = True) -> Tuple[pd.DataFrame, int]:
+    """Downcast the columns of a DataFrame to smaller dtypes.
+
+    Integer columns get the narrowest integer type holding their range,
+    float columns become float32 when every value is exactly
+    representable, and text columns become categoricals when they have
+    few distinct values or Arrow-backed strings otherwise. Values never
+    change, so code needing float64 precision can cast back safely.
+
+    Args:
+        data: DataFrame to optimize. It is not modified.
+        category_ratio: Maximum ratio of distinct values to rows for a
+            text column to become categorical.
+        arrow_strings: Whether to use Arrow-backed strings when pyarrow
+            is installed.
+
+    Returns:
+        Tuple with the optimized DataFrame and the number of bytes saved.
+    """
+    before = _memory(data)
+    optimized = data.copy(deep=False)
+
+    for position in range(data.shape[1]):
+        column = data.iloc[:, position]
+
+        if pd.api.types.is_bool_dtype(column):
+            continue
+        elif pd.api.types.is_integer_dtype(column):
+            column = pd.to_numeric(column, downcast='integer')
+        elif pd.api.types.is_float_dtype(column):
+            column = _downcast_float(column)
+        elif (pd.api.types.is_object_dtype(column)
+              or pd.api.types.is_string_dtype(column)):
+            column = _optimize_strings(column, category_ratio, arrow_strings)
+
+        optimized.isetitem(position, column)
+
+    return optimized, before - _memory(optimized)
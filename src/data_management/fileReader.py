@@ -1,11 +1,18 @@
 """Module for reading various file formats into pandas DataFrames."""
 
+import os
+import sys
 import pandas as pd
 from pandas import DataFrame
-import sqlite3
+from contextlib import contextmanager
 from pathlib import Path
+from typing import Callable, Iterator, List, Optional
 import time
 
+from data_management.datasetCache import DatasetCache
+from data_management.dtypeOptimizer import optimize_dtypes
+from data_management.sqliteReader import SQLiteReader
+
 
 class ParseError(Exception):
     """Custom error for unsupported file formats."""
@@ -15,16 +22,51 @@ class FormatError(Exception):
     """Custom error for unsupported file formats."""
     pass
 
+class LoadCancelled(Exception):
+    """Raised when the caller cancels a streaming read."""
+    pass
+
+
+def _is_database_error(error: Exception) -> bool:
+    """Whether an error was raised by sqlite3.
+
+    sqlite3 is only imported once a database has been opened, so errors
+    raised before cannot come from it.
+    """
+    sqlite3 = sys.modules.get('sqlite3')
+    return sqlite3 is not None and isinstance(error, sqlite3.DatabaseError)
+
+
+def _in_order(data: DataFrame, columns: Optional[List[str]]) -> DataFrame:
+    """Put the columns of a projected read in the requested order.
+
+    usecols keeps the order of the file, whereas SQLite queries and the
+    dataset cache return the requested order; every read uses the latter.
+    """
+    return data if columns is None else data[list(columns)]
+
 
 class FileReader:
     """Parses files and converts them into pandas DataFrames.
     
-    Supports CSV, Excel, and SQLite database files.
+    Supports CSV, Excel, and SQLite database files. Parsed frames can be
+    stored in a DatasetCache so repeated loads skip parsing.
     """
 
-    def __init__(self):
-        """Initialize FileReader with allowed file extensions."""
+    def __init__(self, cache: Optional[DatasetCache] = None):
+        """Initialize FileReader with allowed file extensions.
+
+        Args:
+            cache: Cache of previously parsed datasets (optional).
+        """
         self._allowed_extensions = {'.csv', '.xlsx', '.xls', '.db', '.sqlite'}
+        self._cache = cache
+        self._bytes_saved = 0
+
+    @property
+    def bytes_saved(self) -> int:
+        """Get the bytes saved by dtype optimization on the last parse."""
+        return self._bytes_saved
 
     def _check_format(self, extension: str) -> None:
         """Validate if file format is supported.
@@ -38,47 +80,226 @@ class FileReader:
         if extension not in self._allowed_extensions:
             raise FormatError
 
-    def parse_file(self, file_name: str) -> DataFrame:
+    @contextmanager
+    def _parse_errors(self) -> Iterator[None]:
+        """Translate low-level reading errors into ParseError.
+
+        Raises:
+            LoadCancelled: Passed through unchanged.
+            ParseError: For any other error raised inside the block.
+        """
+        try:
+            yield
+        except LoadCancelled:
+            raise
+        except FormatError:
+            raise ParseError('ERROR: unsupported file format')
+        except pd.errors.EmptyDataError:
+            raise ParseError('ERROR: This file might be empty or corrupted')
+        except pd.errors.ParserError:
+            raise ParseError('ERROR: this file could not be parsed')
+        except FileNotFoundError:
+            raise ParseError('ERROR: file not found')
+        except Exception as e:
+            if _is_database_error(e):
+                raise ParseError(
+                    'ERROR: an error occurred with your database')
+            raise ParseError(f'ERROR: unknown error, could not read file')
+
+    def _iter_csv(self, file_name: str, chunk_size: int,
+                  progress: Optional[Callable[[int, int, int], None]] = None,
+                  cancel: Optional[Callable[[], bool]] = None,
+                  columns: Optional[List[str]] = None
+                  ) -> Iterator[DataFrame]:
+        """Read a CSV file in chunks, reporting progress after each one.
+
+        Args:
+            file_name: Path to the CSV file.
+            chunk_size: Number of rows per chunk.
+            progress: Optional callback receiving rows read, bytes read
+                and total bytes of the file.
+            cancel: Optional callable, checked before every chunk, that
+                returns True when the read must be aborted.
+            columns: Optional subset of columns to keep.
+
+        Yields:
+            DataFrame chunks of at most chunk_size rows.
+
+        Raises:
+            LoadCancelled: If cancel returns True part-way.
+        """
+        total_bytes = os.path.getsize(file_name)
+        rows_read = 0
+
+        with open(file_name, 'rb') as handle:
+            with pd.read_csv(handle, chunksize=chunk_size,
+                             usecols=columns) as reader:
+                for chunk in reader:
+                    if cancel is not None and cancel():
+                        raise LoadCancelled
+                    rows_read += len(chunk)
+                    if progress is not None:
+                        progress(rows_read, handle.tell(), total_bytes)
+                    yield _in_order(chunk, columns)
+
+    def iter_chunks(self, file_name: str, chunk_size: int = 100_000,
+                    columns: Optional[List[str]] = None,
+                    table: Optional[str] = None,
+                    progress: Optional[Callable[[int, int, int], None]] = None,
+                    cancel: Optional[Callable[[], bool]] = None
+                    ) -> Iterator[DataFrame]:
+        """Stream a file chunk by chunk without building the full frame.
+
+        CSV files and SQLite tables are streamed; Excel files cannot be
+        read partially and are yielded as a single chunk.
+
+        Args:
+            file_name: Path to the file to be read.
+            chunk_size: Number of rows per chunk.
+            columns: Subset of columns to read (optional).
+            table: Table to read from SQLite files (optional).
+            progress: Callback receiving rows read, bytes read and total
+                bytes after every chunk (optional).
+            cancel: Callable returning True to abort the read (optional).
+
+        Yields:
+            DataFrame chunks of at most chunk_size rows.
+
+        Raises:
+            LoadCancelled: If the read was cancelled through cancel.
+            ParseError: If the file could not be read.
+        """
+        extension = Path(file_name).suffix
+
+        with self._parse_errors():
+            self._check_format(extension)
+
+            if extension == '.csv':
+                yield from self._iter_csv(file_name, chunk_size, progress,
+                                          cancel, columns)
+            elif extension in {'.xls', '.xlsx'}:
+                yield _in_order(pd.read_excel(file_name, usecols=columns),
+                                columns)
+            elif extension in {'.db', '.sqlite'}:
+                with SQLiteReader(file_name) as database:
+                    yield from database.iter_chunks(
+                        table, columns, chunk_size=chunk_size,
+                        progress=progress, cancel=cancel)
+
+    def read_columns(self, file_name: str,
+                     table: Optional[str] = None) -> List[str]:
+        """Read only the column names of a file, without loading its rows.
+
+        Args:
+            file_name: Path to the file to inspect.
+            table: Table to inspect in SQLite files, the first one by
+                default (optional).
+
+        Returns:
+            List with the column names in file order.
+
+        Raises:
+            ParseError: If the file could not be read.
+        """
+        extension = Path(file_name).suffix
+
+        with self._parse_errors():
+            self._check_format(extension)
+
+            if extension == '.csv':
+                header = pd.read_csv(file_name, nrows=0)
+            elif extension in {'.xls', '.xlsx'}:
+                header = pd.read_excel(file_name, nrows=0)
+            elif extension in {'.db', '.sqlite'}:
+                with SQLiteReader(file_name) as database:
+                    return database.columns(table)
+
+            return list(header.columns)
+
+    def parse_file(self, file_name: str, chunk_size: Optional[int] = None,
+                   progress: Optional[Callable[[int, int, int], None]] = None,
+                   cancel: Optional[Callable[[], bool]] = None,
+                   columns: Optional[List[str]] = None,
+                   optimize: bool = False,
+                   table: Optional[str] = None) -> DataFrame:
         """Parse the given file into a pandas DataFrame.
+
+        When chunk_size is given, CSV files and SQLite tables are streamed
+        chunk by chunk so the caller can follow the progress and cancel the read. When
+        columns is given, only those columns are loaded. If the reader
+        has a cache, cached frames are returned without parsing and new
+        ones are stored. When optimize is True, columns are downcast to
+        smaller dtypes and the savings are available in bytes_saved; text
+        columns become categoricals or stay object columns, so missing
+        values keep behaving as NaN.
         
         Args:
             file_name: Path to the file to be parsed.
+            chunk_size: Rows per chunk for streamed CSV reading (optional).
+            progress: Callback receiving rows read, bytes read and total
+                bytes after every chunk (optional).
+            cancel: Callable returning True to abort the read (optional).
+            columns: Subset of columns to load (optional).
+            optimize: Whether to downcast the parsed columns (optional).
+            table: Table to read from SQLite files, the first one by
+                default (optional).
             
         Returns:
             DataFrame containing the parsed data.
             
         Raises:
+            LoadCancelled: If the read was cancelled through cancel.
             Various exceptions based on file reading errors.
         """
+        self._bytes_saved = 0
+        df = self._load(file_name, chunk_size, progress, cancel, columns,
+                        table)
+
+        if optimize:
+            df, self._bytes_saved = optimize_dtypes(df, arrow_strings=False)
+
+        return df
+
+    def _load(self, file_name: str, chunk_size: Optional[int],
+              progress: Optional[Callable[[int, int, int], None]],
+              cancel: Optional[Callable[[], bool]],
+              columns: Optional[List[str]],
+              table: Optional[str]) -> DataFrame:
+        """Read a file through the cache, see parse_file for the arguments."""
         extension = Path(file_name).suffix
 
-        try:
+        with self._parse_errors():
             self._check_format(extension)
 
-            if extension == '.csv':
-                df = pd.read_csv(file_name)
+            if self._cache is not None:
+                df = self._cache.get(file_name, columns, table)
+                if df is not None:
+                    if progress is not None:
+                        size = os.path.getsize(file_name)
+                        progress(len(df), size, size)
+                    return df
+
+            if extension == '.csv' and chunk_size:
+                chunks = list(self._iter_csv(file_name, chunk_size,
+                                             progress, cancel, columns))
+                df = pd.concat(chunks, ignore_index=True)
+            elif extension == '.csv':
+                df = _in_order(pd.read_csv(file_name, usecols=columns),
+                               columns)
             elif extension in {'.xls', '.xlsx'}:
-                df = pd.read_excel(file_name)
+                df = _in_order(pd.read_excel(file_name, usecols=columns),
+                               columns)
+            elif extension in {'.db', '.sqlite'} and chunk_size:
+                with SQLiteReader(file_name) as database:
+                    chunks = list(database.iter_chunks(
+                        table, columns, chunk_size=chunk_size,
+                        progress=progress, cancel=cancel))
+                df = pd.concat(chunks, ignore_index=True)
             elif extension in {'.db', '.sqlite'}:
-                conn = sqlite3.connect(file_name)
-                query = "SELECT name FROM sqlite_master WHERE type='table';"
-                table_name = pd.read_sql(query, conn).iloc[0, 0]
-                df = pd.read_sql(f'SELECT * FROM {table_name};', conn)
-                conn.close()
+                with SQLiteReader(file_name) as database:
+                    df = database.read(table, columns)
 
-            return df
+            if self._cache is not None:
+                self._cache.put(file_name, df, columns, table)
 
-        except FormatError:
-            raise ParseError('ERROR: unsupported file format')
-        except pd.errors.EmptyDataError:
-            raise ParseError('ERROR: This file might be empty or corrupted')
-        except pd.errors.ParserError:
-            raise ParseError('ERROR: this file could not be parsed')
-        except sqlite3.DatabaseError:
-            raise ParseError('ERROR: an error occurred with your database')
-        except sqlite3.OperationalError:
-            raise ParseError('ERROR: could not access your database')
-        except FileNotFoundError:
-            raise ParseError('ERROR: file not found')
-        except Exception as e:
-            raise ParseError(f'ERROR: unknown error, could not read file')
\ No newline at end of file
+            return df
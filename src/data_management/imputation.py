@@ -0,0 +1,241 @@
+"""Module for imputing missing values with vectorized kernels.
+
+This module provides the imputation strategies used by
+DataManager.impute: linear and time interpolation, forward and backward
+fill with an optional limit, means by group of a key column and
+predictions of a simple regression on another column. Every kernel works
+on float64 arrays by chunks of rows with NumPy operations only, so it
+scales to frames of tens of millions of rows, and reports its progress
+and checks for cancellation between chunks, like FileReader does.
+"""
+
+from typing import Callable, Optional
+
+import numpy as np
+import pandas as pd
+
+from data_management.fileReader import LoadCancelled
+from data_management.regressionEngine import RegressionAccumulator
+
+
+# Rows processed at a time between progress reports
+IMPUTE_CHUNK = 1_000_000
+
+# Strategies accepted by impute and the other column each one needs
+METHODS = {
+    'linear': None,
+    'time': 'time column',
+    'ffill': None,
+    'bfill': None,
+    'group_mean': 'group column',
+    'regression': 'predictor column',
+}
+
+
+class _Steps:
+    """Report the rows processed by a kernel and honour cancellation."""
+
+    def __init__(self, total: int,
+                 progress: Optional[Callable[[int, int, int], None]],
+                 cancel: Optional[Callable[[], bool]],
+                 passes: int = 1):
+        """Initialize the counter.
+
+        Args:
+            total: Number of rows of the column.
+            progress: Callback receiving rows processed, work done and
+                total work (optional).
+            cancel: Callable returning True to abort (optional).
+            passes: Number of times the kernel goes over the rows.
+        """
+        self._total = total
+        self._work = total * passes
+        self._done = 0
+        self._progress = progress
+        self._cancel = cancel
+
+    def chunks(self):
+        """Yield slices of IMPUTE_CHUNK rows, checking cancel before each.
+
+        Raises:
+            LoadCancelled: If cancel returns True part-way.
+        """
+        for start in range(0, self._total, IMPUTE_CHUNK):
+            if self._cancel is not None and self._cancel():
+                raise LoadCancelled
+            stop = min(start + IMPUTE_CHUNK, self._total)
+            yield slice(start, stop)
+            self._done += stop - start
+            if self._progress is not None:
+                self._progress(min(self._done, self._total), self._done,
+                               self._work)
+
+
+def interpolate(values: np.ndarray, x: Optional[np.ndarray] = None,
+                progress=None, cancel=None) -> np.ndarray:
+    """Fill missing values linearly between the values around them.
+
+    Values before the first or after the last known value are left
+    missing.
+
+    Args:
+        values: Values to fill, NaN where missing.
+        x: Coordinate of each row, such as a time stamp; the row
+            positions by default (optional). Rows where it is NaN are
+            neither used nor filled.
+        progress: Progress callback (optional).
+        cancel: Cancellation callback (optional).
+
+    Returns:
+        New array with the missing values filled.
+    """
+    result = values.copy()
+    if x is None:
+        x = np.arange(len(values), dtype=np.float64)
+
+    known = ~np.isnan(values) & ~np.isnan(x)
+    xp, fp = x[known], values[known]
+    if not len(xp):
+        return result
+    if np.any(np.diff(xp) < 0):
+        order = np.argsort(xp, kind='stable')
+        xp, fp = xp[order], fp[order]
+
+    steps = _Steps(len(values), progress, cancel)
+    for rows in steps.chunks():
+        xs = x[rows]
+        wanted = np.isnan(values[rows]) & (xs >= xp[0]) & (xs <= xp[-1])
+        result[rows][wanted] = np.interp(xs[wanted], xp, fp)
+    return result
+
+
+def fill_forward(values: np.ndarray, limit: Optional[int] = None,
+                 progress=None, cancel=None) -> np.ndarray:
+    """Fill missing values with the last known value before them.
+
+    Args:
+        values: Values to fill, NaN where missing.
+        limit: Largest number of consecutive missing values filled after
+            a known value, all of them by default (optional).
+        progress: Progress callback (optional).
+        cancel: Cancellation callback (optional).
+
+    Returns:
+        New array with the missing values filled.
+    """
+    result = values.copy()
+    # Position of the last known value, carried over from previous chunks
+    last = -1
+
+    steps = _Steps(len(values), progress, cancel)
+    for rows in steps.chunks():
+        chunk = values[rows]
+        positions = np.arange(rows.start, rows.stop)
+        source = np.where(np.isnan(chunk), -1, positions)
+        np.maximum.accumulate(source, out=source)
+        np.maximum(source, last, out=source)
+        if len(source):
+            last = source[-1]
+
+        wanted = np.isnan(chunk) & (source >= 0)
+        if limit is not None:
+            wanted &= positions - source <= limit
+        result[rows][wanted] = values[source[wanted]]
+    return result
+
+
+def fill_backward(values: np.ndarray, limit: Optional[int] = None,
+                  progress=None, cancel=None) -> np.ndarray:
+    """Fill missing values with the first known value after them.
+
+    Args:
+        values: Values to fill, NaN where missing.
+        limit: Largest number of consecutive missing values filled before
+            a known value, all of them by default (optional).
+        progress: Progress callback (optional).
+        cancel: Cancellation callback (optional).
+
+    Returns:
+        New array with the missing values filled.
+    """
+    return fill_forward(values[::-1], limit, progress, cancel)[::-1].copy()
+
+
+def group_mean(values: np.ndarray, keys: pd.Series,
+               progress=None, cancel=None) -> np.ndarray:
+    """Fill missing values with the mean of the rows sharing their key.
+
+    Rows without a key, or whose group has no known value, are left
+    missing.
+
+    Args:
+        values: Values to fill, NaN where missing.
+        keys: Group of each row, of any type.
+        progress: Progress callback (optional).
+        cancel: Cancellation callback (optional).
+
+    Returns:
+        New array with the missing values filled.
+    """
+    codes, uniques = pd.factorize(keys, use_na_sentinel=True)
+    groups = len(uniques) + 1
+    # Rows without a key are counted in an extra last group
+    codes = np.where(codes < 0, groups - 1, codes)
+
+    sums = np.zeros(groups)
+    counts = np.zeros(groups)
+    steps = _Steps(len(values), progress, cancel, passes=2)
+    for rows in steps.chunks():
+        chunk = values[rows]
+        known = ~np.isnan(chunk)
+        sums += np.bincount(codes[rows][known], chunk[known],
+                            minlength=groups)
+        counts += np.bincount(codes[rows][known], minlength=groups)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = sums / counts
+    means[-1] = np.nan
+
+    result = values.copy()
+    for rows in steps.chunks():
+        wanted = np.isnan(values[rows])
+        result[rows][wanted] = means[codes[rows][wanted]]
+    return result
+
+
+def regression_fill(values: np.ndarray, predictor: np.ndarray,
+                    progress=None, cancel=None) -> np.ndarray:
+    """Fill missing values with a linear regression on another column.
+
+    The regression is fitted on the rows where both columns are known.
+    Rows where the predictor is missing are left missing.
+
+    Args:
+        values: Values to fill, NaN where missing.
+        predictor: Values of the independent variable.
+        progress: Progress callback (optional).
+        cancel: Cancellation callback (optional).
+
+    Returns:
+        New array with the missing values filled.
+
+    Raises:
+        ValueError: If fewer than two rows have both values.
+    """
+    accumulator = RegressionAccumulator()
+    steps = _Steps(len(values), progress, cancel, passes=2)
+    for rows in steps.chunks():
+        x, y = predictor[rows], values[rows]
+        known = np.isfinite(x) & np.isfinite(y)
+        accumulator.update(x[known], y[known])
+
+    if accumulator.n < 2:
+        raise ValueError('not enough rows to fit the regression')
+    fit = accumulator.result()
+
+    result = values.copy()
+    for rows in steps.chunks():
+        x = predictor[rows]
+        wanted = np.isnan(values[rows]) & np.isfinite(x)
+        result[rows][wanted] = fit.slope * x[wanted] + fit.intercept
+    return result
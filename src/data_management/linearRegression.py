@@ -1,15 +1,62 @@
-"""Module for creating and visualizing linear regression models using scikit-learn."""
-
+"""Module for creating and visualizing linear regression models.
+
+Models have one or several input columns, whose powers up to a degree
+can be added as polynomial terms.
+"""
+
+from typing import (
+    TYPE_CHECKING,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Union,
+)
+
+import numpy as np
 import pandas as pd
-from sklearn.linear_model import LinearRegression
-from sklearn.metrics import r2_score, mean_squared_error
-import matplotlib.pyplot as plt
+
+from data_management.parallelFit import fit_parallel
+from data_management.regressionEngine import (
+    BLOCK_SIZE,
+    FitResult,
+    GramAccumulator,
+    MultipleFitResult,
+    RegressionAccumulator,
+    fit_simple,
+    fit_sklearn,
+    polynomial_features,
+    polynomial_names,
+)
+
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+
 
 class UnexpectedError(Exception):
     """Exception raised for unexpected errors."""
     pass
 
 
+def format_formula(output: str, terms: Sequence[str],
+                   coefficients: Sequence[float], intercept: float) -> str:
+    """Write the formula of a model, e.g. 'y = 2.00 * x + 1.00'.
+
+    Args:
+        output: Name of the dependent variable.
+        terms: Names of the terms.
+        coefficients: Coefficient of each term.
+        intercept: Intercept of the model.
+
+    Returns:
+        The formula with coefficients rounded to two decimals.
+    """
+    products = ''.join(f'{coefficient:.2f} * {term} + '
+                       for term, coefficient in zip(terms, coefficients))
+    return f'{output} = {products}{intercept:.2f}'
+
+
 class Model:
     """Creates and manages linear regression models from datasets."""
 
@@ -19,11 +66,15 @@ class Model:
         self._formula = None
         self._y_name = None
         self._x_name = None
+        self._x_names = None
+        self._degree = None
+        self._coefficients = None
         self._slope = None
         self._intercept = None
         self._description = None
         self._r2 = None
         self._mse = None
+        self._statistics = None
 
         # Temporary attributes
         self._pred_line = None
@@ -57,9 +108,25 @@ class Model:
     def mse(self, value):
         self._mse = value
 
+    @property
+    def statistics(self):
+        """Get fit statistics other than R² and MSE, e.g. rows n."""
+        return self._statistics
+
+    @statistics.setter
+    def statistics(self, value):
+        self._statistics = value
+
     @property
     def pred_line(self):
-        """Get prediction line values."""
+        """Get prediction line values, computed on first access."""
+        if self._pred_line is None and self._independent_value is not None:
+            if self._slope is not None:
+                x = self._independent_value.iloc[:, 0].to_numpy()
+                self._pred_line = self._slope * x + self._intercept
+            else:
+                self._pred_line = self.predict_batch(
+                    self._independent_value)
         return self._pred_line
 
     @pred_line.setter
@@ -84,6 +151,44 @@ class Model:
     def x_name(self, value):
         self._x_name = value
 
+    @property
+    def x_names(self):
+        """Get the names of the input columns."""
+        if self._x_names is None and self._x_name is not None:
+            return [self._x_name]
+        return self._x_names
+
+    @x_names.setter
+    def x_names(self, value):
+        self._x_names = value
+
+    @property
+    def degree(self):
+        """Get the highest power of the input columns in the model."""
+        return self._degree
+
+    @degree.setter
+    def degree(self, value):
+        self._degree = value
+
+    @property
+    def terms(self):
+        """Get the names of the terms multiplied by the coefficients."""
+        if self.x_names is None:
+            return None
+        return polynomial_names(self.x_names, self._degree or 1)
+
+    @property
+    def coefficients(self):
+        """Get the coefficients of the terms, in the order of terms."""
+        if self._coefficients is None and self._slope is not None:
+            return np.array([self._slope], dtype=np.float64)
+        return self._coefficients
+
+    @coefficients.setter
+    def coefficients(self, value):
+        self._coefficients = value
+
     @property
     def independent_value(self):
         """Get independent variable values."""
@@ -129,76 +234,333 @@ class Model:
     def description(self, value):
         self._description = value
 
-    def create_from_data(self, data: pd.DataFrame, input_col: str, 
-                         output_col: str) -> None:
+    def create_from_data(self, data: pd.DataFrame,
+                         input_col: Union[str, Sequence[str]],
+                         output_col: str, backend: str = 'numpy',
+                         workers: Optional[int] = None,
+                         degree: int = 1) -> None:
         """Create a linear regression model from input data.
-        
+
+        The fit is computed in closed form by the NumPy engine; the
+        scikit-learn backend is kept for parity checks. Models with
+        several input columns or polynomial terms are solved from the
+        Gram matrix of their terms, built block by block so only a block
+        of terms is held in memory.
+
         Args:
             data: DataFrame containing the data.
-            input_col: Name of the independent variable column.
+            input_col: Name of the independent variable column, or list of
+                names for a multiple regression.
             output_col: Name of the dependent variable column.
+            backend: 'numpy' (default) or 'sklearn'.
+            workers: Number of processes sharing a NumPy fit, one by
+                default (optional).
+            degree: Highest power of the input columns (optional).
         """
 
         try:
+            if not isinstance(input_col, str) or degree != 1:
+                self._create_multiple(data, input_col, output_col, backend,
+                                      degree)
+                return
+
+            #Work in float64 even if the columns were downcast at load time
+            x = data[input_col].to_numpy(dtype=np.float64)
+            y = data[output_col].to_numpy(dtype=np.float64)
+
             #Fit the model first so it doesn't change the pre-existing model
-            r_model = LinearRegression()
-            r_model.fit(data[[input_col]], data[output_col])
+            if backend == 'sklearn':
+                fit = fit_sklearn(x, y)
+            elif backend == 'numpy' and workers and workers > 1:
+                fit = fit_parallel(x, y, workers)
+            elif backend == 'numpy':
+                fit = fit_simple(x, y)
+            else:
+                raise ValueError(f'unknown backend: {backend}')
+
+            independent_value = pd.DataFrame(
+                {input_col: x}, index=data.index, copy=False)
+            target_value = pd.Series(
+                y, index=data.index, name=output_col, copy=False)
 
             #Start to update
-            self._x_name = input_col
-            self._y_name = output_col
-            self._description = None
+            self._apply_fit(fit, input_col, output_col)
+            self._independent_value = independent_value
+            self._target_value = target_value
 
-            self._independent_value = data[[input_col]]
-            self._target_value = data[output_col]
-            y_pred = r_model.predict(X=self._independent_value)
-            self._pred_line = y_pred
+        except Exception as e:
 
-            self._slope = r_model.coef_[0]
-            self._intercept = r_model.intercept_
+            raise UnexpectedError(e)
 
-            self._mse = mean_squared_error(self._target_value, self._pred_line)
-            self._r2 = r2_score(self._target_value, self._pred_line)
-            self._formula = (
-                f'{self._y_name} = {self._slope:.2f} * {self._x_name} + '
-                f'{self._intercept:.2f}'
-            )
+    def _create_multiple(self, data: pd.DataFrame,
+                         input_cols: Union[str, Sequence[str]],
+                         output_col: str, backend: str, degree: int) -> None:
+        """Fit a model with several terms, see create_from_data."""
+        if backend != 'numpy':
+            raise ValueError(f'{backend} only fits a single input column')
+        if isinstance(input_cols, str):
+            input_cols = [input_cols]
+        input_cols = list(input_cols)
+
+        columns = [data[col].to_numpy(dtype=np.float64) for col in input_cols]
+        y = data[output_col].to_numpy(dtype=np.float64)
+
+        accumulator = GramAccumulator(len(input_cols) * degree)
+        for start in range(0, len(y), BLOCK_SIZE):
+            block = np.column_stack(
+                [column[start:start + BLOCK_SIZE] for column in columns])
+            accumulator.update(polynomial_features(block, degree),
+                               y[start:start + BLOCK_SIZE])
+        fit = accumulator.result()
+
+        independent_value = pd.DataFrame(
+            dict(zip(input_cols, columns)), index=data.index, copy=False)
+        target_value = pd.Series(
+            y, index=data.index, name=output_col, copy=False)
+
+        self._apply_multiple_fit(fit, input_cols, output_col, degree)
+        self._independent_value = independent_value
+        self._target_value = target_value
+
+    def create_from_accumulator(
+            self, accumulator: Union[RegressionAccumulator, GramAccumulator],
+            input_col: Union[str, Sequence[str]], output_col: str,
+            degree: int = 1) -> None:
+        """Create a linear regression model from its sufficient statistics.
+
+        The model keeps no data, so it has no values to plot.
 
+        Args:
+            accumulator: Statistics accumulated over the data, a
+                GramAccumulator of the terms for a multiple regression.
+            input_col: Name of the independent variable column, or list of
+                names for a multiple regression.
+            output_col: Name of the dependent variable column.
+            degree: Highest power of the input columns (optional).
+        """
+        try:
+            fit = accumulator.result()
+            if isinstance(accumulator, GramAccumulator):
+                if isinstance(input_col, str):
+                    input_col = [input_col]
+                self._apply_multiple_fit(fit, list(input_col), output_col,
+                                         degree)
+            else:
+                self._apply_fit(fit, input_col, output_col)
         except Exception as e:
+            raise UnexpectedError(e)
+
+    def create_from_chunks(self, chunks: Iterable[pd.DataFrame],
+                           input_col: Union[str, Sequence[str]],
+                           output_col: str, degree: int = 1) -> None:
+        """Create a linear regression model from a stream of DataFrames.
 
+        Only one chunk is held in memory at a time, so files larger than
+        memory can be fitted, e.g. from FileReader.iter_chunks.
+
+        Args:
+            chunks: Iterable of DataFrames containing both columns.
+            input_col: Name of the independent variable column, or list of
+                names for a multiple regression.
+            output_col: Name of the dependent variable column.
+            degree: Highest power of the input columns (optional).
+        """
+        try:
+            if isinstance(input_col, str) and degree == 1:
+                accumulator = RegressionAccumulator()
+                for chunk in chunks:
+                    accumulator.update(
+                        chunk[input_col].to_numpy(dtype=np.float64),
+                        chunk[output_col].to_numpy(dtype=np.float64)
+                    )
+            else:
+                if isinstance(input_col, str):
+                    input_col = [input_col]
+                accumulator = GramAccumulator(len(input_col) * degree)
+                for chunk in chunks:
+                    accumulator.update(
+                        polynomial_features(
+                            chunk[list(input_col)].to_numpy(dtype=np.float64),
+                            degree),
+                        chunk[output_col].to_numpy(dtype=np.float64)
+                    )
+        except Exception as e:
             raise UnexpectedError(e)
 
-    def get_plot(self) -> plt.Figure:
-        """Create and return a visualization of the regression model.
-        
+        self.create_from_accumulator(accumulator, input_col, output_col,
+                                     degree)
+
+    def _apply_fit(self, fit: FitResult, input_col: str,
+                   output_col: str) -> None:
+        """Store the coefficients and metrics of a fit.
+
+        The data of a previous fit is discarded.
+
+        Args:
+            fit: Result of the fit.
+            input_col: Name of the independent variable column.
+            output_col: Name of the dependent variable column.
+        """
+        self._x_name = input_col
+        self._x_names = [input_col]
+        self._degree = 1
+        self._coefficients = np.array([fit.slope])
+        self._y_name = output_col
+        self._description = None
+
+        self._independent_value = None
+        self._target_value = None
+        self._pred_line = None
+
+        self._slope = fit.slope
+        self._intercept = fit.intercept
+
+        self._mse = fit.mse
+        self._r2 = fit.r2
+        self._statistics = {'n': int(fit.n)}
+        self._formula = format_formula(output_col, [input_col],
+                                       [self._slope], self._intercept)
+
+    def _apply_multiple_fit(self, fit: MultipleFitResult,
+                            input_cols: List[str], output_col: str,
+                            degree: int) -> None:
+        """Store the coefficients and metrics of a multiple fit.
+
+        The data of a previous fit is discarded. Models with more than
+        one term have no slope.
+
+        Args:
+            fit: Result of the fit.
+            input_cols: Names of the independent variable columns.
+            output_col: Name of the dependent variable column.
+            degree: Highest power of the input columns.
+        """
+        self._x_name = ', '.join(input_cols)
+        self._x_names = input_cols
+        self._degree = degree
+        self._coefficients = fit.coefficients
+        self._y_name = output_col
+        self._description = None
+
+        self._independent_value = None
+        self._target_value = None
+        self._pred_line = None
+
+        self._slope = (float(fit.coefficients[0])
+                       if len(fit.coefficients) == 1 else None)
+        self._intercept = fit.intercept
+
+        self._mse = fit.mse
+        self._r2 = fit.r2
+        self._statistics = {'n': int(fit.n)}
+        self._formula = format_formula(output_col, self.terms,
+                                       fit.coefficients, fit.intercept)
+
+    def predict(self, inputs) -> Union[float, np.ndarray]:
+        """Predict the output for values of the input columns.
+
+        Args:
+            inputs: Value of each input column, in the order of x_names,
+                or matrix with one row of values per prediction.
+
         Returns:
-            Matplotlib figure containing the regression plot.
+            The prediction, or an array of predictions for a matrix.
         """
-        fig, ax = plt.subplots(figsize=(10, 6), facecolor=(1, 1, 1, 0))
+        x = np.asarray(inputs, dtype=np.float64)
+        single = x.ndim < 2
+        x = x.reshape(1, -1) if single else x
 
-        ax.scatter(
-            self._independent_value,
-            self._target_value,
-            s=10,
-            color='#c2ffff',
-            alpha=0.7
-        )
-        ax.plot(self._independent_value, self._pred_line, color='#E74C3C')
+        predictions = (polynomial_features(x, self._degree or 1)
+                       @ self.coefficients + self._intercept)
+        return float(predictions[0]) if single else predictions
 
-        ax.set_xlabel(self._x_name, color='#a0a0a0')
-        ax.set_ylabel(self._y_name, color='#a0a0a0')
+    def predict_batch(self, data: Union[np.ndarray, pd.DataFrame,
+                                        Iterable[pd.DataFrame]]
+                      ) -> Union[np.ndarray, Iterator[np.ndarray]]:
+        """Predict the output for many rows at once.
 
-        ax.tick_params(axis='x', colors='#a0a0a0')
-        ax.tick_params(axis='y', colors='#a0a0a0')
+        The terms are added to the predictions one input column at a time,
+        so no matrix of terms is built and the memory used is that of the
+        predictions plus one column.
 
-        ax.spines['top'].set_visible(False)
-        ax.spines['right'].set_visible(False)
-        ax.spines['left'].set_visible(True)
-        ax.spines['bottom'].set_visible(True)
+        Args:
+            data: Array with one column per input, in the order of
+                x_names (a vector for models with one input), DataFrame
+                holding the input columns, or iterable of such DataFrames.
+
+        Returns:
+            Array with one prediction per row, or an iterator yielding one
+            array per chunk for an iterable of DataFrames. Rows with
+            missing inputs are predicted as NaN.
+
+        Raises:
+            ValueError: If the model has not been fitted or the array does
+                not have one column per input.
+        """
+        if self.coefficients is None or self._intercept is None:
+            raise ValueError('the model has not been fitted')
+
+        if isinstance(data, pd.DataFrame):
+            return self._predict_columns(
+                [data[name].to_numpy(dtype=np.float64)
+                 for name in self.x_names])
+
+        if isinstance(data, np.ndarray):
+            x = data.astype(np.float64, copy=False)
+            if x.ndim == 1:
+                x = x[:, None]
+            if x.ndim != 2 or x.shape[1] != len(self.x_names):
+                raise ValueError(
+                    f'expected {len(self.x_names)} input columns')
+            return self._predict_columns(list(x.T))
+
+        return (self.predict_batch(chunk) for chunk in data)
+
+    def _predict_columns(self, columns: List[np.ndarray]) -> np.ndarray:
+        """Evaluate the model on one array per input column."""
+        degree = self._degree or 1
+        # Coefficients are ordered by power, then by input column
+        coefficients = np.reshape(self.coefficients, (degree, len(columns)))
+
+        length = len(columns[0]) if columns else 0
+        predictions = np.full(length, self._intercept, dtype=np.float64)
+        term = np.empty(length, dtype=np.float64)
+        for i, column in enumerate(columns):
+            np.copyto(term, column)
+            for power in range(degree):
+                if power:
+                    term *= column
+                predictions += coefficients[power, i] * term
+        return predictions
+
+    def get_plot(self, max_points: Optional[int] = None,
+                 method: str = 'random',
+                 backend: str = 'scatter') -> 'Figure':
+        """Create and return a visualization of the regression model.
 
-        ax.grid(False)
-        plt.tight_layout()
+        Large datasets are drawn at a bounded level of detail. The
+        scatter backend samples the points, or draws their density, and
+        resamples them from the full data when the plot is zoomed. The
+        raster backend bins every visible point into an image at screen
+        resolution on each redraw. The line is drawn from its two
+        endpoints.
 
-        ax.patch.set_alpha(0.0)
+        Args:
+            max_points: Number of points drawn at most by the scatter
+                backend, MAX_POINTS of the plotting module by default
+                (optional).
+            method: 'random' (default) or 'stratified' sampling.
+            backend: 'scatter' (default) or 'raster'.
 
-        return fig
\ No newline at end of file
+        Returns:
+            Matplotlib figure containing the regression plot.
+        """
+        # Matplotlib is only imported by models that are plotted
+        from data_management.plotting import MAX_POINTS, RegressionPlot
+
+        if max_points is None:
+            max_points = MAX_POINTS
+        plot = RegressionPlot(backend=backend, max_points=max_points,
+                              method=method)
+        plot.update(self)
+        return plot.figure
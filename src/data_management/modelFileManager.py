@@ -1,17 +1,55 @@
-"""Module for handling model file operations using joblib.
-
-This module provides functionality for saving and loading model data
-using joblib serialization.
+"""Module for handling model file operations.
+
+Models are saved in a small versioned binary format that is read without
+unpickling anything:
+
+    header        magic b'TRENDLN\\0', format version (uint16), reserved
+                  flags (uint16), metadata length and number of
+                  coefficients (uint32 each), little-endian
+    metadata      UTF-8 JSON with names, formula, metrics and description
+    coefficients  intercept then the coefficient of each term, float64
+                  little-endian
+    checksum      CRC-32 of everything before it (uint32)
+
+Files saved by earlier versions with joblib are still loaded by a
+compatibility reader, but only when their name has the .joblib extension,
+since reading them unpickles their content.
 """
 
-import joblib
+import json
+import os
+import struct
+import zlib
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
 from data_management import Model
 
 
+# Extension of the files written by save_model
+MODEL_EXTENSION = '.tlm'
+
+# Extension of the legacy files read with joblib
+LEGACY_EXTENSION = '.joblib'
+
+# First bytes of every model file
+MAGIC = b'TRENDLN\0'
+
+# Version written by save_model; load_model reads this one and older ones
+FORMAT_VERSION = 1
+
+# Layout of the header following the magic and of the checksum
+_HEADER = struct.Struct('<8sHHII')
+_CHECKSUM = struct.Struct('<I')
+
+
 def save_model(file_path: str, formula: str, input: str, output: str,
-    r2: float, mse: float, description: str, slope: float, intercept: float
+    r2: float, mse: float, description: str, slope: float, intercept: float,
+    inputs: Optional[List[str]] = None,
+    coefficients: Optional[Sequence[float]] = None, degree: int = 1,
+    statistics: Optional[Dict[str, float]] = None
 ) -> None:
-    """Save a model's data to a file using joblib.
+    """Save a model's data to a file in the binary model format.
 
     Args:
         file_path: Path where the model will be saved
@@ -21,60 +59,151 @@ def save_model(file_path: str, formula: str, input: str, output: str,
         r_squared: R-squared value of the model
         mse: Mean squared error of the model
         description: Model description
-        slope: Slope coefficient
+        slope: Slope coefficient, None for models with several terms
         intercept: Intercept value
+        inputs: Input variable names of a multiple regression (optional)
+        coefficients: Coefficients of the terms of a multiple regression
+            (optional)
+        degree: Highest power of the inputs (optional)
+        statistics: Further fit statistics to embed, such as the number
+            of rows n (optional)
 
     Returns:
         None
     """
 
     params = [file_path, formula, input, output, r2, mse, description,
-              slope, intercept]
-    
+              intercept]
+    if coefficients is None:
+        params.append(slope)
+
     for p in params:
         if p is None:
             raise Exception('could not save model')
 
-    model_data = {
-        'formula': formula,
-        'x': input,
-        'y': output,
-        'r2': r2,
-        'mse': mse,
-        'description': description,
-        'slope': slope,
-        'intercept': intercept
-    }
-
     try:
-        joblib.dump(model_data, file_path)
+        values = np.concatenate((
+            [intercept],
+            coefficients if coefficients is not None else [slope]
+        )).astype('<f8')
+
+        metadata = {
+            'formula': formula,
+            'x': input,
+            'y': output,
+            'x_names': list(inputs) if inputs is not None else [input],
+            'degree': degree,
+            'r2': r2,
+            'mse': mse,
+            'description': description,
+        }
+        if statistics is not None:
+            metadata['statistics'] = statistics
+        encoded = json.dumps(metadata).encode('utf-8')
+
+        content = (_HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(encoded),
+                                len(values))
+                   + encoded + values.tobytes())
+        content += _CHECKSUM.pack(zlib.crc32(content))
+
+        with open(file_path, 'wb') as file:
+            file.write(content)
     except Exception as e:
         raise Exception('could not save model')
 
 
+def _read_binary(content: bytes) -> Model:
+    """Build a model from the content of a binary model file.
+
+    Raises:
+        ValueError: If the file is truncated, corrupted or of a newer
+            format version.
+    """
+    if len(content) < _HEADER.size + _CHECKSUM.size:
+        raise ValueError('truncated model file')
+
+    (checksum,) = _CHECKSUM.unpack_from(content, len(content) -
+                                        _CHECKSUM.size)
+    if zlib.crc32(content[:-_CHECKSUM.size]) != checksum:
+        raise ValueError('model file checksum mismatch')
+
+    _, version, _, metadata_size, count = _HEADER.unpack_from(content)
+    if version > FORMAT_VERSION:
+        raise ValueError(f'unsupported model format version {version}')
+
+    start = _HEADER.size + metadata_size
+    if start + 8 * count + _CHECKSUM.size != len(content) or not count:
+        raise ValueError('inconsistent model file sizes')
+
+    metadata = json.loads(content[_HEADER.size:start].decode('utf-8'))
+    values = np.frombuffer(content, dtype='<f8', count=count, offset=start)
+
+    model = Model()
+    model.formula = metadata['formula']
+    model.x_name = metadata['x']
+    model.y_name = metadata['y']
+    model.x_names = metadata['x_names']
+    model.degree = metadata['degree']
+    model.r2 = metadata['r2']
+    model.mse = metadata['mse']
+    model.description = metadata['description']
+    model.statistics = metadata.get('statistics')
+
+    model.intercept = float(values[0])
+    model.coefficients = values[1:].astype(np.float64)
+    model.slope = float(values[1]) if count == 2 else None
+    return model
+
+
+def _read_joblib(file_path: str) -> Model:
+    """Build a model from a file saved with joblib by earlier versions."""
+    import joblib
+    model_data = joblib.load(file_path)
+    model = Model()
+
+    model.formula = model_data.get('formula')
+    model.x_name = model_data.get('x')
+    model.y_name = model_data.get('y')
+    model.r2 = model_data.get('r2')
+    model.mse = model_data.get('mse')
+    model.description = model_data.get('description')
+    model.slope = model_data.get('slope')
+    model.intercept = model_data.get('intercept')
+
+    # Files saved before multiple regression hold a single input
+    model.x_names = model_data.get('x_names', [model.x_name])
+    model.coefficients = np.asarray(
+        model_data.get('coefficients', [model.slope]), dtype=np.float64)
+    model.degree = model_data.get('degree', 1)
+
+    return model
+
+
 def load_model(file_path: str) -> Model:
     """Load a saved model from a file.
 
+    Files in the binary model format are verified against their checksum.
+    Other files are only read, as legacy joblib files, if their extension
+    is .joblib; any other file is rejected without being unpickled.
+
     Args:
         file_path: Path to the saved model file
 
     Returns:
         Model: Loaded model object if successful, None otherwise
+
+    Raises:
+        ValueError: If the file is missing, corrupted or not a model.
     """
     try:
-        model_data = joblib.load(file_path)
-        model = Model()
-
-        model.formula = model_data.get('formula')
-        model.x_name = model_data.get('x')
-        model.y_name = model_data.get('y')
-        model.r2 = model_data.get('r2')
-        model.mse = model_data.get('mse')
-        model.description = model_data.get('description')
-        model.slope = model_data.get('slope')
-        model.intercept = model_data.get('intercept')
+        with open(file_path, 'rb') as file:
+            content = file.read()
 
-        return model
+        if content.startswith(MAGIC):
+            return _read_binary(content)
+        if os.path.splitext(file_path)[1].lower() == LEGACY_EXTENSION:
+            return _read_joblib(file_path)
+        raise ValueError('not a model file')
 
     except Exception as e:
-        raise ValueError('Unable to read file')
\ No newline at end of file
+        raise ValueError('Unable to read file')
@@ -0,0 +1,126 @@
+"""Module for fitting simple linear regressions on several CPU cores.
+
+This module splits the rows of a regression into shards, computes the
+sufficient statistics of every shard in a process pool and merges them.
+The two columns are copied once into shared memory, which the workers
+attach to by name, so the data is never pickled.
+"""
+
+import os
+from concurrent.futures import Executor
+from typing import TYPE_CHECKING, Optional, Tuple
+
+import numpy as np
+
+from data_management.regressionEngine import (
+    FitResult,
+    RegressionAccumulator,
+    _as_column,
+    fit_simple,
+)
+
+# The process pool and shared memory modules are imported by the first
+# parallel fit, as most sessions never run one
+if TYPE_CHECKING:
+    from multiprocessing.shared_memory import SharedMemory
+
+
+# Below this number of rows a single-core fit is faster than starting workers
+MIN_PARALLEL_ROWS = 1_000_000
+
+
+def _attach(name: str) -> 'SharedMemory':
+    """Attach to an existing shared memory block without taking ownership.
+
+    The creating process unlinks the block. Before Python 3.13 the worker
+    registers it again with the resource tracker it shares with its
+    parent, which is harmless as registrations are kept in a set.
+    """
+    from multiprocessing import shared_memory
+
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:  # Python < 3.13 has no track argument
+        return shared_memory.SharedMemory(name=name)
+
+
+def _fit_shard(name: str, length: int, start: int, stop: int
+               ) -> Tuple[int, float, float, float, float, float]:
+    """Accumulate the statistics of rows start:stop of a shared block.
+
+    Runs in a worker process. The block holds x followed by y.
+
+    Returns:
+        The moments of the shard, see RegressionAccumulator.state.
+    """
+    block = _attach(name)
+    try:
+        data = np.ndarray((2, length), dtype=np.float64, buffer=block.buf)
+        accumulator = RegressionAccumulator().update(
+            data[0, start:stop], data[1, start:stop])
+        del data
+        return accumulator.state()
+    finally:
+        block.close()
+
+
+def fit_parallel(x, y, workers: Optional[int] = None,
+                 executor: Optional[Executor] = None) -> FitResult:
+    """Fit y = slope * x + intercept using several processes.
+
+    Small inputs, or a single worker, fall back to fit_simple.
+
+    Args:
+        x: Values of the independent variable.
+        y: Values of the dependent variable.
+        workers: Number of shards and processes, the number of CPUs by
+            default (optional).
+        executor: Process pool to reuse instead of starting one
+            (optional).
+
+    Returns:
+        FitResult with the coefficients, R², MSE and number of rows.
+
+    Raises:
+        ValueError: If the inputs are empty, misaligned, non-numeric or
+            contain NaN or infinite values.
+    """
+    x = _as_column(x)
+    y = _as_column(y)
+    if len(x) != len(y):
+        raise ValueError('x and y must have the same length')
+
+    workers = workers or os.cpu_count() or 1
+    length = len(x)
+    if workers <= 1 or length < MIN_PARALLEL_ROWS:
+        return fit_simple(x, y)
+
+    from concurrent.futures import ProcessPoolExecutor
+    from multiprocessing import shared_memory
+
+    block = shared_memory.SharedMemory(create=True, size=2 * x.nbytes)
+    try:
+        data = np.ndarray((2, length), dtype=np.float64, buffer=block.buf)
+        data[0] = x
+        data[1] = y
+        del data
+
+        bounds = np.linspace(0, length, workers + 1).astype(int)
+        pool = executor or ProcessPoolExecutor(max_workers=workers)
+        try:
+            futures = [
+                pool.submit(_fit_shard, block.name, length, start, stop)
+                for start, stop in zip(bounds[:-1], bounds[1:])
+            ]
+            accumulator = RegressionAccumulator()
+            for future in futures:
+                accumulator.merge(
+                    RegressionAccumulator.from_moments(*future.result()))
+        finally:
+            if executor is None:
+                pool.shutdown()
+
+        return accumulator.result()
+    finally:
+        block.close()
+        block.unlink()
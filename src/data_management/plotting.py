@@ -0,0 +1,534 @@
+"""Module for drawing large scatter plots at a bounded level of detail.
+
+This module provides a DecimatedScatter class that draws at most a fixed
+number of points, sampled at random or stratified over a 2-D grid so
+sparse regions and outliers are kept, and switches to a hexagonal
+density plot for very large datasets. The points are resampled from the
+full-resolution data within the visible range whenever the axes are
+zoomed or panned, so detail appears as the user zooms in.
+
+For datasets of tens of millions of points, DensityImage rasterizes the
+points straight into a 2-D histogram with one bin per screen pixel (or
+block of pixels) and shows it as an image, rebinning only the visible
+range each time the axes are drawn.
+
+RegressionPlot keeps one figure, its axes and its artists for a whole
+session and updates their data in place, blitting them over a cached
+background when the view does not change.
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+from matplotlib.colors import LogNorm
+from matplotlib.figure import Figure
+from matplotlib.image import AxesImage
+
+
+# Points drawn at most by a decimated scatter plot
+MAX_POINTS = 20_000
+
+# Number of visible points above which the density is drawn instead
+DENSITY_THRESHOLD = 1_000_000
+
+# Points binned at most by a density plot, which estimates the density
+# of larger datasets from a random sample of them
+DENSITY_POINTS = 500_000
+
+# Cells per axis of the grid used by stratified sampling
+STRATA = 64
+
+# Hexagons across the x axis of a density plot
+HEXBIN_GRIDSIZE = 100
+
+# Screen pixels per side of a bin of a rasterized density plot
+PIXEL_SIZE = 2
+
+
+def _padded_range(values: np.ndarray, margin: float = 0.05
+                  ) -> Tuple[float, float]:
+    """Return the range of values widened by a share of its width."""
+    low, high = float(values.min()), float(values.max())
+    pad = (high - low) * margin or max(abs(low) * margin, 0.5)
+    return low - pad, high + pad
+
+
+def sample_points(x: np.ndarray, y: np.ndarray, max_points: int = MAX_POINTS,
+                  method: str = 'random', seed: int = 0
+                  ) -> Tuple[np.ndarray, np.ndarray]:
+    """Select at most about max_points of the points to draw.
+
+    Random sampling draws indices without looking at the rest of the
+    data, so its cost does not depend on the number of points.
+    Stratified sampling grids the plane in STRATA x STRATA cells and
+    gives each occupied cell the same share of points, keeping sparse
+    regions that random sampling would thin out.
+
+    Args:
+        x: x coordinates of the points.
+        y: y coordinates of the points.
+        max_points: Number of points to keep at most.
+        method: 'random' (default) or 'stratified'.
+        seed: Seed of the random generator, for stable redraws.
+
+    Returns:
+        The x and y coordinates of the selected points.
+    """
+    if len(x) <= max_points:
+        return x, y
+
+    rng = np.random.default_rng(seed)
+
+    if method == 'random':
+        index = np.unique(rng.integers(0, len(x), max_points))
+    elif method == 'stratified':
+        cells = np.zeros(len(x), dtype=np.int64)
+        for values in (x, y):
+            low, high = values.min(), values.max()
+            scale = STRATA / (high - low) if high > low else 0.0
+            cell = ((values - low) * scale).astype(np.int64)
+            np.minimum(cell, STRATA - 1, out=cell)
+            cells = cells * STRATA + cell
+
+        counts = np.bincount(cells)
+        quota = max_points / np.count_nonzero(counts)
+        keep = rng.random(len(x)) * counts[cells] < quota
+        index = np.flatnonzero(keep)
+    else:
+        raise ValueError(f'unknown sampling method: {method}')
+
+    return x[index], y[index]
+
+
+class DecimatedScatter:
+    """Scatter plot of a large dataset with a bounded number of artists.
+
+    Up to max_points points are drawn as they are. Larger datasets are
+    sampled, and above density_threshold visible points a hexbin density
+    plot is drawn instead. The drawing is refreshed from the full data
+    of the visible range when the limits of the axes change.
+    """
+
+    def __init__(self, ax, x, y, max_points: int = MAX_POINTS,
+                 method: str = 'random',
+                 density_threshold: int = DENSITY_THRESHOLD, **style):
+        """Draw the points on the axes.
+
+        Args:
+            ax: Matplotlib axes to draw on.
+            x: x coordinates of the points.
+            y: y coordinates of the points.
+            max_points: Number of points drawn at most.
+            method: Sampling method, see sample_points.
+            density_threshold: Number of visible points above which the
+                density is drawn.
+            **style: Keyword arguments for Axes.scatter.
+        """
+        self._ax = ax
+        self._x = np.asarray(x, dtype=np.float64)
+        self._y = np.asarray(y, dtype=np.float64)
+        self._max_points = max_points
+        self._method = method
+        self._density_threshold = density_threshold
+        self._style = style
+
+        self._scatter = None
+        self._density = None
+        self._bounds = None
+
+        if len(self._x):
+            ax.set_xlim(*_padded_range(self._x))
+            ax.set_ylim(*_padded_range(self._y))
+        self.refresh()
+
+        self._callbacks = [
+            ax.callbacks.connect('xlim_changed', lambda _: self.refresh()),
+            ax.callbacks.connect('ylim_changed', lambda _: self.refresh()),
+        ]
+
+    @property
+    def points(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Get the x and y coordinates of all the points."""
+        return self._x, self._y
+
+    def set_points(self, x, y) -> None:
+        """Replace the points and fit the limits of the axes to them.
+
+        Args:
+            x: x coordinates of the points.
+            y: y coordinates of the points.
+        """
+        self._x = np.asarray(x, dtype=np.float64)
+        self._y = np.asarray(y, dtype=np.float64)
+        self._bounds = None
+
+        if len(self._x):
+            self._ax.set_xlim(*_padded_range(self._x), emit=False)
+            self._ax.set_ylim(*_padded_range(self._y), emit=False)
+        self.refresh()
+
+    def remove(self) -> None:
+        """Remove the points from the axes and stop following its limits."""
+        for callback in self._callbacks:
+            self._ax.callbacks.disconnect(callback)
+        for artist in (self._scatter, self._density):
+            if artist is not None:
+                artist.remove()
+        self._scatter = None
+        self._density = None
+
+    @property
+    def shown(self) -> int:
+        """Get the number of points drawn, 0 when the density is drawn."""
+        if self._scatter is None:
+            return 0
+        return len(self._scatter.get_offsets())
+
+    def _visible(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the points within the limits of the axes."""
+        (x0, x1), (y0, y1) = self._bounds
+        mask = ((self._x >= min(x0, x1)) & (self._x <= max(x0, x1))
+                & (self._y >= min(y0, y1)) & (self._y <= max(y0, y1)))
+        if mask.all():
+            return self._x, self._y
+        return self._x[mask], self._y[mask]
+
+    def refresh(self) -> None:
+        """Redraw the points of the visible range if the limits changed."""
+        bounds = (self._ax.get_xlim(), self._ax.get_ylim())
+        if bounds == self._bounds:
+            return
+        self._bounds = bounds
+
+        x, y = self._visible()
+        if len(x) > self._density_threshold:
+            self._draw_density(x, y)
+        else:
+            self._draw_points(*sample_points(x, y, self._max_points,
+                                             self._method))
+
+    def _draw_points(self, x: np.ndarray, y: np.ndarray) -> None:
+        """Show the given points, replacing the density plot if any."""
+        if self._density is not None:
+            self._density.remove()
+            self._density = None
+
+        offsets = np.column_stack((x, y))
+        if self._scatter is None:
+            self._scatter = self._ax.scatter(x, y, **self._style)
+        else:
+            self._scatter.set_offsets(offsets)
+
+    def _draw_density(self, x: np.ndarray, y: np.ndarray) -> None:
+        """Show the density of the given points as hexagons."""
+        if self._scatter is not None:
+            self._scatter.set_offsets(np.empty((0, 2)))
+        if self._density is not None:
+            self._density.remove()
+
+        x, y = sample_points(x, y, DENSITY_POINTS)
+        (x0, x1), (y0, y1) = self._bounds
+        self._density = self._ax.hexbin(
+            x, y, gridsize=HEXBIN_GRIDSIZE, mincnt=1, bins='log',
+            cmap='cool', extent=(x0, x1, y0, y1), zorder=1,
+            animated=self._style.get('animated', False))
+        self._ax.set_xlim(x0, x1, emit=False)
+        self._ax.set_ylim(y0, y1, emit=False)
+
+
+def rasterize(x: np.ndarray, y: np.ndarray, bounds: Tuple[float, ...],
+              shape: Tuple[int, int]) -> np.ndarray:
+    """Count the points falling in each bin of a regular grid.
+
+    The bin of each point is computed arithmetically and the points are
+    counted with a single bincount, which is much faster than the
+    searches done by np.histogram2d.
+
+    Args:
+        x: x coordinates of the points.
+        y: y coordinates of the points.
+        bounds: Range (x0, x1, y0, y1) covered by the grid.
+        shape: Number of bins along y and x.
+
+    Returns:
+        Array of counts of the given shape, rows going up in y.
+    """
+    x0, x1, y0, y1 = bounds
+    rows, cols = shape
+    x_scale = cols / (x1 - x0) if x1 != x0 else 0.0
+    y_scale = rows / (y1 - y0) if y1 != y0 else 0.0
+
+    col = (x - x0) * x_scale
+    row = (y - y0) * y_scale
+    inside = (col >= 0) & (col < cols) & (row >= 0) & (row < rows)
+
+    cells = row[inside].astype(np.int64) * cols + col[inside].astype(np.int64)
+    return np.bincount(cells, minlength=rows * cols).reshape(rows, cols)
+
+
+class DensityImage(AxesImage):
+    """Rasterized density of a large set of points.
+
+    The counts are computed when the image is drawn, for the visible
+    range of the axes at the resolution of the canvas, and kept until
+    the limits or the size of the axes change. Empty bins are left
+    transparent and counts are coloured on a logarithmic scale.
+    """
+
+    def __init__(self, ax, x, y, pixel_size: int = PIXEL_SIZE,
+                 cmap: str = 'cool', **kwargs):
+        """Add the image to the axes.
+
+        Args:
+            ax: Matplotlib axes to draw on.
+            x: x coordinates of the points.
+            y: y coordinates of the points.
+            pixel_size: Screen pixels per side of a bin.
+            cmap: Name of the colormap.
+            **kwargs: Keyword arguments for AxesImage.
+        """
+        super().__init__(ax, cmap=cmap, norm=LogNorm(), origin='lower',
+                         interpolation='nearest', **kwargs)
+        self._x = np.asarray(x, dtype=np.float64)
+        self._y = np.asarray(y, dtype=np.float64)
+        self._pixel_size = pixel_size
+        self._key = None
+
+        if len(self._x):
+            ax.set_xlim(*_padded_range(self._x))
+            ax.set_ylim(*_padded_range(self._y))
+        ax.add_image(self)
+        self._rebin()
+
+    @property
+    def points(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Get the x and y coordinates of all the points."""
+        return self._x, self._y
+
+    def set_points(self, x, y) -> None:
+        """Replace the points and fit the limits of the axes to them.
+
+        Args:
+            x: x coordinates of the points.
+            y: y coordinates of the points.
+        """
+        self._x = np.asarray(x, dtype=np.float64)
+        self._y = np.asarray(y, dtype=np.float64)
+        self._key = None
+
+        if len(self._x):
+            self.axes.set_xlim(*_padded_range(self._x), emit=False)
+            self.axes.set_ylim(*_padded_range(self._y), emit=False)
+        self._rebin()
+
+    def _rebin(self) -> None:
+        """Rasterize the visible points if the view has changed."""
+        x0, x1 = self.axes.get_xlim()
+        y0, y1 = self.axes.get_ylim()
+        extent = self.axes.get_window_extent()
+        shape = (max(int(extent.height) // self._pixel_size, 1),
+                 max(int(extent.width) // self._pixel_size, 1))
+
+        key = (x0, x1, y0, y1, shape)
+        if key == self._key:
+            return
+        self._key = key
+
+        counts = rasterize(self._x, self._y, (min(x0, x1), max(x0, x1),
+                                              min(y0, y1), max(y0, y1)),
+                           shape)
+        if x0 > x1:
+            counts = counts[:, ::-1]
+        if y0 > y1:
+            counts = counts[::-1]
+
+        self.set_data(np.ma.masked_equal(counts, 0))
+        self.norm.vmin = 1
+        self.norm.vmax = max(int(counts.max()), 2)
+        self._extent = (x0, x1, y0, y1)
+
+    def draw(self, renderer):
+        """Rebin the points for the current view and draw the image."""
+        self._rebin()
+        super().draw(renderer)
+
+
+class RegressionPlot:
+    """Persistent figure showing the points and line of a regression.
+
+    The figure, its axes, the points and the line are created once and
+    their data is replaced by update, so drawing a new model allocates
+    no new figure. The data artists are animated: after each full draw
+    the canvas without them is kept as a background, and updates that
+    leave the limits and labels unchanged only redraw the artists over
+    it and blit the axes. The figure is not managed by pyplot, so it is
+    freed with its canvas.
+    """
+
+    def __init__(self, backend: str = 'scatter', max_points: int = MAX_POINTS,
+                 method: str = 'random'):
+        """Create the figure and its empty artists.
+
+        Args:
+            backend: 'scatter' (default) or 'raster', see set_backend.
+            max_points: Number of points drawn at most by the scatter
+                backend.
+            method: Sampling method of the scatter backend.
+        """
+        self.figure = Figure(figsize=(10, 6), facecolor=(1, 1, 1, 0),
+                             layout='tight')
+        self.ax = self.figure.add_subplot()
+        self._style_axes()
+
+        self._max_points = max_points
+        self._method = method
+        self._backend = None
+        self._points = None
+        self._background = None
+
+        self._line, = self.ax.plot([], [], color='#E74C3C', zorder=2,
+                                   animated=True)
+        self.set_backend(backend)
+
+        self.figure.canvas.mpl_connect('draw_event', self._on_draw)
+
+    def _style_axes(self) -> None:
+        """Apply the colours and spines of the application theme."""
+        ax = self.ax
+        ax.tick_params(axis='x', colors='#a0a0a0')
+        ax.tick_params(axis='y', colors='#a0a0a0')
+
+        ax.spines['top'].set_visible(False)
+        ax.spines['right'].set_visible(False)
+        ax.spines['left'].set_visible(True)
+        ax.spines['bottom'].set_visible(True)
+
+        ax.grid(False)
+        ax.patch.set_alpha(0.0)
+
+    @property
+    def backend(self) -> str:
+        """Get the backend drawing the points."""
+        return self._backend
+
+    def set_backend(self, backend: str) -> None:
+        """Choose how the points are drawn, keeping the current data.
+
+        Args:
+            backend: 'scatter' for a level-of-detail scatter plot or
+                'raster' for a rasterized density image.
+
+        Raises:
+            ValueError: If the backend is unknown.
+        """
+        if backend not in ('scatter', 'raster'):
+            raise ValueError(f'unknown plot backend: {backend}')
+        if backend == self._backend:
+            return
+
+        x = y = np.empty(0)
+        if self._points is not None:
+            x, y = self._points.points
+            self._points.remove()
+
+        self._backend = backend
+        if backend == 'raster':
+            self._points = DensityImage(self.ax, x, y, animated=True)
+        else:
+            self._points = DecimatedScatter(
+                self.ax, x, y,
+                max_points=self._max_points,
+                method=self._method,
+                s=10,
+                color='#c2ffff',
+                alpha=0.7,
+                animated=True
+            )
+        self._background = None
+
+    def _view(self) -> tuple:
+        """Return what the cached background depends on."""
+        return (self.ax.get_xlim(), self.ax.get_ylim(),
+                self.ax.get_xlabel(), self.ax.get_ylabel(),
+                tuple(self.figure.bbox.size))
+
+    def _on_draw(self, event) -> None:
+        """Cache the background of a full draw and draw the artists on it.
+
+        Figures being saved already include the animated artists.
+        """
+        canvas = self.figure.canvas
+        if canvas.is_saving():
+            return
+        if canvas.supports_blit:
+            self._background = (self._view(),
+                                canvas.copy_from_bbox(self.figure.bbox))
+        self._draw_artists()
+
+    def _draw_artists(self) -> None:
+        """Draw the animated artists of the axes."""
+        artists = self.ax.collections + self.ax.images + self.ax.lines
+        for artist in sorted(artists, key=lambda a: a.get_zorder()):
+            if artist.get_animated():
+                self.figure.draw_artist(artist)
+
+    def update(self, model) -> None:
+        """Show the data and line of a model.
+
+        Models with several terms have no line in the plane of an input,
+        so their predictions are plotted against the actual values, with
+        the line where both are equal.
+
+        Args:
+            model: Model with data, as fitted by create_from_data.
+        """
+        y = model.target_value.to_numpy()
+        if model.slope is None:
+            x = np.asarray(model.pred_line)
+            line = line_endpoints(x, 1.0, 0.0)
+            label = f'Predicted {model.y_name}'
+        else:
+            x = model.independent_value.iloc[:, 0].to_numpy()
+            line = line_endpoints(x, model.slope, model.intercept)
+            label = model.x_name
+
+        self._points.set_points(x, y)
+        self._line.set_data(*line)
+
+        self.ax.set_xlabel(label, color='#a0a0a0')
+        self.ax.set_ylabel(model.y_name, color='#a0a0a0')
+
+        self.redraw()
+
+    def redraw(self) -> None:
+        """Show the changes, blitting them if the view is unchanged."""
+        canvas = self.figure.canvas
+        if self._background is None or self._background[0] != self._view():
+            self._background = None
+            canvas.draw_idle()
+            return
+
+        canvas.restore_region(self._background[1])
+        self._draw_artists()
+        canvas.blit(self.figure.bbox)
+
+
+def line_endpoints(x: np.ndarray, slope: float, intercept: float,
+                   bounds: Optional[Tuple[float, float]] = None
+                   ) -> Tuple[np.ndarray, np.ndarray]:
+    """Return the two endpoints of a regression line over the data.
+
+    Args:
+        x: Values of the independent variable.
+        slope: Slope of the line.
+        intercept: Intercept of the line.
+        bounds: Range of x to cover instead of that of the data
+            (optional).
+
+    Returns:
+        The x and y coordinates of both endpoints.
+    """
+    if bounds is None:
+        bounds = (x.min(), x.max()) if len(x) else (0.0, 0.0)
+    ends = np.array(bounds, dtype=np.float64)
+    return ends, slope * ends + intercept
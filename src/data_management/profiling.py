@@ -0,0 +1,83 @@
+"""Module for profiling the columns of a dataset.
+
+This module computes the number of missing values, the range, the mean
+and the median of many columns at once. Numeric columns are converted to
+float64 matrices of at most PROFILE_BATCH columns and reduced column-wise
+by NumPy, so a profile costs one pass over the data instead of one per
+statistic and column, while the float64 copy stays bounded.
+"""
+
+import warnings
+from typing import Dict, List, NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from data_management.regressionEngine import numeric_columns
+
+
+# Numeric columns converted to float64 and reduced at once
+PROFILE_BATCH = 16
+
+
+class ColumnProfile(NamedTuple):
+    """Summary statistics of a column.
+
+    Statistics other than nan_count are NaN for non-numeric columns and
+    for columns without values.
+    """
+
+    nan_count: int
+    min: float
+    max: float
+    mean: float
+    median: float
+    dtype: str
+
+
+def profile_columns(data: pd.DataFrame,
+                    columns: List[str]) -> Dict[str, ColumnProfile]:
+    """Profile columns of a frame, reducing batches of columns at once.
+
+    Args:
+        data: Frame holding the columns.
+        columns: Names of the columns to profile.
+
+    Returns:
+        Dictionary mapping each column name to its ColumnProfile.
+    """
+    subset = data[columns]
+    numeric = numeric_columns(subset)
+    others = [column for column in columns if column not in set(numeric)]
+    profiles = {}
+
+    for start in range(0, len(numeric), PROFILE_BATCH):
+        batch = numeric[start:start + PROFILE_BATCH]
+        block = subset[batch].to_numpy(dtype=np.float64, na_value=np.nan)
+        counts = np.isnan(block).sum(axis=0)
+        if len(block):
+            # Columns without values give NaN with a warning
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', RuntimeWarning)
+                stats = np.vstack([
+                    np.nanmin(block, axis=0),
+                    np.nanmax(block, axis=0),
+                    np.nanmean(block, axis=0),
+                    np.nanmedian(block, axis=0),
+                ])
+        else:
+            stats = np.full((4, len(batch)), np.nan)
+
+        for i, column in enumerate(batch):
+            profiles[column] = ColumnProfile(
+                int(counts[i]), *stats[:, i].tolist(),
+                str(subset[column].dtype))
+
+    if others:
+        counts = subset[others].isna().sum()
+        for column in others:
+            profiles[column] = ColumnProfile(
+                int(counts[column]), np.nan, np.nan, np.nan, np.nan,
+                str(subset[column].dtype))
+
+    return profiles
@@ -0,0 +1,639 @@
+"""Module for fitting simple linear regressions with NumPy.
+
+This module computes the slope, intercept, R² and MSE of a one-feature
+linear regression in closed form from its sufficient statistics, without
+building the array of predictions. The statistics are held by a
+mergeable RegressionAccumulator, so data can also be fitted chunk by
+chunk from sources larger than memory. scikit-learn is kept as an optional
+backend, imported only when requested, to check both give the same fit.
+The regressions between every pair of numeric columns of a dataset are
+computed together by a PairwiseAccumulator, from a few matrix products.
+Regressions on several features, such as polynomial terms, are solved
+from the Gram matrix of the features accumulated by a GramAccumulator.
+"""
+
+from typing import Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+# Rows processed at a time, which bounds the temporary arrays of a fit
+BLOCK_SIZE = 1 << 16
+
+
+class FitResult(NamedTuple):
+    """Coefficients and metrics of a fitted simple linear regression."""
+
+    slope: float
+    intercept: float
+    r2: float
+    mse: float
+    n: int
+
+
+class MultipleFitResult(NamedTuple):
+    """Coefficients and metrics of a fitted multiple linear regression."""
+
+    coefficients: np.ndarray
+    intercept: float
+    r2: float
+    mse: float
+    n: int
+
+
+def _as_column(values) -> np.ndarray:
+    """Convert values to a one-dimensional float64 array."""
+    array = np.asarray(values, dtype=np.float64)
+    if array.ndim == 2 and array.shape[1] == 1:
+        array = array[:, 0]
+    if array.ndim != 1:
+        raise ValueError('expected a single column of values')
+    return array
+
+
+class RegressionAccumulator:
+    """Mergeable sufficient statistics of a simple linear regression.
+
+    Holds the number of rows, the means and the centred sums of squares
+    and cross-products of x and y. Blocks of data are added with
+    update and partial accumulators are combined with merge, both using
+    Chan's parallel update, so the statistics stay accurate for data far
+    from the origin. The raw sums (Σx, Σy, Σx², Σy², Σxy) are derived
+    from them.
+    """
+
+    def __init__(self):
+        """Initialize an empty accumulator."""
+        self._n = 0
+        self._mean_x = 0.0
+        self._mean_y = 0.0
+        self._sxx = 0.0
+        self._syy = 0.0
+        self._sxy = 0.0
+
+    @classmethod
+    def from_moments(cls, n: int, mean_x: float, mean_y: float, sxx: float,
+                     syy: float, sxy: float) -> 'RegressionAccumulator':
+        """Build an accumulator from precomputed moments.
+
+        Args:
+            n: Number of rows.
+            mean_x: Mean of x.
+            mean_y: Mean of y.
+            sxx: Sum of squared deviations of x.
+            syy: Sum of squared deviations of y.
+            sxy: Sum of cross-deviations of x and y.
+        """
+        accumulator = cls()
+        accumulator._n = int(n)
+        if n:
+            accumulator._mean_x = float(mean_x)
+            accumulator._mean_y = float(mean_y)
+            accumulator._sxx = float(sxx)
+            accumulator._syy = float(syy)
+            accumulator._sxy = float(sxy)
+        return accumulator
+
+    @classmethod
+    def from_statistics(cls, stats: dict) -> 'RegressionAccumulator':
+        """Build an accumulator from SQLiteReader.sufficient_statistics.
+
+        Args:
+            stats: Dictionary with n, sum_x, sum_y, sxx, syy and sxy.
+        """
+        n = stats['n']
+        return cls.from_moments(
+            n, stats['sum_x'] / n if n else 0.0,
+            stats['sum_y'] / n if n else 0.0,
+            stats['sxx'], stats['syy'], stats['sxy'])
+
+    def state(self) -> Tuple[int, float, float, float, float, float]:
+        """Return the moments as a tuple accepted by from_moments."""
+        return (self._n, self._mean_x, self._mean_y,
+                self._sxx, self._syy, self._sxy)
+
+    @property
+    def n(self) -> int:
+        """Get the number of rows accumulated."""
+        return self._n
+
+    @property
+    def mean_x(self) -> float:
+        """Get the mean of x."""
+        return self._mean_x
+
+    @property
+    def mean_y(self) -> float:
+        """Get the mean of y."""
+        return self._mean_y
+
+    @property
+    def sum_x(self) -> float:
+        """Get Σx."""
+        return self._n * self._mean_x
+
+    @property
+    def sum_y(self) -> float:
+        """Get Σy."""
+        return self._n * self._mean_y
+
+    @property
+    def sum_xx(self) -> float:
+        """Get Σx²."""
+        return self._sxx + self._n * self._mean_x ** 2
+
+    @property
+    def sum_yy(self) -> float:
+        """Get Σy²."""
+        return self._syy + self._n * self._mean_y ** 2
+
+    @property
+    def sum_xy(self) -> float:
+        """Get Σxy."""
+        return self._sxy + self._n * self._mean_x * self._mean_y
+
+    def _combine(self, n: int, mean_x: float, mean_y: float, sxx: float,
+                 syy: float, sxy: float) -> None:
+        """Merge the moments of another set of rows into this one."""
+        if n == 0:
+            return
+
+        total = self._n + n
+        delta_x = mean_x - self._mean_x
+        delta_y = mean_y - self._mean_y
+        weight = self._n * n / total
+
+        self._mean_x += delta_x * n / total
+        self._mean_y += delta_y * n / total
+        self._sxx += sxx + delta_x * delta_x * weight
+        self._syy += syy + delta_y * delta_y * weight
+        self._sxy += sxy + delta_x * delta_y * weight
+        self._n = total
+
+    def update(self, x, y, block_size: int = BLOCK_SIZE
+               ) -> 'RegressionAccumulator':
+        """Add rows to the accumulator.
+
+        Each block is centred on its own means before being merged, so
+        only block-sized temporaries are allocated.
+
+        Args:
+            x: Values of the independent variable.
+            y: Values of the dependent variable.
+            block_size: Rows processed at a time.
+
+        Returns:
+            The accumulator itself.
+
+        Raises:
+            ValueError: If the inputs are misaligned, non-numeric or
+                contain NaN or infinite values.
+        """
+        x = _as_column(x)
+        y = _as_column(y)
+        if len(x) != len(y):
+            raise ValueError('x and y must have the same length')
+
+        for start in range(0, len(x), block_size):
+            xb = x[start:start + block_size]
+            yb = y[start:start + block_size]
+            if not (np.isfinite(xb).all() and np.isfinite(yb).all()):
+                raise ValueError('Input contains NaN or infinity')
+
+            mean_xb = xb.mean()
+            mean_yb = yb.mean()
+            dx = xb - mean_xb
+            dy = yb - mean_yb
+            self._combine(len(xb), mean_xb, mean_yb,
+                          dx @ dx, dy @ dy, dx @ dy)
+
+        return self
+
+    def merge(self, other: 'RegressionAccumulator'
+              ) -> 'RegressionAccumulator':
+        """Add the rows of another accumulator to this one.
+
+        Args:
+            other: Accumulator computed over other rows.
+
+        Returns:
+            The accumulator itself.
+        """
+        self._combine(*other.state())
+        return self
+
+    def result(self) -> FitResult:
+        """Derive the regression coefficients and metrics.
+
+        Returns:
+            FitResult with the coefficients, R², MSE and number of rows.
+
+        Raises:
+            ValueError: If no rows were accumulated.
+        """
+        n, mean_x, mean_y, sxx, syy, sxy = self.state()
+        if n == 0:
+            raise ValueError('cannot fit a model without data')
+
+        slope = sxy / sxx if sxx > 0 else 0.0
+        intercept = mean_y - slope * mean_x
+        ss_res = max(syy - slope * sxy, 0.0)
+
+        if syy > 0:
+            r2 = 1.0 - ss_res / syy
+        else:
+            r2 = 1.0 if ss_res == 0 else 0.0
+
+        return FitResult(float(slope), float(intercept), float(r2),
+                         float(ss_res / n), int(n))
+
+
+def fit_simple(x, y, block_size: int = BLOCK_SIZE) -> FitResult:
+    """Fit y = slope * x + intercept by ordinary least squares.
+
+    Args:
+        x: Values of the independent variable.
+        y: Values of the dependent variable.
+        block_size: Rows processed at a time.
+
+    Returns:
+        FitResult with the coefficients, R², MSE and number of rows.
+
+    Raises:
+        ValueError: If the inputs are empty, misaligned, non-numeric or
+            contain NaN or infinite values.
+    """
+    return RegressionAccumulator().update(x, y, block_size).result()
+
+
+def fit_sklearn(x, y) -> FitResult:
+    """Fit the same model with scikit-learn, for parity checks.
+
+    Args:
+        x: Values of the independent variable.
+        y: Values of the dependent variable.
+
+    Returns:
+        FitResult with the coefficients, R², MSE and number of rows.
+    """
+    from sklearn.linear_model import LinearRegression
+    from sklearn.metrics import mean_squared_error, r2_score
+
+    x = _as_column(x).reshape(-1, 1)
+    y = _as_column(y)
+
+    r_model = LinearRegression()
+    r_model.fit(x, y)
+    y_pred = r_model.predict(x)
+
+    return FitResult(float(r_model.coef_[0]), float(r_model.intercept_),
+                     float(r2_score(y, y_pred)),
+                     float(mean_squared_error(y, y_pred)), len(y))
+
+
+def polynomial_features(x, degree: int = 1) -> np.ndarray:
+    """Expand features with their powers up to a degree.
+
+    Args:
+        x: Matrix of features, one column per feature.
+        degree: Highest power of each feature.
+
+    Returns:
+        Matrix with the columns of x, then their squares, and so on.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    if x.ndim == 1:
+        x = x[:, None]
+    if degree == 1:
+        return x
+    return np.hstack([x ** power for power in range(1, degree + 1)])
+
+
+def polynomial_names(names: Sequence[str], degree: int = 1) -> List[str]:
+    """Name the columns given by polynomial_features.
+
+    Args:
+        names: Names of the features.
+        degree: Highest power of each feature.
+
+    Returns:
+        The names of the features, then of their powers as name^power.
+    """
+    return [name if power == 1 else f'{name}^{power}'
+            for power in range(1, degree + 1) for name in names]
+
+
+class GramAccumulator:
+    """Sufficient statistics of a multiple linear regression.
+
+    Holds the number of rows and the sums, sums of squares and
+    cross-products of the features and the target, as the Gram matrix
+    XᵀX and the vector Xᵀy. Values are shifted by the means of the first
+    block to avoid cancellation. Memory does not depend on the number of
+    rows, so data can be added block by block from any source.
+    """
+
+    def __init__(self, features: int):
+        """Initialize an empty accumulator.
+
+        Args:
+            features: Number of features of the regression.
+        """
+        self._k = features
+        self._n = 0
+        self._shift_x = None
+        self._shift_y = 0.0
+        self._sum_x = np.zeros(features)
+        self._sum_y = 0.0
+        self._xtx = np.zeros((features, features))
+        self._xty = np.zeros(features)
+        self._yty = 0.0
+
+    @property
+    def n(self) -> int:
+        """Get the number of rows accumulated."""
+        return self._n
+
+    def update(self, x, y, block_size: int = BLOCK_SIZE
+               ) -> 'GramAccumulator':
+        """Add rows to the accumulator.
+
+        Args:
+            x: Matrix of features, one column per feature.
+            y: Values of the dependent variable.
+            block_size: Rows processed at a time.
+
+        Returns:
+            The accumulator itself.
+
+        Raises:
+            ValueError: If the inputs are misaligned, non-numeric or
+                contain NaN or infinite values.
+        """
+        x = np.asarray(x, dtype=np.float64)
+        if x.ndim == 1:
+            x = x[:, None]
+        y = _as_column(y)
+        if x.shape != (len(y), self._k):
+            raise ValueError('x must have one row per value of y and '
+                             f'{self._k} columns')
+
+        for start in range(0, len(y), block_size):
+            xb = x[start:start + block_size]
+            yb = y[start:start + block_size]
+            if not (np.isfinite(xb).all() and np.isfinite(yb).all()):
+                raise ValueError('Input contains NaN or infinity')
+
+            if self._shift_x is None:
+                self._shift_x = xb.mean(axis=0)
+                self._shift_y = float(yb.mean())
+            xb = xb - self._shift_x
+            yb = yb - self._shift_y
+
+            self._n += len(yb)
+            self._sum_x += xb.sum(axis=0)
+            self._sum_y += yb.sum()
+            self._xtx += xb.T @ xb
+            self._xty += xb.T @ yb
+            self._yty += yb @ yb
+
+        return self
+
+    def result(self) -> MultipleFitResult:
+        """Solve the normal equations of the regression.
+
+        The centred Gram matrix is factored by Cholesky; if the features
+        are collinear, the least-squares solution of minimum norm is
+        used instead.
+
+        Returns:
+            MultipleFitResult with the coefficients, R², MSE and number of
+            rows.
+
+        Raises:
+            ValueError: If no rows were accumulated.
+        """
+        n = self._n
+        if n == 0:
+            raise ValueError('cannot fit a model without data')
+
+        mean_x = self._sum_x / n
+        mean_y = self._sum_y / n
+        sxx = self._xtx - n * np.outer(mean_x, mean_x)
+        sxy = self._xty - n * mean_x * mean_y
+        syy = self._yty - n * mean_y ** 2
+
+        try:
+            lower = np.linalg.cholesky(sxx)
+            coefficients = np.linalg.solve(
+                lower.T, np.linalg.solve(lower, sxy))
+        except np.linalg.LinAlgError:
+            coefficients = np.linalg.lstsq(sxx, sxy, rcond=None)[0]
+
+        intercept = (mean_y + self._shift_y
+                     - coefficients @ (mean_x + self._shift_x))
+        ss_res = max(syy - coefficients @ sxy, 0.0)
+
+        if syy > 0:
+            r2 = 1.0 - ss_res / syy
+        else:
+            r2 = 1.0 if ss_res == 0 else 0.0
+
+        return MultipleFitResult(coefficients, float(intercept), float(r2),
+                                 float(ss_res / n), int(n))
+
+
+def fit_multiple(x, y, block_size: int = BLOCK_SIZE) -> MultipleFitResult:
+    """Fit y = x @ coefficients + intercept by ordinary least squares.
+
+    Args:
+        x: Matrix of features, one column per feature.
+        y: Values of the dependent variable.
+        block_size: Rows processed at a time.
+
+    Returns:
+        MultipleFitResult with the coefficients, R², MSE and number of
+        rows.
+
+    Raises:
+        ValueError: If the inputs are empty, misaligned, non-numeric or
+            contain NaN or infinite values.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    features = x.shape[1] if x.ndim == 2 else 1
+    return GramAccumulator(features).update(x, y, block_size).result()
+
+
+def numeric_columns(data: pd.DataFrame) -> List[str]:
+    """Return the names of the numeric, non-boolean columns of a frame."""
+    return list(data.select_dtypes(include='number').columns)
+
+
+def _numeric_block(data: pd.DataFrame, columns: List[str]) -> np.ndarray:
+    """Convert columns of a frame to a float64 matrix, missing values as NaN.
+
+    Values that are not numbers, which CSV chunks may hold for columns
+    found numeric in earlier chunks, are treated as missing.
+    """
+    block = data[columns]
+    try:
+        return block.to_numpy(dtype=np.float64, na_value=np.nan)
+    except (TypeError, ValueError):
+        block = block.apply(pd.to_numeric, errors='coerce')
+        return block.to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+class PairwiseAccumulator:
+    """Statistics of the regressions between every pair of columns.
+
+    For each ordered pair (x, y) the rows where both values are finite
+    are used, so a NaN only excludes its row from the pairs of its own
+    column. The counts, sums, sums of squares and cross-products of all
+    pairs are matrices updated with one matrix product each per block;
+    blocks without missing values only need the cross-products. Values
+    are shifted by the column means of the first block to keep the sums
+    of squares accurate for data far from the origin.
+    """
+
+    def __init__(self, columns: Sequence[str]):
+        """Initialize an empty accumulator.
+
+        Args:
+            columns: Names of the columns to pair.
+        """
+        self._columns = list(columns)
+        size = len(self._columns)
+        self._shift = None
+        self._n = np.zeros((size, size))
+        self._sum = np.zeros((size, size))
+        self._sum_sq = np.zeros((size, size))
+        self._cross = np.zeros((size, size))
+
+    @property
+    def columns(self) -> List[str]:
+        """Get the names of the paired columns."""
+        return self._columns
+
+    def update(self, data: pd.DataFrame, block_size: int = BLOCK_SIZE
+               ) -> 'PairwiseAccumulator':
+        """Add the rows of a frame to the accumulator.
+
+        Args:
+            data: DataFrame holding the paired columns.
+            block_size: Rows converted to float64 at a time.
+
+        Returns:
+            The accumulator itself.
+        """
+        for start in range(0, len(data), block_size):
+            values = _numeric_block(data.iloc[start:start + block_size],
+                                    self._columns)
+            finite = np.isfinite(values)
+
+            if self._shift is None:
+                counts = finite.sum(axis=0)
+                totals = np.where(finite, values, 0.0).sum(axis=0)
+                self._shift = np.divide(totals, counts,
+                                        out=np.zeros(len(totals)),
+                                        where=counts > 0)
+
+            centred = values - self._shift
+            if finite.all():
+                sums = centred.sum(axis=0)
+                self._n += len(centred)
+                self._sum += sums[:, None]
+                self._sum_sq += (centred * centred).sum(axis=0)[:, None]
+            else:
+                centred[~finite] = 0.0
+                mask = finite.astype(np.float64)
+                self._n += mask.T @ mask
+                self._sum += centred.T @ mask
+                self._sum_sq += (centred * centred).T @ mask
+            self._cross += centred.T @ centred
+
+        return self
+
+    def result(self) -> pd.DataFrame:
+        """Derive the coefficients and metrics of every pair.
+
+        Returns:
+            DataFrame with the columns x, y, slope, intercept, r2, mse
+            and n, one row per ordered pair with data, sorted by
+            decreasing R².
+        """
+        if self._shift is None:
+            return pd.DataFrame(
+                columns=['x', 'y', 'slope', 'intercept', 'r2', 'mse', 'n'])
+
+        n = self._n
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean_x = self._sum / n
+            mean_y = mean_x.T
+            sxx = np.maximum(self._sum_sq - n * mean_x ** 2, 0.0)
+            syy = sxx.T
+            sxy = self._cross - n * mean_x * mean_y
+
+            slope = np.where(sxx > 0, sxy / sxx, 0.0)
+            intercept = (mean_y + self._shift[None, :]
+                         - slope * (mean_x + self._shift[:, None]))
+            ss_res = np.maximum(syy - slope * sxy, 0.0)
+            r2 = np.where(syy > 0, 1.0 - ss_res / syy,
+                          np.where(ss_res == 0, 1.0, 0.0))
+            mse = ss_res / n
+
+        x, y = np.nonzero((n > 0) & ~np.eye(len(self._columns), dtype=bool))
+        names = np.array(self._columns, dtype=object)
+        pairs = pd.DataFrame({
+            'x': names[x],
+            'y': names[y],
+            'slope': slope[x, y],
+            'intercept': intercept[x, y],
+            'r2': r2[x, y],
+            'mse': mse[x, y],
+            'n': n[x, y].astype(np.int64),
+        })
+        return pairs.sort_values('r2', ascending=False, kind='stable',
+                                 ignore_index=True)
+
+
+def fit_all_pairs(data: pd.DataFrame,
+                  columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """Fit a simple regression for every ordered pair of numeric columns.
+
+    Args:
+        data: DataFrame containing the data.
+        columns: Columns to pair, all numeric columns by default
+            (optional).
+
+    Returns:
+        DataFrame of the fits, see PairwiseAccumulator.result.
+    """
+    if columns is None:
+        columns = numeric_columns(data)
+    return PairwiseAccumulator(columns).update(data).result()
+
+
+def fit_all_pairs_chunks(chunks: Iterable[pd.DataFrame],
+                         columns: Optional[Sequence[str]] = None
+                         ) -> pd.DataFrame:
+    """Fit every pair of numeric columns from a stream of DataFrames.
+
+    Args:
+        chunks: Iterable of DataFrames, e.g. from FileReader.iter_chunks.
+        columns: Columns to pair, the numeric columns of the first chunk
+            by default (optional).
+
+    Returns:
+        DataFrame of the fits, see PairwiseAccumulator.result.
+    """
+    accumulator = None
+    for chunk in chunks:
+        if accumulator is None:
+            accumulator = PairwiseAccumulator(
+                numeric_columns(chunk) if columns is None else columns)
+        accumulator.update(chunk)
+
+    if accumulator is None:
+        accumulator = PairwiseAccumulator(columns or [])
+    return accumulator.result()
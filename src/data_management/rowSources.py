@@ -0,0 +1,219 @@
+"""Module for reading the rows of a dataset on demand.
+
+This module provides row sources that hand out the rows of a dataset page
+by page, so a view can show the first rows of a file as soon as they are
+parsed and read the next ones only when they are needed. Sources exist
+for in-memory DataFrames, CSV files read in chunks and SQLite cursors.
+"""
+
+import abc
+from pathlib import Path
+from typing import List, Optional
+
+import pandas as pd
+from pandas import DataFrame
+
+from data_management.sqliteReader import SQLiteReader
+
+
+# Rows parsed at once by sources reading files
+SOURCE_CHUNK_SIZE = 10_000
+
+
+class RowSource(abc.ABC):
+    """Base class of the sources of rows.
+
+    Subclasses implement _read_chunk, which returns the next rows of the
+    dataset in chunks of any size. The rows read beyond a page are kept
+    for the next call to fetch.
+    """
+
+    def __init__(self, columns: List[str]):
+        """Initialize the source.
+
+        Args:
+            columns: Names of the columns of the dataset.
+        """
+        self._columns = list(columns)
+        self._pending = []
+        self._pending_rows = 0
+        self._exhausted = False
+
+    @property
+    def columns(self) -> List[str]:
+        """Get the names of the columns of the dataset."""
+        return self._columns
+
+    @property
+    def exhausted(self) -> bool:
+        """Whether every row of the dataset has been fetched."""
+        return self._exhausted and not self._pending_rows
+
+    @abc.abstractmethod
+    def _read_chunk(self) -> Optional[DataFrame]:
+        """Read the next rows of the dataset.
+
+        Returns:
+            DataFrame with the next rows, or None after the last one.
+        """
+
+    def fetch(self, count: int) -> DataFrame:
+        """Return the next rows of the dataset.
+
+        Args:
+            count: Number of rows wanted.
+
+        Returns:
+            DataFrame with at most count rows, numbered from 0. It has
+            fewer rows only when the dataset has no more.
+        """
+        while self._pending_rows < count and not self._exhausted:
+            chunk = self._read_chunk()
+            if chunk is None:
+                self._exhausted = True
+                self.close()
+            elif len(chunk):
+                self._pending.append(chunk)
+                self._pending_rows += len(chunk)
+
+        if not self._pending:
+            return DataFrame(columns=self._columns)
+
+        rows = pd.concat(self._pending, ignore_index=True)
+        page, rest = rows.iloc[:count], rows.iloc[count:]
+        self._pending = [rest] if len(rest) else []
+        self._pending_rows = len(rest)
+        return page.reset_index(drop=True)
+
+    def close(self) -> None:
+        """Release the resources held by the source."""
+        pass
+
+
+class FrameSource(RowSource):
+    """Hands out the rows of a DataFrame already in memory."""
+
+    def __init__(self, data: DataFrame):
+        """Initialize the source.
+
+        Args:
+            data: DataFrame whose rows are handed out.
+        """
+        super().__init__(data.columns)
+        self._data = data
+        self._position = 0
+
+    def _read_chunk(self) -> Optional[DataFrame]:
+        if self._position >= len(self._data):
+            return None
+        start = self._position
+        self._position += SOURCE_CHUNK_SIZE
+        return self._data.iloc[start:self._position]
+
+
+class CSVSource(RowSource):
+    """Reads the rows of a CSV file chunk by chunk."""
+
+    def __init__(self, file_name: str,
+                 chunk_size: int = SOURCE_CHUNK_SIZE,
+                 columns: Optional[List[str]] = None):
+        """Open the file.
+
+        Args:
+            file_name: Path to the CSV file.
+            chunk_size: Number of rows parsed at once.
+            columns: Subset of columns to read (optional).
+        """
+        header = pd.read_csv(file_name, nrows=0, usecols=columns)
+        super().__init__(header.columns)
+        self._reader = pd.read_csv(file_name, chunksize=chunk_size,
+                                   usecols=columns)
+
+    def _read_chunk(self) -> Optional[DataFrame]:
+        return next(self._reader, None)
+
+    def close(self) -> None:
+        self._reader.close()
+
+
+class SQLiteSource(RowSource):
+    """Reads the rows of a SQLite table from an open cursor."""
+
+    def __init__(self, file_name: str, table: Optional[str] = None,
+                 chunk_size: int = SOURCE_CHUNK_SIZE,
+                 columns: Optional[List[str]] = None):
+        """Open the database and run the query.
+
+        Args:
+            file_name: Path to the SQLite database file.
+            table: Name of the table, the first one by default (optional).
+            chunk_size: Number of rows fetched at once.
+            columns: Subset of columns to read (optional).
+        """
+        self._database = SQLiteReader(file_name)
+        try:
+            self._cursor = self._database.cursor(table, columns)
+        except Exception:
+            self._database.close()
+            raise
+        super().__init__(
+            [description[0] for description in self._cursor.description])
+        self._chunk_size = chunk_size
+
+    def _read_chunk(self) -> Optional[DataFrame]:
+        rows = self._cursor.fetchmany(self._chunk_size)
+        if not rows:
+            return None
+        return DataFrame.from_records(rows, columns=self._columns,
+                                      coerce_float=True)
+
+    def close(self) -> None:
+        self._cursor.close()
+        self._database.close()
+
+
+def open_source(file_name: str, table: Optional[str] = None,
+                columns: Optional[List[str]] = None) -> Optional[RowSource]:
+    """Open a source reading the rows of a file on demand.
+
+    Args:
+        file_name: Path to the file.
+        table: Table to read from SQLite files (optional).
+        columns: Subset of columns to read (optional).
+
+    Returns:
+        A CSVSource or SQLiteSource, or None for files that cannot be
+        read partially, such as Excel files.
+    """
+    extension = Path(file_name).suffix
+    if extension == '.csv':
+        return CSVSource(file_name, columns=columns)
+    if extension in {'.db', '.sqlite'}:
+        return SQLiteSource(file_name, table, columns=columns)
+    return None
+
+
+def read_preview(file_name: str, table: Optional[str] = None,
+                 rows: int = SOURCE_CHUNK_SIZE) -> Optional[RowSource]:
+    """Read the first rows of a file into a source held in memory.
+
+    The file is only read here, so a worker thread can call this and
+    hand the source to the GUI thread without sharing file handles or
+    database connections.
+
+    Args:
+        file_name: Path to the file.
+        table: Table to read from SQLite files (optional).
+        rows: Number of rows read.
+
+    Returns:
+        A FrameSource with at most rows rows, or None for files that
+        cannot be read partially, such as Excel files.
+    """
+    source = open_source(file_name, table)
+    if source is None:
+        return None
+    try:
+        return FrameSource(source.fetch(rows))
+    finally:
+        source.close()
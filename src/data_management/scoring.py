@@ -0,0 +1,80 @@
+"""Module for scoring whole files with a regression model.
+
+This module streams the rows of a CSV file, SQLite table or Excel sheet
+through a model and writes the predictions to a CSV file chunk by chunk,
+so files larger than memory can be scored. Progress and cancellation
+follow FileReader.iter_chunks.
+"""
+
+from pathlib import Path
+from typing import Callable, Optional
+
+from data_management.fileReader import FileReader
+from data_management.linearRegression import Model
+
+
+# Rows read, predicted and written at a time
+SCORE_CHUNK_SIZE = 100_000
+
+
+def prediction_column(model: Model) -> str:
+    """Name the column holding the predictions of a model.
+
+    Args:
+        model: Model making the predictions.
+
+    Returns:
+        Name of the column, e.g. 'Predicted y'.
+    """
+    return f'Predicted {model.y_name}'
+
+
+def score_file(model: Model, input_file: str, output_file: str,
+               table: Optional[str] = None, keep_columns: bool = True,
+               chunk_size: int = SCORE_CHUNK_SIZE,
+               progress: Optional[Callable[[int, int, int], None]] = None,
+               cancel: Optional[Callable[[], bool]] = None) -> int:
+    """Write the predictions of a model for every row of a file.
+
+    Excel files cannot be read partially, so they are scored in a single
+    chunk. The output file is removed if scoring fails or is cancelled.
+
+    Args:
+        model: Fitted or loaded model.
+        input_file: Path to a CSV, Excel or SQLite file holding the input
+            columns of the model.
+        output_file: Path to the CSV file written.
+        table: Table to read from SQLite files (optional).
+        keep_columns: Whether to copy the columns of the input file next
+            to the predictions, or write only the inputs and predictions.
+        chunk_size: Number of rows scored at a time.
+        progress: Callback receiving rows read, work done and total work
+            after every chunk, as in FileReader.iter_chunks (optional).
+        cancel: Callable returning True to abort (optional).
+
+    Returns:
+        Number of rows scored.
+
+    Raises:
+        LoadCancelled: If scoring was cancelled through cancel.
+        ParseError: If the input file could not be read.
+        ValueError: If the model has not been fitted.
+    """
+    columns = None if keep_columns else list(model.x_names)
+    name = prediction_column(model)
+    rows = 0
+
+    chunks = FileReader().iter_chunks(input_file, chunk_size, columns,
+                                      table, progress, cancel)
+    try:
+        with open(output_file, 'w', newline='') as output:
+            for chunk in chunks:
+                scored = chunk.assign(**{name: model.predict_batch(chunk)})
+                scored.to_csv(output, header=output.tell() == 0,
+                              index=False)
+                rows += len(chunk)
+    except BaseException:
+        Path(output_file).unlink(missing_ok=True)
+        raise
+
+    return rows
@@ -0,0 +1,268 @@
+"""Module for reading SQLite databases into pandas DataFrames.
+
+This module provides a SQLiteReader class that lists the tables of a
+database, pushes column projection and row filters down into SQL,
+streams results in chunks and computes regression statistics with
+aggregate queries, so large tables never need to be fully loaded.
+"""
+
+import os
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+)
+
+import pandas as pd
+from pandas import DataFrame
+
+# sqlite3 is imported when the first database is opened
+if TYPE_CHECKING:
+    import sqlite3
+
+
+class SQLiteReader:
+    """Reads tables of a SQLite database.
+
+    Filters are given as SQL expressions (the body of a WHERE clause)
+    with '?' placeholders bound to params. When no table is given, the
+    first table of the database is used.
+    """
+
+    def __init__(self, file_name: str):
+        """Open the database.
+
+        Args:
+            file_name: Path to the SQLite database file.
+
+        Raises:
+            FileNotFoundError: If the database file does not exist.
+        """
+        if not os.path.exists(file_name):
+            raise FileNotFoundError(file_name)
+
+        import sqlite3
+
+        self._file_name = file_name
+        self._conn = sqlite3.connect(file_name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self) -> None:
+        """Close the connection to the database."""
+        self._conn.close()
+
+    @staticmethod
+    def quote(identifier: str) -> str:
+        """Quote an SQL identifier such as a table or column name."""
+        return '"' + str(identifier).replace('"', '""') + '"'
+
+    def _table(self, table: Optional[str]) -> str:
+        """Return the quoted name of a table, the first one by default."""
+        if table is None:
+            query = ("SELECT name FROM sqlite_master WHERE type='table' "
+                     "ORDER BY rowid LIMIT 1;")
+            row = self._conn.execute(query).fetchone()
+            if row is None:
+                import sqlite3
+                raise sqlite3.DatabaseError('database has no tables')
+            table = row[0]
+        return self.quote(table)
+
+    def _select(self, table: Optional[str], columns: Optional[List[str]],
+                where: Optional[str]) -> str:
+        """Build a SELECT statement with projection and filter."""
+        projection = '*'
+        if columns is not None:
+            projection = ', '.join(self.quote(c) for c in columns)
+
+        query = f'SELECT {projection} FROM {self._table(table)}'
+        if where:
+            query += f' WHERE {where}'
+        return query
+
+    def tables(self) -> Dict[str, int]:
+        """List the tables of the database with their row counts.
+
+        Returns:
+            Dictionary mapping table names to numbers of rows, in the
+            order they were created.
+        """
+        query = ("SELECT name FROM sqlite_master WHERE type='table' "
+                 "ORDER BY rowid;")
+        names = [row[0] for row in self._conn.execute(query)]
+
+        return {
+            name: self._conn.execute(
+                f'SELECT COUNT(*) FROM {self.quote(name)};').fetchone()[0]
+            for name in names
+        }
+
+    def columns(self, table: Optional[str] = None) -> List[str]:
+        """Return the column names of a table.
+
+        Args:
+            table: Name of the table (optional).
+        """
+        cursor = self._conn.execute(
+            f'SELECT * FROM {self._table(table)} LIMIT 0;')
+        return [description[0] for description in cursor.description]
+
+    def count(self, table: Optional[str] = None, where: Optional[str] = None,
+              params: Sequence = ()) -> int:
+        """Count the rows of a table matching a filter.
+
+        Args:
+            table: Name of the table (optional).
+            where: SQL filter expression (optional).
+            params: Values for the placeholders of the filter.
+        """
+        query = f'SELECT COUNT(*) FROM {self._table(table)}'
+        if where:
+            query += f' WHERE {where}'
+        return self._conn.execute(query, params).fetchone()[0]
+
+    def cursor(self, table: Optional[str] = None,
+               columns: Optional[List[str]] = None,
+               where: Optional[str] = None,
+               params: Sequence = ()) -> 'sqlite3.Cursor':
+        """Run the query selecting rows of a table.
+
+        Args:
+            table: Name of the table (optional).
+            columns: Subset of columns to read (optional).
+            where: SQL filter expression (optional).
+            params: Values for the placeholders of the filter.
+
+        Returns:
+            Cursor over the selected rows, to be closed by the caller.
+        """
+        return self._conn.execute(self._select(table, columns, where), params)
+
+    def iter_chunks(self, table: Optional[str] = None,
+                    columns: Optional[List[str]] = None,
+                    where: Optional[str] = None, params: Sequence = (),
+                    chunk_size: int = 100_000,
+                    progress: Optional[Callable[[int, int, int], None]] = None,
+                    cancel: Optional[Callable[[], bool]] = None
+                    ) -> Iterator[DataFrame]:
+        """Stream the rows of a table in chunks fetched from a cursor.
+
+        Progress is reported like FileReader does for CSV files, the
+        bytes read being estimated from the share of rows already read.
+
+        Args:
+            table: Name of the table (optional).
+            columns: Subset of columns to read (optional).
+            where: SQL filter expression (optional).
+            params: Values for the placeholders of the filter.
+            chunk_size: Number of rows per chunk.
+            progress: Callback receiving rows read, bytes read and total
+                bytes (optional).
+            cancel: Callable returning True to abort the read (optional).
+
+        Yields:
+            DataFrame chunks of at most chunk_size rows. At least one
+            chunk, possibly empty, is always produced.
+
+        Raises:
+            LoadCancelled: If cancel returns True part-way.
+        """
+        from data_management.fileReader import LoadCancelled
+
+        total_rows = self.count(table, where, params) if progress else 0
+        total_bytes = os.path.getsize(self._file_name)
+        rows_read = 0
+
+        cursor = self.cursor(table, columns, where, params)
+        names = [description[0] for description in cursor.description]
+
+        try:
+            while True:
+                if cancel is not None and cancel():
+                    raise LoadCancelled
+                rows = cursor.fetchmany(chunk_size)
+                if not rows and rows_read:
+                    break
+
+                rows_read += len(rows)
+                if progress is not None:
+                    share = rows_read / total_rows if total_rows else 1
+                    progress(rows_read, int(share * total_bytes), total_bytes)
+
+                yield pd.DataFrame.from_records(rows, columns=names,
+                                                coerce_float=True)
+                if len(rows) < chunk_size:
+                    break
+        finally:
+            cursor.close()
+
+    def read(self, table: Optional[str] = None,
+             columns: Optional[List[str]] = None, where: Optional[str] = None,
+             params: Sequence = ()) -> DataFrame:
+        """Read a whole table, or its filtered rows, into a DataFrame.
+
+        Args:
+            table: Name of the table (optional).
+            columns: Subset of columns to read (optional).
+            where: SQL filter expression (optional).
+            params: Values for the placeholders of the filter.
+        """
+        return pd.read_sql(self._select(table, columns, where), self._conn,
+                           params=tuple(params))
+
+    def sufficient_statistics(self, x: str, y: str,
+                              table: Optional[str] = None,
+                              where: Optional[str] = None,
+                              params: Sequence = ()) -> Dict[str, float]:
+        """Compute the statistics of a simple regression inside SQLite.
+
+        Rows where x or y is NULL are ignored. Squares and cross-products
+        are summed around the means, found by a first query, to avoid
+        the cancellation of raw sums of squares.
+
+        Args:
+            x: Name of the independent variable column.
+            y: Name of the dependent variable column.
+            table: Name of the table (optional).
+            where: SQL filter expression (optional).
+            params: Values for the placeholders of the filter.
+
+        Returns:
+            Dictionary with the number of rows 'n', the sums 'sum_x' and
+            'sum_y', the sums of squared deviations 'sxx' and 'syy' and
+            the sum of cross-deviations 'sxy'.
+        """
+        qx = f'CAST({self.quote(x)} AS REAL)'
+        qy = f'CAST({self.quote(y)} AS REAL)'
+        condition = f'{self.quote(x)} IS NOT NULL AND {self.quote(y)} IS NOT NULL'
+        if where:
+            condition += f' AND ({where})'
+        source = f'FROM {self._table(table)} WHERE {condition}'
+
+        n, sum_x, sum_y = self._conn.execute(
+            f'SELECT COUNT(*), TOTAL({qx}), TOTAL({qy}) {source};', params
+        ).fetchone()
+
+        if n == 0:
+            return {'n': 0, 'sum_x': 0.0, 'sum_y': 0.0,
+                    'sxx': 0.0, 'syy': 0.0, 'sxy': 0.0}
+
+        mean_x, mean_y = sum_x / n, sum_y / n
+        sxx, syy, sxy = self._conn.execute(
+            f'SELECT TOTAL(({qx} - ?) * ({qx} - ?)), '
+            f'TOTAL(({qy} - ?) * ({qy} - ?)), '
+            f'TOTAL(({qx} - ?) * ({qy} - ?)) {source};',
+            (mean_x, mean_x, mean_y, mean_y, mean_x, mean_y, *params)
+        ).fetchone()
+
+        return {'n': n, 'sum_x': sum_x, 'sum_y': sum_y,
+                'sxx': sxx, 'syy': syy, 'sxy': sxy}
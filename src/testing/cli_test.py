@@ -0,0 +1,76 @@
+import contextlib
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+import pandas as pd
+
+import cli
+
+
+class TestCommandLine(unittest.TestCase):
+    def setUp(self):
+        """Write a small dataset with a missing output value"""
+        self.directory = tempfile.TemporaryDirectory()
+        self.data_file = os.path.join(self.directory.name, 'data.csv')
+        pd.DataFrame({
+            'x': [1.0, 2.0, 3.0, 4.0],
+            'y': [3.0, 5.0, 7.0, None],
+        }).to_csv(self.data_file, index=False)
+        self.model_file = os.path.join(self.directory.name, 'model.tlm')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def run_cli(self, *argv):
+        output, errors = io.StringIO(), io.StringIO()
+        with contextlib.redirect_stdout(output), \
+                contextlib.redirect_stderr(errors):
+            status = cli.main(list(argv))
+        return status, output.getvalue(), errors.getvalue()
+
+    def test_fit_and_predict(self):
+        """Test fitting, saving and scoring a file"""
+        status, output, _ = self.run_cli(
+            'fit', self.data_file, '-i', 'x', '-o', 'y', '--nan', 'delete',
+            '--save', self.model_file)
+        self.assertEqual(status, 0)
+        self.assertIn('y = 2.00 * x + 1.00', output)
+
+        scored_file = os.path.join(self.directory.name, 'scored.csv')
+        status, _, _ = self.run_cli('predict', self.model_file,
+                                    self.data_file, '-o', scored_file)
+        self.assertEqual(status, 0)
+        self.assertEqual(pd.read_csv(scored_file)['Predicted y'].tolist(),
+                         [3.0, 5.0, 7.0, 9.0])
+
+    def test_fit_fails_on_nan(self):
+        """Test that NaN values make the streamed fit fail"""
+        status, _, errors = self.run_cli('fit', self.data_file,
+                                         '-i', 'x', '-o', 'y')
+        self.assertEqual(status, 1)
+        self.assertIn('NaN', errors)
+
+    def test_profile(self):
+        """Test that profiles are printed as CSV"""
+        status, output, _ = self.run_cli('profile', self.data_file)
+        self.assertEqual(status, 0)
+        profiles = pd.read_csv(io.StringIO(output), index_col='column')
+        self.assertEqual(profiles.loc['y', 'nan_count'], 1)
+
+    def test_no_gui_imports(self):
+        """Test that running a command imports neither Qt nor matplotlib"""
+        code = ('import sys, cli; cli.main(sys.argv[1:]); '
+                'print(sorted({"PySide6", "matplotlib"} & set(sys.modules)))')
+        result = subprocess.run(
+            [sys.executable, '-c', code, 'profile', self.data_file],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(cli.__file__))
+        self.assertEqual(result.stdout.splitlines()[-1], '[]')
+
+
+if __name__ == '__main__':
+    unittest.main()
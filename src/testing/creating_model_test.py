@@ -272,6 +272,44 @@ class TestLinearRegressionModel(unittest.TestCase):
                 self.assertEqual(current_value, previous_value,
                                  f"El atributo {attr} debería mantener su valor anterior")
 
+    def test_multiple_inputs(self):
+        """Test a model with two input columns."""
+        data = pd.DataFrame({
+            'a': [1.0, 2.0, 3.0, 4.0, 5.0],
+            'b': [2.0, 1.0, 4.0, 3.0, 6.0],
+        })
+        data['y'] = 3 * data['a'] - data['b'] + 2
+        self.model.create_from_data(data, ['a', 'b'], 'y')
+        self.assertEqual(self.model.x_names, ['a', 'b'])
+        self.assertEqual(self.model.x_name, 'a, b')
+        self.assertIsNone(self.model.slope)
+        np.testing.assert_allclose(self.model.coefficients, [3.0, -1.0],
+                                   atol=1e-9)
+        self.assertAlmostEqual(self.model.intercept, 2.0, places=9)
+        self.assertAlmostEqual(self.model.r2, 1.0, places=9)
+        self.assertEqual(self.model.formula,
+                         'y = 3.00 * a + -1.00 * b + 2.00')
+        self.assertAlmostEqual(self.model.predict([1.0, 1.0]), 4.0)
+        np.testing.assert_allclose(self.model.pred_line, data['y'])
+
+    def test_polynomial_degree(self):
+        """Test a quadratic model and its predictions."""
+        data = pd.DataFrame({'x': np.arange(-3.0, 4.0)})
+        data['y'] = data['x'] ** 2 - 1
+        self.model.create_from_data(data, 'x', 'y', degree=2)
+        self.assertEqual(self.model.terms, ['x', 'x^2'])
+        np.testing.assert_allclose(self.model.coefficients, [0.0, 1.0],
+                                   atol=1e-9)
+        np.testing.assert_allclose(self.model.predict([[2.0], [5.0]]),
+                                   [3.0, 24.0])
+
+    def test_simple_model_coefficients(self):
+        """Test that a simple model also exposes its coefficients."""
+        self.model.create_from_data(self.data, 'x', 'y')
+        self.assertEqual(self.model.x_names, ['x'])
+        np.testing.assert_allclose(self.model.coefficients, [2.0])
+        self.assertAlmostEqual(self.model.predict([3.0]), 6.0)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,84 @@
+import unittest
+import os
+import tempfile
+import pandas as pd
+from data_management import DatasetCache, FileReader
+
+
+@unittest.skipUnless(DatasetCache().available, "pyarrow is not installed")
+class TestDatasetCache(unittest.TestCase):
+    def setUp(self):
+        """Create a temporary CSV file and an empty cache folder"""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.csv_path = os.path.join(self.tmp_dir.name, "data.csv")
+        self.test_data = pd.DataFrame({
+            'x': [1, 2, 3, 4],
+            'y': [2.0, 4.5, 6.0, 8.5]
+        })
+        self.test_data.to_csv(self.csv_path, index=False)
+        self.cache = DatasetCache(os.path.join(self.tmp_dir.name, "cache"))
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_miss_then_hit(self):
+        """Test that a stored frame is returned on the next load"""
+        self.assertIsNone(self.cache.get(self.csv_path))
+        self.cache.put(self.csv_path, self.test_data)
+        cached = self.cache.get(self.csv_path)
+        pd.testing.assert_frame_equal(cached, self.test_data,
+                                      check_dtype=False)
+
+    def test_projected_hit_from_full_entry(self):
+        """Test that a full entry serves column-projected requests"""
+        self.cache.put(self.csv_path, self.test_data)
+        cached = self.cache.get(self.csv_path, columns=['y'])
+        self.assertEqual(list(cached.columns), ['y'])
+
+    def test_modified_file_is_a_miss(self):
+        """Test that changing the source file invalidates its entry"""
+        self.cache.put(self.csv_path, self.test_data)
+        self.test_data.iloc[:2].to_csv(self.csv_path, index=False)
+        self.assertIsNone(self.cache.get(self.csv_path))
+
+    def test_lru_eviction(self):
+        """Test that old entries are evicted beyond the size limit"""
+        other_path = os.path.join(self.tmp_dir.name, "other.csv")
+        self.test_data.to_csv(other_path, index=False)
+
+        self.cache.put(self.csv_path, self.test_data)
+        entry, = self.cache.directory.iterdir()
+        entry_size = entry.stat().st_size
+        os.utime(entry, (0, 0))
+        small_cache = DatasetCache(self.cache.directory,
+                                   max_bytes=entry_size)
+        small_cache.put(other_path, self.test_data)
+
+        self.assertIsNone(small_cache.get(self.csv_path))
+        self.assertIsNotNone(small_cache.get(other_path))
+
+    def test_file_reader_uses_cache(self):
+        """Test that FileReader stores and reuses parsed frames"""
+        reader = FileReader(cache=self.cache)
+        first = reader.parse_file(self.csv_path)
+        self.assertIsNotNone(self.cache.get(self.csv_path))
+        second = reader.parse_file(self.csv_path)
+        pd.testing.assert_frame_equal(first, second, check_dtype=False)
+
+    def test_projected_order_matches_uncached_read(self):
+        """Test that cached and uncached projected reads agree on order"""
+        reader = FileReader(cache=self.cache)
+        for chunk_size in (None, 2):
+            uncached = FileReader().parse_file(
+                self.csv_path, chunk_size=chunk_size, columns=['y', 'x'])
+            self.assertEqual(list(uncached.columns), ['y', 'x'])
+
+            reader.parse_file(self.csv_path)
+            cached = reader.parse_file(self.csv_path, chunk_size=chunk_size,
+                                       columns=['y', 'x'])
+            pd.testing.assert_frame_equal(cached, uncached,
+                                          check_dtype=False)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+import numpy as np
+import pandas as pd
+from data_management.dtypeOptimizer import optimize_dtypes
+from data_management import Model
+
+
+class TestOptimizeDtypes(unittest.TestCase):
+    def setUp(self):
+        """Create a frame with pandas default dtypes"""
+        self.data = pd.DataFrame({
+            'small_int': np.arange(1000, dtype=np.int64) % 100,
+            'exact_float': np.arange(1000, dtype=np.float64) / 4,
+            'precise_float': np.arange(1000, dtype=np.float64) / 3,
+            'label': ['a', 'b'] * 500,
+        })
+
+    def test_downcasting(self):
+        """Test that every column gets a narrower dtype when it is safe"""
+        optimized, saved = optimize_dtypes(self.data)
+
+        self.assertEqual(optimized['small_int'].dtype, np.int8)
+        self.assertEqual(optimized['exact_float'].dtype, np.float32)
+        self.assertEqual(optimized['precise_float'].dtype, np.float64)
+        self.assertIsInstance(optimized['label'].dtype, pd.CategoricalDtype)
+        self.assertGreater(saved, 0)
+
+    def test_values_are_preserved(self):
+        """Test that optimized values compare equal to the original ones"""
+        optimized, _ = optimize_dtypes(self.data)
+        pd.testing.assert_frame_equal(optimized, self.data,
+                                      check_dtype=False,
+                                      check_categorical=False)
+
+    def test_nan_values_are_kept(self):
+        """Test that NaN values survive the float downcast"""
+        data = pd.DataFrame({'x': [0.5, np.nan, 1.5]})
+        optimized, _ = optimize_dtypes(data)
+        self.assertEqual(optimized['x'].isna().sum(), 1)
+
+    def test_regression_uses_float64(self):
+        """Test that the model is fitted in float64 on downcast columns"""
+        optimized, _ = optimize_dtypes(self.data)
+        model = Model()
+        model.create_from_data(optimized, 'exact_float', 'small_int')
+        self.assertEqual(model.target_value.dtype, np.float64)
+
+
+if __name__ == '__main__':
+    unittest.main()
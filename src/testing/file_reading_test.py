@@ -2,8 +2,9 @@ import unittest
 import pandas as pd
 import sqlite3
 import os
+import tempfile
 from pathlib import Path
-from data_management.fileReader import FileReader, ParseError
+from data_management.fileReader import FileReader, ParseError, LoadCancelled
 
 
 class TestFileReader(unittest.TestCase):
@@ -86,5 +87,101 @@ class TestFileReader(unittest.TestCase):
             print(f"Error limpiando archivos: {e}")
 
 
+class TestStreamingCsv(unittest.TestCase):
+    def setUp(self):
+        """Create a temporary CSV file with a few hundred rows"""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.csv_path = os.path.join(self.tmp_dir.name, "stream.csv")
+        self.test_data = pd.DataFrame({
+            'x': range(250),
+            'y': [v * 0.5 for v in range(250)]
+        })
+        self.test_data.to_csv(self.csv_path, index=False)
+        self.reader = FileReader()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_chunked_read_matches_full_read(self):
+        """Test that a streamed read builds the same frame"""
+        df = self.reader.parse_file(self.csv_path, chunk_size=100)
+        pd.testing.assert_frame_equal(df, self.test_data)
+
+    def test_chunked_read_of_many_chunks(self):
+        """Test that a read of many chunks keeps their order"""
+        df = self.reader.parse_file(self.csv_path, chunk_size=10)
+        pd.testing.assert_frame_equal(df, self.test_data)
+
+    def test_progress_events(self):
+        """Test that progress is reported after every chunk"""
+        events = []
+        self.reader.parse_file(
+            self.csv_path,
+            chunk_size=100,
+            progress=lambda *event: events.append(event)
+        )
+        self.assertEqual([rows for rows, _, _ in events], [100, 200, 250])
+        total = os.path.getsize(self.csv_path)
+        self.assertEqual(events[-1][1:], (total, total))
+
+    def test_cancel(self):
+        """Test that a cancelled read raises LoadCancelled"""
+        events = []
+        with self.assertRaises(LoadCancelled):
+            self.reader.parse_file(
+                self.csv_path,
+                chunk_size=100,
+                progress=lambda *event: events.append(event),
+                cancel=lambda: len(events) == 1
+            )
+        self.assertEqual(len(events), 1)
+
+
+class TestColumnProjection(unittest.TestCase):
+    def setUp(self):
+        """Create temporary CSV and SQLite files with several columns"""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.test_data = pd.DataFrame({
+            'A': [1, 2, 3],
+            'B': [4.5, 5.5, 6.5],
+            'C': ['x', 'y', 'z'],
+            'D': [7, 8, 9]
+        })
+        self.csv_path = os.path.join(self.tmp_dir.name, "wide.csv")
+        self.test_data.to_csv(self.csv_path, index=False)
+        self.db_path = os.path.join(self.tmp_dir.name, "wide.db")
+        conn = sqlite3.connect(self.db_path)
+        self.test_data.to_sql('wide table', conn, index=False)
+        conn.close()
+        self.reader = FileReader()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_read_columns(self):
+        """Test reading only the header of each format"""
+        for path in (self.csv_path, self.db_path):
+            self.assertEqual(self.reader.read_columns(path),
+                             ['A', 'B', 'C', 'D'])
+
+    def test_projected_csv(self):
+        """Test loading a subset of the columns of a CSV file"""
+        expected = self.test_data[['B', 'D']]
+        for chunk_size in (None, 2):
+            df = self.reader.parse_file(self.csv_path, chunk_size=chunk_size,
+                                        columns=['B', 'D'])
+            pd.testing.assert_frame_equal(df, expected)
+
+    def test_projected_sqlite(self):
+        """Test loading a subset of the columns of a SQLite table"""
+        df = self.reader.parse_file(self.db_path, columns=['D', 'A'])
+        pd.testing.assert_frame_equal(df, self.test_data[['D', 'A']])
+
+    def test_unknown_column(self):
+        """Test that projecting a missing column raises ParseError"""
+        with self.assertRaises(ParseError):
+            self.reader.parse_file(self.csv_path, columns=['Z'])
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,73 @@
+import os
+import subprocess
+import sys
+import unittest
+
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO_ROOT = os.path.dirname(SRC_DIR)
+
+# Largest total import time of each statement, in microseconds, taking the
+# fastest of RUNS runs. Measured at about a third of these on one core.
+BUDGETS = {
+    'import data_management': 1_500_000,
+    'from user_interface import MainWindow': 2_500_000,
+}
+RUNS = 3
+
+# Dependencies imported only by the features that use them
+DEFERRED = ('matplotlib', 'sklearn', 'joblib', 'sqlite3',
+            'multiprocessing.shared_memory')
+
+
+def import_times(statement):
+    """Run a statement under -X importtime in a fresh interpreter.
+
+    Returns:
+        Dictionary mapping every module imported to its cumulative
+        import time in microseconds, and None to the total time.
+    """
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([SRC_DIR, REPO_ROOT]))
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        capture_output=True, text=True, check=True, cwd=SRC_DIR, env=env)
+
+    times = {None: 0}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(cumulative)
+        # Nested imports are indented below the module importing them
+        if not name[1:].startswith(' '):
+            times[None] += int(cumulative)
+    return times
+
+
+class TestImportTime(unittest.TestCase):
+    def test_heavy_dependencies_are_deferred(self):
+        """Test that startup imports no dependency of a later feature"""
+        for statement in BUDGETS:
+            with self.subTest(statement=statement):
+                imported = import_times(statement)
+                self.assertEqual(
+                    [module for module in DEFERRED if module in imported],
+                    [])
+
+    def test_widgets_are_imported_on_access(self):
+        """Test that importing the package imports no widget or Qt"""
+        imported = import_times('import user_interface')
+        self.assertNotIn('PySide6', imported)
+        self.assertNotIn('user_interface.mainWindow', imported)
+
+    def test_startup_budget(self):
+        """Test that startup stays within its import time budget"""
+        for statement, budget in BUDGETS.items():
+            with self.subTest(statement=statement):
+                fastest = min(import_times(statement)[None]
+                              for _ in range(RUNS))
+                self.assertLess(fastest, budget)
+
+
+if __name__ == '__main__':
+    unittest.main()
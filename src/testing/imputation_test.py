@@ -0,0 +1,82 @@
+import unittest
+from unittest import mock
+import numpy as np
+import pandas as pd
+from data_management import LoadCancelled
+from data_management import imputation
+from data_management.imputation import (
+    fill_backward,
+    fill_forward,
+    group_mean,
+    interpolate,
+    regression_fill,
+)
+
+
+class TestImputation(unittest.TestCase):
+    def setUp(self):
+        """Create values with missing runs, processed in small chunks"""
+        rng = np.random.default_rng(0)
+        self.values = rng.normal(size=500)
+        self.values[rng.random(500) < 0.4] = np.nan
+        self.values[:3] = np.nan
+        self.series = pd.Series(self.values)
+
+        patcher = mock.patch.object(imputation, 'IMPUTE_CHUNK', 7)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def assert_filled(self, result, expected):
+        np.testing.assert_allclose(result, expected, equal_nan=True)
+
+    def test_fill(self):
+        """Test forward and backward fill against pandas"""
+        self.assert_filled(fill_forward(self.values), self.series.ffill())
+        self.assert_filled(fill_forward(self.values, limit=2),
+                           self.series.ffill(limit=2))
+        self.assert_filled(fill_backward(self.values, limit=1),
+                           self.series.bfill(limit=1))
+
+    def test_interpolate(self):
+        """Test linear interpolation by position and along a coordinate"""
+        self.assert_filled(interpolate(self.values),
+                           self.series.interpolate(limit_area='inside'))
+
+        values = np.array([1.0, np.nan, np.nan, 4.0])
+        x = np.array([0.0, 1.0, 5.0, 6.0])
+        self.assert_filled(interpolate(values, x), [1.0, 1.5, 3.5, 4.0])
+
+    def test_group_mean(self):
+        """Test that values are filled with the mean of their group"""
+        keys = pd.Series(np.arange(500) % 3).astype(str)
+        keys[5] = None
+        expected = self.series.fillna(
+            self.series.groupby(keys).transform('mean'))
+        self.assert_filled(group_mean(self.values, keys), expected)
+
+    def test_regression_fill(self):
+        """Test that values are predicted from the other column"""
+        x = np.arange(10, dtype=np.float64)
+        y = 2 * x + 1
+        y[[2, 7]] = np.nan
+        x[7] = np.nan
+        result = regression_fill(y, x)
+        self.assertAlmostEqual(result[2], 5.0)
+        self.assertTrue(np.isnan(result[7]))
+
+        with self.assertRaises(ValueError):
+            regression_fill(np.array([1.0, np.nan]), np.array([1.0, 2.0]))
+
+    def test_progress_and_cancel(self):
+        """Test that kernels report progress and can be cancelled"""
+        reports = []
+        fill_forward(self.values,
+                     progress=lambda *args: reports.append(args))
+        self.assertEqual(reports[-1], (500, 500, 500))
+
+        with self.assertRaises(LoadCancelled):
+            fill_forward(self.values, cancel=lambda: True)
+
+
+if __name__ == '__main__':
+    unittest.main()
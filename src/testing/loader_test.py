@@ -0,0 +1,82 @@
+import unittest
+
+from data_management import LoadCancelled
+from user_interface.loader import LoadTask
+
+
+class TestLoadTask(unittest.TestCase):
+    def setUp(self):
+        """Record the signals emitted by the tasks"""
+        self.events = []
+
+    def run_task(self, task):
+        """Connect the signals of a task and run it in this thread"""
+        task.signals.finished.connect(
+            lambda result: self.events.append(('finished', result)))
+        task.signals.failed.connect(
+            lambda message: self.events.append(('failed', message)))
+        task.signals.cancelled.connect(
+            lambda: self.events.append(('cancelled',)))
+        task.signals.progress.connect(
+            lambda *values: self.events.append(('progress',) + values))
+        task.run()
+
+    def test_finished(self):
+        """Test that the result of the function is emitted"""
+        self.run_task(LoadTask(lambda a, b=0: a + b, 1, b=2))
+        self.assertEqual(self.events, [('finished', 3)])
+
+    def test_failed(self):
+        """Test that an error of the function is emitted as a message"""
+        def function():
+            raise ValueError('bad file')
+
+        self.run_task(LoadTask(function))
+        self.assertEqual(self.events, [('failed', 'bad file')])
+
+    def test_progress(self):
+        """Test that progress events are forwarded before the result"""
+        def function(progress, cancel):
+            progress(10, 100, 400)
+            progress(20, 400, 400)
+            return 'done'
+
+        self.run_task(LoadTask(function, report_progress=True))
+        self.assertEqual(self.events, [('progress', 10, 100, 400),
+                                       ('progress', 20, 400, 400),
+                                       ('finished', 'done')])
+
+    def test_cancelled_while_running(self):
+        """Test that a function stopped by the cancel flag is cancelled"""
+        def function(progress, cancel):
+            task.cancel()
+            if cancel():
+                raise LoadCancelled()
+            return 'done'
+
+        task = LoadTask(function, report_progress=True)
+        self.run_task(task)
+        self.assertEqual(self.events, [('cancelled',)])
+
+    def test_cancelled_before_start(self):
+        """Test that a task cancelled before it runs skips its function"""
+        calls = []
+        task = LoadTask(calls.append, 'called')
+        task.cancel()
+        self.run_task(task)
+        self.assertEqual(calls, [])
+        self.assertEqual(self.events, [('cancelled',)])
+
+    def test_cancel_after_return_finishes(self):
+        """Test that a cancel after the function returned keeps the result"""
+        def function():
+            task.cancel()
+            return 'done'
+
+        task = LoadTask(function)
+        self.run_task(task)
+        self.assertEqual(self.events, [('finished', 'done')])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from data_management import Model, load_model, save_model
+from data_management.modelFileManager import FORMAT_VERSION, MAGIC
+
+
+class TestModelFormat(unittest.TestCase):
+    def setUp(self):
+        """Fit a model on two inputs and save it"""
+        self.directory = tempfile.TemporaryDirectory()
+        self.model_file = os.path.join(self.directory.name, 'model.tlm')
+
+        data = pd.DataFrame({'a': [1.0, 2.0, 3.0, 4.0],
+                             'b': [2.0, 0.0, 5.0, 1.0]})
+        data['y'] = 3 * data['a'] - data['b'] + 2
+        self.model = Model()
+        self.model.create_from_data(data, ['a', 'b'], 'y')
+        self.save(self.model_file)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def save(self, file_path):
+        save_model(file_path, formula=self.model.formula,
+                   input=self.model.x_name, output=self.model.y_name,
+                   r2=self.model.r2, mse=self.model.mse,
+                   description='two inputs', slope=self.model.slope,
+                   intercept=self.model.intercept,
+                   inputs=self.model.x_names,
+                   coefficients=self.model.coefficients,
+                   degree=self.model.degree,
+                   statistics=self.model.statistics)
+
+    def test_round_trip(self):
+        """Test that every attribute survives saving and loading"""
+        with open(self.model_file, 'rb') as file:
+            self.assertTrue(file.read().startswith(MAGIC))
+
+        loaded = load_model(self.model_file)
+        self.assertEqual(loaded.x_names, ['a', 'b'])
+        self.assertEqual(loaded.formula, self.model.formula)
+        self.assertEqual(loaded.description, 'two inputs')
+        self.assertEqual(loaded.statistics, {'n': 4})
+        self.assertIsNone(loaded.slope)
+        np.testing.assert_array_equal(loaded.coefficients,
+                                      self.model.coefficients)
+        self.assertEqual(loaded.intercept, self.model.intercept)
+        self.assertAlmostEqual(loaded.predict([1.0, 1.0]), 4.0)
+
+    def test_corruption_is_detected(self):
+        """Test that a flipped byte or a truncated file raise ValueError"""
+        with open(self.model_file, 'rb') as file:
+            content = bytearray(file.read())
+
+        content[-12] ^= 0xFF
+        with open(self.model_file, 'wb') as file:
+            file.write(content)
+        with self.assertRaises(ValueError):
+            load_model(self.model_file)
+
+        with open(self.model_file, 'wb') as file:
+            file.write(content[:20])
+        with self.assertRaises(ValueError):
+            load_model(self.model_file)
+
+    def test_newer_version_is_rejected(self):
+        """Test that files of a newer format version are not read"""
+        with open(self.model_file, 'rb') as file:
+            content = bytearray(file.read())
+        content[8:10] = (FORMAT_VERSION + 1).to_bytes(2, 'little')
+        with open(self.model_file, 'wb') as file:
+            file.write(content)
+        with self.assertRaises(ValueError):
+            load_model(self.model_file)
+
+    def test_legacy_joblib_file(self):
+        """Test that files saved with joblib are still loaded"""
+        legacy_file = os.path.join(self.directory.name, 'model.joblib')
+        joblib.dump({'formula': 'y = 2.00 * x + 1.00', 'x': 'x', 'y': 'y',
+                     'r2': 0.9, 'mse': 0.1, 'description': 'old',
+                     'slope': 2.0, 'intercept': 1.0}, legacy_file)
+
+        loaded = load_model(legacy_file)
+        self.assertEqual(loaded.x_names, ['x'])
+        self.assertEqual(loaded.slope, 2.0)
+        self.assertAlmostEqual(loaded.predict([3.0]), 7.0)
+
+    def test_pickle_without_legacy_extension_is_rejected(self):
+        """Test that files without the magic are only unpickled as .joblib"""
+        joblib.dump({'formula': 'y = 2.00 * x + 1.00', 'x': 'x', 'y': 'y',
+                     'r2': 0.9, 'mse': 0.1, 'description': 'old',
+                     'slope': 2.0, 'intercept': 1.0}, self.model_file)
+
+        with mock.patch('joblib.load') as joblib_load:
+            with self.assertRaises(ValueError):
+                load_model(self.model_file)
+        joblib_load.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
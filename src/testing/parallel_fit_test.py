@@ -0,0 +1,54 @@
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from unittest import mock
+import numpy as np
+import pandas as pd
+from data_management import Model
+from data_management import parallelFit
+from data_management.regressionEngine import fit_simple
+
+
+class TestParallelFit(unittest.TestCase):
+    def setUp(self):
+        """Create noisy linear data, lowering the threshold for small inputs"""
+        rng = np.random.default_rng(3)
+        self.x = rng.normal(50.0, 10.0, 20_000)
+        self.y = 2.0 * self.x + 1.0 + rng.normal(0.0, 1.0, 20_000)
+        patcher = mock.patch.object(parallelFit, 'MIN_PARALLEL_ROWS', 0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_matches_single_core_fit(self):
+        """Test that sharded statistics merge into the single-core fit"""
+        expected = fit_simple(self.x, self.y)
+        result = parallelFit.fit_parallel(self.x, self.y, workers=3)
+
+        self.assertEqual(result.n, expected.n)
+        for name in ('slope', 'intercept', 'r2', 'mse'):
+            self.assertAlmostEqual(getattr(result, name),
+                                   getattr(expected, name), places=9)
+
+    def test_reuses_executor(self):
+        """Test that a given process pool is used and left running"""
+        with ProcessPoolExecutor(max_workers=2) as pool:
+            first = parallelFit.fit_parallel(self.x, self.y, 2, pool)
+            second = parallelFit.fit_parallel(self.x, self.y, 4, pool)
+        self.assertAlmostEqual(first.slope, second.slope, places=9)
+
+    def test_invalid_values(self):
+        """Test that NaN values in a shard are reported"""
+        self.x[-1] = np.nan
+        with self.assertRaises(ValueError):
+            parallelFit.fit_parallel(self.x, self.y, workers=2)
+
+    def test_model_workers(self):
+        """Test that the model can be fitted on several processes"""
+        data = pd.DataFrame({'x': self.x, 'y': self.y})
+        model = Model()
+        model.create_from_data(data, 'x', 'y', workers=2)
+        self.assertAlmostEqual(model.slope, fit_simple(self.x, self.y).slope,
+                               places=9)
+
+
+if __name__ == '__main__':
+    unittest.main()
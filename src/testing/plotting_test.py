@@ -0,0 +1,184 @@
+import unittest
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+import numpy as np
+import pandas as pd
+from data_management import Model
+from data_management.plotting import (
+    DecimatedScatter,
+    DensityImage,
+    RegressionPlot,
+    rasterize,
+    sample_points,
+)
+
+
+class TestSamplePoints(unittest.TestCase):
+    def setUp(self):
+        """Create a dense cloud with a few far outliers"""
+        rng = np.random.default_rng(5)
+        self.x = np.concatenate([rng.normal(0.0, 1.0, 200_000),
+                                 [50.0, 60.0, 70.0]])
+        self.y = np.concatenate([rng.normal(0.0, 1.0, 200_000),
+                                 [50.0, 60.0, 70.0]])
+
+    def test_small_inputs_are_kept(self):
+        """Test that datasets under the limit are not sampled"""
+        x, y = sample_points(self.x[:100], self.y[:100], max_points=1000)
+        self.assertEqual(len(x), 100)
+
+    def test_random_sampling_is_bounded(self):
+        """Test that random sampling keeps at most max_points points"""
+        x, y = sample_points(self.x, self.y, max_points=5000)
+        self.assertLessEqual(len(x), 5000)
+        self.assertEqual(len(x), len(y))
+
+    def test_stratified_sampling_keeps_outliers(self):
+        """Test that points in sparse cells are all kept"""
+        x, _ = sample_points(self.x, self.y, max_points=5000,
+                             method='stratified')
+        self.assertLess(len(x), 6000)
+        self.assertTrue({50.0, 60.0, 70.0}.issubset(x))
+
+
+class TestDecimatedScatter(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(8)
+        self.x = rng.uniform(0.0, 100.0, 100_000)
+        self.y = 2.0 * self.x + rng.normal(0.0, 1.0, 100_000)
+        self.fig, self.ax = plt.subplots()
+
+    def tearDown(self):
+        plt.close(self.fig)
+
+    def test_zoom_resamples_visible_points(self):
+        """Test that zooming draws the full data of the visible range"""
+        scatter = DecimatedScatter(self.ax, self.x, self.y, max_points=2000)
+        self.assertLessEqual(scatter.shown, 2000)
+
+        self.ax.set_xlim(10.0, 11.0)
+        self.ax.set_ylim(0.0, 300.0)
+        visible = ((self.x >= 10.0) & (self.x <= 11.0)).sum()
+        self.assertEqual(scatter.shown, visible)
+
+    def test_density_above_threshold(self):
+        """Test that a density plot replaces the points of large datasets"""
+        scatter = DecimatedScatter(self.ax, self.x, self.y,
+                                   density_threshold=10_000)
+        self.assertEqual(scatter.shown, 0)
+        self.assertEqual(len(self.ax.collections), 1)
+
+
+class TestRasterize(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(13)
+        self.x = rng.normal(0.0, 1.0, 50_000)
+        self.y = rng.normal(0.0, 2.0, 50_000)
+
+    def test_matches_histogram(self):
+        """Test that the counts match np.histogram2d on the same grid"""
+        counts = rasterize(self.x, self.y, (-1.0, 1.0, -3.0, 2.0), (40, 30))
+        expected, _, _ = np.histogram2d(self.y, self.x, bins=(40, 30),
+                                        range=((-3.0, 2.0), (-1.0, 1.0)))
+        np.testing.assert_array_equal(counts, expected)
+
+    def test_image_follows_zoom(self):
+        """Test that the image only counts the points of the visible range"""
+        fig, ax = plt.subplots()
+        image = DensityImage(ax, self.x, self.y)
+        fig.canvas.draw()
+        self.assertEqual(image.get_array().sum(), len(self.x))
+
+        ax.set_xlim(0.0, 1.0)
+        ax.set_ylim(-10.0, 10.0)
+        fig.canvas.draw()
+        visible = ((self.x >= 0.0) & (self.x < 1.0)).sum()
+        self.assertEqual(image.get_array().sum(), visible)
+        plt.close(fig)
+
+
+class TestModelPlot(unittest.TestCase):
+    def test_line_has_two_points(self):
+        """Test that the regression line is drawn from its endpoints"""
+        x = np.arange(50_000, dtype=np.float64)
+        data = pd.DataFrame({'x': x, 'y': 3.0 * x + 1.0})
+        model = Model()
+        model.create_from_data(data, 'x', 'y')
+
+        fig = model.get_plot(max_points=1000)
+        line = fig.axes[0].lines[0]
+        np.testing.assert_allclose(line.get_xdata(), [0.0, 49_999.0])
+        np.testing.assert_allclose(line.get_ydata(), [1.0, 149_998.0])
+        self.assertLessEqual(len(fig.axes[0].collections[0].get_offsets()),
+                             1000)
+
+    def test_raster_backend(self):
+        """Test that the raster backend draws an image and the line"""
+        x = np.arange(1000, dtype=np.float64)
+        data = pd.DataFrame({'x': x, 'y': x})
+        model = Model()
+        model.create_from_data(data, 'x', 'y')
+
+        fig = model.get_plot(backend='raster')
+        self.assertIsInstance(fig.axes[0].images[0], DensityImage)
+        self.assertEqual(len(fig.axes[0].lines), 1)
+
+        with self.assertRaises(ValueError):
+            model.get_plot(backend='opengl')
+
+
+class TestRegressionPlot(unittest.TestCase):
+    def setUp(self):
+        """Fit two models on the same data"""
+        x = np.linspace(0.0, 10.0, 5000)
+        data = pd.DataFrame({'x': x, 'y': 2.0 * x, 'z': -x})
+        self.first = Model()
+        self.first.create_from_data(data, 'x', 'y')
+        self.second = Model()
+        self.second.create_from_data(data, 'x', 'z')
+
+    def test_artists_are_updated_in_place(self):
+        """Test that a new model reuses the figure, axes and artists"""
+        plot = RegressionPlot()
+        FigureCanvasAgg(plot.figure)
+        plot.update(self.first)
+        plot.figure.canvas.draw()
+        artists = (plot.ax, plot.ax.collections[0], plot.ax.lines[0])
+
+        plot.update(self.second)
+        plot.figure.canvas.draw()
+        self.assertEqual(artists,
+                         (plot.ax, plot.ax.collections[0], plot.ax.lines[0]))
+        np.testing.assert_allclose(plot.ax.lines[0].get_ydata(), [0.0, -10.0])
+        self.assertEqual(plot.ax.get_ylabel(), 'z')
+
+    def test_unchanged_view_is_blitted(self):
+        """Test that an update keeping the view reuses the background"""
+        plot = RegressionPlot()
+        FigureCanvasAgg(plot.figure)
+        plot.update(self.first)
+        plot.figure.canvas.draw()
+        background = plot._background
+
+        plot.update(self.first)
+        self.assertIs(plot._background, background)
+
+    def test_backend_switch_keeps_data(self):
+        """Test that switching backends replaces the artist of the points"""
+        plot = RegressionPlot()
+        plot.update(self.first)
+        plot.set_backend('raster')
+        self.assertEqual(len(plot.ax.collections), 0)
+        self.assertEqual(len(plot.ax.images[0].points[0]), 5000)
+
+    def test_no_pyplot_figures(self):
+        """Test that plots are not registered with pyplot"""
+        figures = len(plt.get_fignums())
+        self.first.get_plot()
+        self.assertEqual(len(plt.get_fignums()), figures)
+
+
+if __name__ == '__main__':
+    unittest.main()
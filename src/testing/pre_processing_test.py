@@ -2,6 +2,7 @@ import unittest
 import pandas as pd
 import numpy as np
 from data_management.dataManager import DataManager
+from data_management.dtypeOptimizer import optimize_dtypes
 
 
 class TestDataManager(unittest.TestCase):
@@ -118,6 +119,20 @@ class TestDataManager(unittest.TestCase):
         self.assertTrue(
             all(self.data_manager.data.loc[nan_mask_col2, 'col2'] == constant_value))
 
+    def test_replace_constant_optimized_text(self):
+        """Test reemplazo con constante en una columna de texto optimizada"""
+        data, _ = optimize_dtypes(pd.DataFrame({
+            'texto': ['a', 'b', None, 'a', 'b', 'a']}))
+        self.assertIsInstance(data['texto'].dtype, pd.CategoricalDtype)
+        self.data_manager.data = data
+
+        self.data_manager.replace(['texto'], 0)
+        self.assertEqual(self.data_manager.detect('texto'), 0)
+        self.assertEqual(self.data_manager.data['texto'].iloc[2], 0)
+
+        self.data_manager.undo()
+        self.assertEqual(self.data_manager.detect('texto'), 1)
+
     def test_replace_invalid_value(self):
         """Test reemplazo con valor inválido"""
         self.data_manager.data = self.test_data
@@ -138,6 +153,144 @@ class TestDataManager(unittest.TestCase):
         pd.testing.assert_series_equal(
             self.data_manager.data['col3'], original_values)
 
+    def test_last_change(self):
+        """Test del registro del último cambio"""
+        self.assertIsNone(self.data_manager.last_change)
+
+        self.data_manager.replace(['col1', 'col3'])
+        self.assertEqual(self.data_manager.last_change.kind, 'fill')
+        self.assertEqual(self.data_manager.last_change.columns, ('col1',))
+
+        self.data_manager.data = self.test_data
+        self.data_manager.delete(['col1', 'col2'])
+        self.assertEqual(self.data_manager.last_change.kind, 'delete')
+        np.testing.assert_array_equal(
+            self.data_manager.last_change.rows, [1, 2])
+
+    def test_undo_redo(self):
+        """Test de deshacer y rehacer operaciones"""
+        self.data_manager.replace(['col1'], 0)
+        self.data_manager.delete(['col2'])
+        self.assertEqual(self.data_manager.version, 2)
+
+        self.assertTrue(self.data_manager.undo())
+        self.assertEqual(self.data_manager.last_change.kind, 'insert')
+        np.testing.assert_array_equal(self.data_manager.last_change.rows, [1])
+        self.assertEqual(self.data_manager.detect('col2'), 1)
+        self.assertEqual(self.data_manager.data['col1'].tolist(),
+                         [1, 2, 0, 4, 5])
+
+        self.assertTrue(self.data_manager.undo())
+        pd.testing.assert_frame_equal(self.data_manager.data, self.test_data)
+        self.assertFalse(self.data_manager.undo())
+
+        self.assertTrue(self.data_manager.redo())
+        self.assertTrue(self.data_manager.redo())
+        self.assertFalse(self.data_manager.redo())
+        self.assertEqual(len(self.data_manager.data), 4)
+        self.assertEqual(self.data_manager.detect('col1'), 0)
+
+    def test_branches(self):
+        """Test de ramas del historial"""
+        self.data_manager.replace(['col1'], 'mean')
+        self.data_manager.undo()
+        self.data_manager.delete(['col1'])
+        self.assertEqual(self.data_manager.versions(),
+                         {0: None, 1: 0, 2: 0})
+        self.assertFalse(self.data_manager.can_redo)
+
+        self.data_manager.checkout(1)
+        self.assertEqual(len(self.data_manager.data), 5)
+        self.assertEqual(self.data_manager.detect('col1'), 0)
+        self.data_manager.checkout(2)
+        self.assertEqual(len(self.data_manager.data), 4)
+
+        with self.assertRaises(ValueError):
+            self.data_manager.checkout(3)
+
+        # Nuevos datos inician un nuevo historial
+        self.data_manager.data = self.test_data
+        self.assertEqual(self.data_manager.versions(), {0: None})
+
+    def test_profile_cache(self):
+        """Test de la caché de perfiles de columnas"""
+        profile = self.data_manager.profile()
+        self.assertEqual(list(profile.index), ['col1', 'col2', 'col3'])
+        self.assertEqual(profile.loc['col1', 'mean'], 3.0)
+        self.assertEqual(profile.loc['col2', 'nan_count'], 1)
+
+        # Solo se descartan los perfiles de las columnas modificadas
+        cached = self.data_manager._current.profiles
+        self.data_manager.replace(['col1'], 0)
+        self.assertEqual(set(self.data_manager._current.profiles),
+                         set(cached) - {'col1'})
+        self.assertEqual(self.data_manager.detect('col1'), 0)
+        profile = self.data_manager.profile(['col1'])
+        self.assertEqual(profile.loc['col1', 'mean'], 2.4)
+
+        self.data_manager.undo()
+        self.assertEqual(self.data_manager.detect('col1'), 1)
+
+    def test_detect_counts_one_column(self):
+        """Test que detectar NaN en una columna no perfila las demás"""
+        self.assertEqual(self.data_manager.detect('col1'), 1)
+        self.assertEqual(self.data_manager._current.profiles, {})
+        self.assertEqual(self.data_manager._current.nan_counts, {'col1': 1})
+
+        self.data_manager.replace(['col1'], 0)
+        self.assertEqual(self.data_manager.detect('col1'), 0)
+        self.data_manager.undo()
+        self.assertEqual(self.data_manager.detect('col1'), 1)
+
+    def test_replace_only_selected_columns(self):
+        """Test de reemplazo sin recorrer las demás columnas"""
+        data = pd.DataFrame(np.arange(40.0).reshape(10, 4),
+                            columns=['a', 'b', 'c', 'd'])
+        data.loc[[1, 5], 'a'] = np.nan
+        data.loc[2, 'c'] = np.nan
+        self.data_manager.data = data
+
+        self.data_manager.replace(['a', 'b', 'c'], 'median')
+        self.assertEqual(self.data_manager.last_change.columns, ('a', 'c'))
+        self.assertEqual(self.data_manager.data.loc[1, 'a'],
+                         data['a'].median())
+        self.assertEqual(self.data_manager.data.loc[2, 'c'],
+                         data['c'].median())
+        pd.testing.assert_frame_equal(self.data_manager.data[['b', 'd']],
+                                      data[['b', 'd']])
+        # No se calcularon perfiles de columnas
+        self.assertEqual(self.data_manager._current.profiles, {})
+
+    def test_impute(self):
+        """Test de imputación con los métodos vectorizados"""
+        self.data_manager.impute(['col1', 'col2'], 'linear')
+        self.assertEqual(self.data_manager.data['col1'].tolist(),
+                         [1, 2, 3, 4, 5])
+        self.assertEqual(self.data_manager.data['col2'].tolist(),
+                         [10, 20, 30, 40, 50])
+        self.assertEqual(self.data_manager.last_change.columns,
+                         ('col1', 'col2'))
+
+        self.data_manager.undo()
+        self.data_manager.impute(['col1'], 'group_mean', by='col3')
+        self.assertEqual(self.data_manager.detect('col1'), 1)
+        self.assertEqual(self.data_manager.version, 0)
+
+        with self.assertRaises(ValueError):
+            self.data_manager.impute(['col1'], 'regression')
+        with self.assertRaises(ValueError):
+            self.data_manager.impute(['col1'], 'knn')
+
+    def test_compute_imputation_leaves_data(self):
+        """Test que calcular la imputación no cambia los datos"""
+        fills = self.data_manager.compute_imputation(['col1'], 'linear')
+        self.assertEqual(self.data_manager.detect('col1'), 1)
+        self.assertEqual(self.data_manager.version, 0)
+
+        self.data_manager.apply_imputation(fills)
+        self.assertEqual(self.data_manager.detect('col1'), 0)
+        self.assertEqual(self.data_manager.version, 1)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+from unittest import mock
+import numpy as np
+import pandas as pd
+from data_management import profiling
+from data_management.profiling import profile_columns
+
+
+class TestProfileColumns(unittest.TestCase):
+    def test_matches_pandas(self):
+        """Test that profiles match the statistics computed by pandas"""
+        data = pd.DataFrame({
+            'a': [1.0, np.nan, 3.0, 10.0],
+            'b': np.array([4, 3, 2, 1], dtype=np.int16),
+            'c': pd.array([1, None, 2, None], dtype='Int64'),
+            'd': ['x', None, 'y', 'z'],
+        })
+        profiles = profile_columns(data, list(data.columns))
+
+        for column in ['a', 'b', 'c']:
+            values = data[column].astype('float64')
+            profile = profiles[column]
+            self.assertEqual(profile.nan_count, values.isna().sum())
+            self.assertEqual(profile.min, values.min())
+            self.assertEqual(profile.max, values.max())
+            self.assertAlmostEqual(profile.mean, values.mean())
+            self.assertEqual(profile.median, values.median())
+            self.assertEqual(profile.dtype, str(data[column].dtype))
+
+        self.assertEqual(profiles['d'].nan_count, 1)
+        self.assertTrue(np.isnan(profiles['d'].mean))
+
+    def test_empty_and_missing_columns(self):
+        """Test that columns without values have NaN statistics"""
+        data = pd.DataFrame({'a': [np.nan, np.nan]})
+        profile = profile_columns(data, ['a'])['a']
+        self.assertEqual(profile.nan_count, 2)
+        self.assertTrue(np.isnan(profile.min))
+        profile = profile_columns(data.iloc[:0], ['a'])['a']
+        self.assertTrue(np.isnan(profile.max))
+
+    def test_batches(self):
+        """Test that profiling in batches gives the same profiles"""
+        data = pd.DataFrame(np.arange(35.0).reshape(7, 5),
+                            columns=list('abcde'))
+        data.iloc[2, 1] = np.nan
+        expected = profile_columns(data, list(data.columns))
+        with mock.patch.object(profiling, 'PROFILE_BATCH', 2):
+            self.assertEqual(profile_columns(data, list(data.columns)),
+                             expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
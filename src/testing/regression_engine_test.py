@@ -0,0 +1,202 @@
+import unittest
+import os
+import sqlite3
+import tempfile
+import numpy as np
+import pandas as pd
+from data_management import FileReader, Model, SQLiteReader
+from data_management.regressionEngine import (
+    GramAccumulator,
+    RegressionAccumulator,
+    fit_all_pairs,
+    fit_all_pairs_chunks,
+    fit_multiple,
+    fit_simple,
+    fit_sklearn,
+    polynomial_features,
+    polynomial_names,
+)
+
+
+class TestRegressionEngine(unittest.TestCase):
+    def setUp(self):
+        """Create noisy linear data far from the origin"""
+        rng = np.random.default_rng(42)
+        self.x = rng.normal(1e6, 10.0, 5000)
+        self.y = 0.5 * self.x - 3.0 + rng.normal(0.0, 2.0, 5000)
+
+    def assertFitsEqual(self, first, second):
+        for name in ('slope', 'intercept', 'r2', 'mse'):
+            self.assertAlmostEqual(getattr(first, name), getattr(second, name),
+                                   delta=1e-6 * max(1.0, abs(getattr(second, name))),
+                                   msg=name)
+        self.assertEqual(first.n, second.n)
+
+    def test_parity_with_sklearn(self):
+        """Test that the NumPy engine matches scikit-learn"""
+        self.assertFitsEqual(fit_simple(self.x, self.y),
+                             fit_sklearn(self.x, self.y))
+
+    def test_block_size_does_not_change_fit(self):
+        """Test that merging blocks gives the same result as one block"""
+        self.assertFitsEqual(fit_simple(self.x, self.y, block_size=7),
+                             fit_simple(self.x, self.y, block_size=10 ** 6))
+
+    def test_constant_input(self):
+        """Test degenerate inputs like scikit-learn does"""
+        flat_x = fit_simple(np.ones(4), [1.0, 2.0, 3.0, 4.0])
+        self.assertEqual(flat_x.slope, 0.0)
+        self.assertEqual(flat_x.intercept, 2.5)
+        flat_y = fit_simple([1.0, 2.0, 3.0], np.full(3, 5.0))
+        self.assertEqual(flat_y.r2, 1.0)
+
+    def test_invalid_input(self):
+        """Test that empty, misaligned or NaN input raises ValueError"""
+        with self.assertRaises(ValueError):
+            fit_simple([], [])
+        with self.assertRaises(ValueError):
+            fit_simple([1.0, 2.0], [1.0])
+        with self.assertRaises(ValueError):
+            fit_simple([1.0, np.nan], [1.0, 2.0])
+
+
+class TestMultipleRegression(unittest.TestCase):
+    def setUp(self):
+        """Create noisy data depending on three inputs far from the origin"""
+        rng = np.random.default_rng(7)
+        self.x = rng.normal([1e5, -50.0, 3.0], [10.0, 5.0, 1.0], (4000, 3))
+        self.y = (self.x @ [1.5, -2.0, 0.3] + 25.0
+                  + rng.normal(0.0, 0.5, 4000))
+
+    def test_matches_least_squares(self):
+        """Test that the normal equations match a least squares solve"""
+        design = np.column_stack([self.x, np.ones(len(self.x))])
+        expected = np.linalg.lstsq(design, self.y, rcond=None)[0]
+        fit = fit_multiple(self.x, self.y, block_size=333)
+        np.testing.assert_allclose(fit.coefficients, expected[:3],
+                                   rtol=1e-6)
+        self.assertAlmostEqual(fit.intercept, expected[3],
+                               delta=1e-6 * abs(expected[3]))
+        residuals = self.y - design @ expected
+        self.assertAlmostEqual(fit.mse, np.mean(residuals ** 2), places=6)
+        self.assertEqual(fit.n, 4000)
+
+    def test_single_feature_matches_simple_fit(self):
+        """Test that one feature gives the simple regression"""
+        simple = fit_simple(self.x[:, 0], self.y)
+        fit = fit_multiple(self.x[:, :1], self.y)
+        self.assertAlmostEqual(fit.coefficients[0], simple.slope, places=6)
+        self.assertAlmostEqual(fit.r2, simple.r2, places=9)
+
+    def test_accumulator_rejects_invalid_blocks(self):
+        """Test that wrong widths or NaN values raise ValueError"""
+        accumulator = GramAccumulator(2)
+        with self.assertRaises(ValueError):
+            accumulator.update(np.ones((3, 3)), np.ones(3))
+        with self.assertRaises(ValueError):
+            accumulator.update(np.array([[1.0, np.nan]]), [1.0])
+        with self.assertRaises(ValueError):
+            accumulator.result()
+
+    def test_polynomial_features(self):
+        """Test the order of the powers and their names"""
+        features = polynomial_features(np.array([[2.0, 3.0]]), 3)
+        np.testing.assert_array_equal(features,
+                                      [[2.0, 3.0, 4.0, 9.0, 8.0, 27.0]])
+        self.assertEqual(polynomial_names(['a', 'b'], 2),
+                         ['a', 'b', 'a^2', 'b^2'])
+
+
+class TestRegressionAccumulator(unittest.TestCase):
+    def setUp(self):
+        """Create noisy linear data and write it to CSV and SQLite files"""
+        rng = np.random.default_rng(7)
+        self.data = pd.DataFrame({'x': rng.normal(50.0, 5.0, 2000)})
+        self.data['y'] = 1.5 * self.data['x'] + rng.normal(0.0, 1.0, 2000)
+        self.expected = fit_simple(self.data['x'], self.data['y'])
+
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.csv_path = os.path.join(self.tmp_dir.name, "data.csv")
+        self.data.to_csv(self.csv_path, index=False)
+        self.db_path = os.path.join(self.tmp_dir.name, "data.db")
+        conn = sqlite3.connect(self.db_path)
+        self.data.to_sql('data', conn, index=False)
+        conn.close()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_merge_partial_results(self):
+        """Test that merged partial accumulators equal a single pass"""
+        halves = [RegressionAccumulator().update(part['x'], part['y'])
+                  for part in (self.data.iloc[:700], self.data.iloc[700:])]
+        merged = halves[0].merge(halves[1])
+        for name in ('slope', 'intercept', 'r2', 'mse'):
+            self.assertAlmostEqual(getattr(merged.result(), name),
+                                   getattr(self.expected, name), places=9)
+        self.assertAlmostEqual(merged.sum_xy,
+                               (self.data['x'] * self.data['y']).sum(),
+                               delta=1e-6)
+
+    def test_model_from_csv_chunks(self):
+        """Test fitting a Model from a chunked CSV stream"""
+        model = Model()
+        chunks = FileReader().iter_chunks(self.csv_path, chunk_size=300,
+                                          columns=['x', 'y'])
+        model.create_from_chunks(chunks, 'x', 'y')
+        self.assertAlmostEqual(model.slope, self.expected.slope, places=9)
+        self.assertAlmostEqual(model.r2, self.expected.r2, places=9)
+        self.assertTrue(model.formula.startswith('y = 1.5'))
+        self.assertIsNone(model.independent_value)
+
+    def test_model_from_sqlite_statistics(self):
+        """Test fitting a Model from statistics computed inside SQLite"""
+        with SQLiteReader(self.db_path) as database:
+            stats = database.sufficient_statistics('x', 'y')
+        model = Model()
+        model.create_from_accumulator(
+            RegressionAccumulator.from_statistics(stats), 'x', 'y')
+        self.assertAlmostEqual(model.intercept, self.expected.intercept,
+                               places=6)
+        self.assertAlmostEqual(model.mse, self.expected.mse, places=6)
+
+
+class TestFitAllPairs(unittest.TestCase):
+    def setUp(self):
+        """Create numeric columns with missing values and a text column"""
+        rng = np.random.default_rng(11)
+        self.data = pd.DataFrame(rng.normal(1e4, 5.0, (3000, 4)),
+                                 columns=['a', 'b', 'c', 'd'])
+        self.data['b'] = 3.0 * self.data['a'] + rng.normal(0.0, 1.0, 3000)
+        self.data.loc[::5, 'c'] = np.nan
+        self.data['label'] = 'x'
+
+    def test_matches_single_fits(self):
+        """Test that every pair matches a fit on its complete rows"""
+        pairs = fit_all_pairs(self.data)
+        self.assertEqual(len(pairs), 12)
+        self.assertEqual(list(pairs.iloc[0][['x', 'y']]), ['a', 'b'])
+
+        for pair in pairs.itertuples():
+            rows = self.data[[pair.x, pair.y]].dropna()
+            expected = fit_simple(rows[pair.x], rows[pair.y])
+            self.assertEqual(pair.n, expected.n)
+            for name in ('slope', 'intercept', 'r2', 'mse'):
+                self.assertAlmostEqual(
+                    getattr(pair, name), getattr(expected, name),
+                    delta=1e-6 * max(1.0, abs(getattr(expected, name))),
+                    msg=f'{pair.x}, {pair.y}: {name}')
+
+    def test_chunks_match_frame(self):
+        """Test that streaming the rows gives the same fits"""
+        chunks = (self.data.iloc[i:i + 700] for i in range(0, 3000, 700))
+        pd.testing.assert_frame_equal(fit_all_pairs_chunks(chunks),
+                                      fit_all_pairs(self.data))
+
+    def test_without_pairs(self):
+        """Test that a single numeric column gives no pairs"""
+        self.assertTrue(fit_all_pairs(self.data[['a', 'label']]).empty)
+
+
+if __name__ == '__main__':
+    unittest.main()
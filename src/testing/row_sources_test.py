@@ -0,0 +1,89 @@
+import unittest
+import os
+import sqlite3
+import tempfile
+import numpy as np
+import pandas as pd
+from data_management.rowSources import (
+    CSVSource,
+    FrameSource,
+    RowSource,
+    SQLiteSource,
+    open_source,
+    read_preview,
+)
+
+
+class TestRowSources(unittest.TestCase):
+    def setUp(self):
+        """Write the same data to a CSV file and a SQLite table"""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.data = pd.DataFrame({
+            'x': np.arange(25, dtype=np.float64),
+            'y': np.arange(25, dtype=np.float64) * 2,
+        })
+        self.csv_path = os.path.join(self.tmp_dir.name, 'data.csv')
+        self.data.to_csv(self.csv_path, index=False)
+
+        self.db_path = os.path.join(self.tmp_dir.name, 'data.db')
+        conn = sqlite3.connect(self.db_path)
+        self.data.to_sql('points', conn, index=False)
+        conn.close()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def read_pages(self, source, count):
+        pages = []
+        while not source.exhausted:
+            pages.append(source.fetch(count))
+        return pages
+
+    def test_pages(self):
+        """Test that every source hands out the rows in pages"""
+        sources = [
+            FrameSource(self.data),
+            CSVSource(self.csv_path, chunk_size=7),
+            SQLiteSource(self.db_path, chunk_size=7),
+        ]
+        for source in sources:
+            self.assertEqual(source.columns, ['x', 'y'])
+            pages = self.read_pages(source, 10)
+            self.assertEqual([len(page) for page in pages], [10, 10, 5])
+            pd.testing.assert_frame_equal(
+                pd.concat(pages, ignore_index=True), self.data)
+
+    def test_columns(self):
+        """Test that sources only read the requested columns"""
+        source = CSVSource(self.csv_path, columns=['y'])
+        self.assertEqual(list(source.fetch(5).columns), ['y'])
+        source.close()
+
+    def test_open_source(self):
+        """Test that the source matches the file format"""
+        csv_source = open_source(self.csv_path)
+        db_source = open_source(self.db_path, table='points')
+        self.assertIsInstance(csv_source, CSVSource)
+        self.assertIsInstance(db_source, SQLiteSource)
+        self.assertIsNone(open_source('data.xlsx'))
+        csv_source.close()
+        db_source.close()
+
+    def test_read_preview(self):
+        """Test that a preview holds the first rows of the file"""
+        for path, table in ((self.csv_path, None), (self.db_path, 'points')):
+            preview = read_preview(path, table, rows=10)
+            self.assertIsInstance(preview, FrameSource)
+            pages = self.read_pages(preview, 4)
+            pd.testing.assert_frame_equal(
+                pd.concat(pages, ignore_index=True), self.data.iloc[:10])
+        self.assertIsNone(read_preview('data.xlsx'))
+
+    def test_abstract_base(self):
+        """Test that sources must implement _read_chunk"""
+        with self.assertRaises(TypeError):
+            RowSource(['x'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from data_management import LoadCancelled, Model
+from data_management.scoring import score_file
+
+
+class TestPredictBatch(unittest.TestCase):
+    def setUp(self):
+        """Fit a quadratic model on two inputs"""
+        rng = np.random.default_rng(3)
+        self.data = pd.DataFrame(rng.normal(size=(200, 2)),
+                                 columns=['a', 'b'])
+        self.data['y'] = (2 * self.data['a'] - self.data['b'] ** 2
+                          + rng.normal(0.0, 0.1, 200))
+        self.model = Model()
+        self.model.create_from_data(self.data, ['a', 'b'], 'y', degree=2)
+
+    def test_matches_predict(self):
+        """Test that arrays, frames and chunks give the same predictions"""
+        x = self.data[['a', 'b']].to_numpy()
+        expected = self.model.predict(x)
+        np.testing.assert_allclose(self.model.predict_batch(x), expected)
+        np.testing.assert_allclose(self.model.predict_batch(self.data),
+                                   expected)
+        chunks = [self.data.iloc[:50], self.data.iloc[50:]]
+        np.testing.assert_allclose(
+            np.concatenate(list(self.model.predict_batch(chunks))),
+            expected)
+
+    def test_vector_for_single_input(self):
+        """Test that a vector holds one input value per row"""
+        model = Model()
+        model.create_from_data(self.data, 'a', 'y')
+        np.testing.assert_allclose(
+            model.predict_batch(np.array([0.0, 1.0, np.nan])),
+            [model.intercept, model.slope + model.intercept, np.nan])
+
+    def test_invalid_input(self):
+        """Test that a wrong width or an unfitted model raise ValueError"""
+        with self.assertRaises(ValueError):
+            self.model.predict_batch(np.ones((3, 3)))
+        with self.assertRaises(ValueError):
+            Model().predict_batch(np.ones(3))
+
+
+class TestScoreFile(unittest.TestCase):
+    def setUp(self):
+        """Write the inputs of a simple model to a CSV and a SQLite file"""
+        self.directory = tempfile.TemporaryDirectory()
+        self.data = pd.DataFrame({'x': np.arange(25.0), 'label': 'row'})
+        self.model = Model()
+        self.model.create_from_data(
+            pd.DataFrame({'x': [0.0, 1.0], 'y': [1.0, 3.0]}), 'x', 'y')
+
+        self.csv = os.path.join(self.directory.name, 'inputs.csv')
+        self.data.to_csv(self.csv, index=False)
+        self.database = os.path.join(self.directory.name, 'inputs.db')
+        with sqlite3.connect(self.database) as connection:
+            self.data.to_sql('inputs', connection, index=False)
+        connection.close()
+        self.output = os.path.join(self.directory.name, 'scored.csv')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_score_csv_in_chunks(self):
+        """Test that every chunk is scored under a single header"""
+        rows = score_file(self.model, self.csv, self.output, chunk_size=10)
+        scored = pd.read_csv(self.output)
+        self.assertEqual(rows, 25)
+        self.assertEqual(list(scored.columns),
+                         ['x', 'label', 'Predicted y'])
+        np.testing.assert_allclose(scored['Predicted y'],
+                                   2 * self.data['x'] + 1)
+
+    def test_score_sqlite_inputs_only(self):
+        """Test that only the inputs are written when asked"""
+        score_file(self.model, self.database, self.output,
+                   keep_columns=False, chunk_size=7)
+        scored = pd.read_csv(self.output)
+        self.assertEqual(list(scored.columns), ['x', 'Predicted y'])
+        self.assertEqual(len(scored), 25)
+
+    def test_cancel_removes_output(self):
+        """Test that cancelling leaves no partial output"""
+        with self.assertRaises(LoadCancelled):
+            score_file(self.model, self.csv, self.output, chunk_size=10,
+                       cancel=lambda: True)
+        self.assertFalse(os.path.exists(self.output))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+import os
+import sqlite3
+import tempfile
+import numpy as np
+import pandas as pd
+from data_management import SQLiteReader, FileReader
+
+
+class TestSQLiteReader(unittest.TestCase):
+    def setUp(self):
+        """Create a temporary database with two tables"""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp_dir.name, "data.db")
+        rng = np.random.default_rng(0)
+        self.points = pd.DataFrame({
+            'x': rng.normal(1e6, 1.0, 1000),
+            'noise': rng.normal(0.0, 1.0, 1000),
+        })
+        self.points['y'] = 3.0 * self.points['x'] + self.points['noise']
+        self.labels = pd.DataFrame({'id': [1, 2], 'name': ['a', 'b']})
+
+        conn = sqlite3.connect(self.db_path)
+        self.labels.to_sql('labels', conn, index=False)
+        self.points.to_sql('points', conn, index=False)
+        conn.close()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_tables(self):
+        """Test listing tables with their row counts"""
+        with SQLiteReader(self.db_path) as database:
+            self.assertEqual(database.tables(), {'labels': 2, 'points': 1000})
+
+    def test_projection_and_filter(self):
+        """Test pushing columns and WHERE filters into the query"""
+        with SQLiteReader(self.db_path) as database:
+            df = database.read('points', columns=['x'], where='noise > ?',
+                               params=(0.0,))
+        expected = self.points.loc[self.points['noise'] > 0.0, ['x']]
+        pd.testing.assert_frame_equal(df, expected.reset_index(drop=True))
+
+    def test_chunks(self):
+        """Test streaming a table with fetchmany chunks"""
+        with SQLiteReader(self.db_path) as database:
+            chunks = list(database.iter_chunks('points', chunk_size=300))
+        self.assertEqual([len(c) for c in chunks], [300, 300, 300, 100])
+        pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True),
+                                      self.points)
+
+    def test_sufficient_statistics(self):
+        """Test computing regression statistics with aggregate queries"""
+        with SQLiteReader(self.db_path) as database:
+            stats = database.sufficient_statistics('x', 'y', table='points')
+
+        x, y = self.points['x'], self.points['y']
+        self.assertEqual(stats['n'], 1000)
+        self.assertAlmostEqual(stats['sum_x'] / 1000, x.mean(), places=6)
+        self.assertAlmostEqual(stats['sxx'], ((x - x.mean()) ** 2).sum(),
+                               places=4)
+        slope = np.polyfit(x, y, 1)[0]
+        self.assertAlmostEqual(stats['sxy'] / stats['sxx'], slope, places=6)
+
+    def test_file_reader_table_selection(self):
+        """Test that FileReader reads the requested table"""
+        reader = FileReader()
+        self.assertEqual(reader.read_columns(self.db_path), ['id', 'name'])
+        df = reader.parse_file(self.db_path, table='points', chunk_size=400)
+        pd.testing.assert_frame_equal(df, self.points)
+
+
+if __name__ == '__main__':
+    unittest.main()
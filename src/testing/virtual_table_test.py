@@ -0,0 +1,175 @@
+import unittest
+import numpy as np
+import pandas as pd
+from PySide6.QtCore import Qt
+from data_management.dataManager import Change
+from data_management.rowSources import FrameSource
+from user_interface.VirtualTable import (
+    BLOCK_ROWS,
+    CACHE_BLOCKS,
+    FETCH_ROWS,
+    MAX_REMOVED_RANGES,
+    VirtualTableModel,
+    format_column,
+)
+
+
+class TestFormatColumn(unittest.TestCase):
+    def test_matches_str(self):
+        """Test that vectorized formatting gives the same strings as str()"""
+        columns = [
+            pd.Series([1.5, np.nan, 0.1]),
+            pd.Series(np.array([0.1, 2.0], dtype=np.float32)),
+            pd.Series(np.array([1, -2], dtype=np.int8)),
+            pd.Series([True, False]),
+            pd.Series(['a', None]),
+            pd.Series(['x', 'y'], dtype='category'),
+            pd.Series([1, None], dtype='Int64'),
+            pd.Series(pd.to_datetime(['2020-01-01', None])),
+        ]
+        for column in columns:
+            expected = [str(column.iat[i]) for i in range(len(column))]
+            self.assertEqual(format_column(column), expected)
+
+
+class TestVirtualTableModel(unittest.TestCase):
+    def setUp(self):
+        self.data = pd.DataFrame({
+            'a': np.arange(3 * BLOCK_ROWS, dtype=np.float64),
+            'b': ['x'] * (3 * BLOCK_ROWS),
+        })
+        self.model = VirtualTableModel(self.data)
+
+    def cell(self, row, column):
+        return self.model.data(self.model.index(row, column), Qt.DisplayRole)
+
+    def test_cells(self):
+        """Test that cells of every block are formatted"""
+        self.assertEqual(self.cell(0, 0), '0.0')
+        self.assertEqual(self.cell(BLOCK_ROWS + 1, 0), f'{BLOCK_ROWS + 1}.0')
+        self.assertEqual(self.cell(3 * BLOCK_ROWS - 1, 1), 'x')
+        self.assertIsNone(
+            self.model.data(self.model.index(0, 0), Qt.ToolTipRole))
+
+    def test_new_frame_invalidates_cache(self):
+        """Test that setDataFrame discards the formatted cells"""
+        self.cell(0, 0)
+        self.model.setDataFrame(self.data.assign(a=-self.data['a']))
+        self.assertEqual(self.cell(1, 0), '-1.0')
+
+    def test_cache_is_bounded(self):
+        """Test that only the most recently used blocks are kept"""
+        rows = (CACHE_BLOCKS + 5) * BLOCK_ROWS
+        model = VirtualTableModel(pd.DataFrame({'a': np.arange(rows)}))
+        for row in range(0, rows, BLOCK_ROWS):
+            model.data(model.index(row, 0), Qt.DisplayRole)
+        self.assertEqual(len(model._cache), CACHE_BLOCKS)
+
+    def test_fetch_more(self):
+        """Test that rows of a source are read page by page"""
+        rows = 2 * FETCH_ROWS + 10
+        data = pd.DataFrame({'a': np.arange(rows)})
+        self.model.set_source(FrameSource(data))
+        self.assertEqual(self.model.rowCount(), FETCH_ROWS)
+        self.assertEqual(self.cell(FETCH_ROWS - 1, 0), str(FETCH_ROWS - 1))
+
+        self.assertTrue(self.model.canFetchMore())
+        self.model.fetchMore()
+        self.assertEqual(self.model.rowCount(), 2 * FETCH_ROWS)
+        self.assertEqual(self.cell(FETCH_ROWS, 0), str(FETCH_ROWS))
+
+        self.model.fetch_all()
+        self.assertFalse(self.model.canFetchMore())
+        self.assertEqual(self.model.rowCount(), rows)
+        self.assertEqual(self.cell(rows - 1, 0), str(rows - 1))
+
+    def test_fetched_pages_are_not_joined(self):
+        """Test that scrolling keeps pages apart until the frame is needed"""
+        rows = 3 * FETCH_ROWS + 10
+        data = pd.DataFrame({'a': np.arange(rows), 'b': np.arange(rows) * 2})
+        self.model.set_source(FrameSource(data))
+        self.model.fetch_all()
+        self.assertEqual(len(self.model._data), FETCH_ROWS)
+
+        # Every block is formatted, including those spanning two pages
+        for row in range(rows):
+            self.assertEqual(self.cell(row, 1), str(2 * row))
+
+        self.model.sort(0, Qt.DescendingOrder)
+        self.assertEqual(len(self.model._data), rows)
+        self.assertEqual(self.cell(0, 0), str(rows - 1))
+
+
+class TestApplyChange(unittest.TestCase):
+    def setUp(self):
+        self.data = pd.DataFrame({
+            'a': [1.0, np.nan, 3.0, np.nan, np.nan, 6.0],
+            'b': ['x', 'y', 'z', 'u', 'v', 'w'],
+        })
+        self.model = VirtualTableModel(self.data)
+        self.events = []
+        self.model.modelReset.connect(lambda: self.events.append('reset'))
+        self.model.dataChanged.connect(
+            lambda first, last, roles: self.events.append(
+                ('changed', first.row(), last.row(), first.column())))
+        self.model.rowsRemoved.connect(
+            lambda parent, first, last: self.events.append(
+                ('removed', first, last)))
+        self.model.rowsInserted.connect(
+            lambda parent, first, last: self.events.append(
+                ('inserted', first, last)))
+
+    def cells(self, column):
+        return [
+            self.model.data(self.model.index(row, column), Qt.DisplayRole)
+            for row in range(self.model.rowCount())
+        ]
+
+    def test_fill(self):
+        """Test that a fill only notifies its columns"""
+        self.cells(0)
+        self.cells(1)
+        self.model.apply_change(self.data.fillna({'a': 0.0}),
+                                Change('fill', ('a',)))
+        self.assertEqual(self.events, [('changed', 0, 5, 0)])
+        self.assertEqual(self.cells(0),
+                         ['1.0', '0.0', '3.0', '0.0', '0.0', '6.0'])
+        self.assertEqual(self.cells(1), list('xyzuvw'))
+
+    def test_delete(self):
+        """Test that removed rows are notified by ranges"""
+        self.cells(1)
+        rows = np.array([1, 3, 4])
+        self.model.apply_change(self.data.dropna().reset_index(drop=True),
+                                Change('delete', rows=rows))
+        self.assertEqual(self.events, [('removed', 3, 4), ('removed', 1, 1)])
+        self.assertEqual(self.model.rowCount(), 3)
+        self.assertEqual(self.cells(1), ['x', 'z', 'w'])
+
+    def test_insert(self):
+        """Test that restored rows are notified by ranges"""
+        rows = np.array([1, 3, 4])
+        self.model.setDataFrame(self.data.dropna().reset_index(drop=True))
+        self.events.clear()
+        self.model.apply_change(self.data, Change('insert', rows=rows))
+        self.assertEqual(self.events, [('inserted', 1, 1), ('inserted', 3, 4)])
+        self.assertEqual(self.cells(1), list('xyzuvw'))
+
+    def test_reset(self):
+        """Test that unknown or inconsistent changes reset the model"""
+        self.model.apply_change(self.data.head(2), None)
+        self.model.apply_change(self.data, Change('fill', ('a',)))
+        self.assertEqual(self.events, ['reset', 'reset'])
+
+        rows = np.arange(0, 2 * MAX_REMOVED_RANGES + 2, 2)
+        data = pd.DataFrame({'a': np.arange(2 * len(rows)), 'b': 'x'})
+        self.model.setDataFrame(data)
+        self.events.clear()
+        self.model.apply_change(data.drop(index=rows).reset_index(drop=True),
+                                Change('delete', rows=rows))
+        self.assertEqual(self.events, ['reset'])
+        self.assertEqual(self.model.rowCount(), len(rows))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,10 +2,8 @@
 
 import os
 import sys
-from PySide6.QtWidgets import QWidget, QHBoxLayout
+from PySide6.QtWidgets import QComboBox, QWidget, QHBoxLayout, QVBoxLayout
 from PySide6.QtCore import Slot
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
 
 # Add repository root to path
 REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..'))
@@ -16,13 +14,26 @@ import user_interface.ui_helpers as helper
 
 
 class RegressionGraph(QWidget):
-    """Widget class for displaying regression graphs."""
+    """Widget class for displaying regression graphs.
 
+    A navigation toolbar lets the user zoom and pan, which redraws the
+    points of the visible range at full resolution. The points are drawn
+    as a scatter plot or, for very large datasets, as a rasterized
+    density image. The same figure is reused for every model. It is
+    created with the first model shown, so matplotlib is not imported
+    before it is needed.
+    """
+
+    # Plot backends of Model.get_plot by their label in the backend menu
+    BACKENDS = {'Scatter': 'scatter', 'Density': 'raster'}
 
     def __init__(self):
         """Initialize the regression graph widget."""
         super().__init__()
-        
+
+        self._plot = None
+        self.canvas = None
+        self.toolbar = None
         self._setup_ui()
 
     def _setup_ui(self):
@@ -38,28 +49,59 @@ class RegressionGraph(QWidget):
         main_layout.addWidget(self.container)
 
         # Set up internal layout
-        self._layout = QHBoxLayout()
+        self._layout = QVBoxLayout()
         self._layout.setContentsMargins(10, 10, 10, 10)
         self.container.setLayout(self._layout)
 
+        self._backend_menu = QComboBox()
+        self._backend_menu.addItems(list(self.BACKENDS))
+        self._backend_menu.currentIndexChanged.connect(self._change_backend)
+
+        self._tools_layout = QHBoxLayout()
+        self._tools_layout.addWidget(self._backend_menu)
+
+        self._layout.addLayout(self._tools_layout)
+
+    def _create_canvas(self):
+        """Create the figure, its canvas and the navigation toolbar."""
+        from matplotlib.backends.backend_qt5agg import (
+            FigureCanvasQTAgg as FigureCanvas,
+            NavigationToolbar2QT,
+        )
+        from data_management.plotting import RegressionPlot
+
+        self._plot = RegressionPlot(backend=self.backend)
+
         # Create and add canvas
-        self.canvas = FigureCanvas(Figure())
+        self.canvas = FigureCanvas(self._plot.figure)
+        self.canvas.setStyleSheet("background-color: rgba(0, 0, 0, 0);")
+        self.toolbar = NavigationToolbar2QT(self.canvas, self)
+
+        self._tools_layout.insertWidget(0, self.toolbar)
         self._layout.addWidget(self.canvas)
 
+    @property
+    def backend(self) -> str:
+        """Get the plot backend selected in the backend menu."""
+        return self.BACKENDS[self._backend_menu.currentText()]
+
+    def _change_backend(self) -> None:
+        """Draw the current points with the selected backend."""
+        if self._plot is None:
+            return
+        self._plot.set_backend(self.backend)
+        self._plot.redraw()
+
     @Slot(Model)
     def make_graph(self, model: Model) -> None:
-        """Create and display regression model visualization.
-        
+        """Display the data and line of a regression model.
+
+        The artists of the figure are updated in place.
+
         Args:
-            data: DataFrame containing the data.
-            x: Name of the independent variable column.
-            y: Name of the dependent variable column.
+            model: Model fitted from data.
         """
-        # Create regression model and get plot
-        graph = model.get_plot()
-        
-        # Update canvas with new plot
-        self.canvas.figure.clf()
-        self.canvas.setStyleSheet("background-color: rgba(0, 0, 0, 0);")
-        self.canvas.figure = graph
-        self.canvas.draw()
\ No newline at end of file
+        if self._plot is None:
+            self._create_canvas()
+        self._plot.update(model)
+        self.toolbar.update()
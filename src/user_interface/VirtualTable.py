@@ -3,13 +3,74 @@
 This module provides the class infrastructure and methods to create a Virtual
 table that will remarkably increase the efficiency and speed of displaying
 user's data sets. This is done by separating the data from the visualization.
+Cells are formatted as display strings by blocks of rows, one column at a
+time with vectorized conversions, and kept in a bounded LRU cache. Changes
+made by preprocessing are applied incrementally, so the view keeps its
+state. Rows can also be read on demand from a RowSource while the user
+scrolls.
 """
 
+from bisect import bisect_right
+from collections import OrderedDict
+
+import numpy as np
 import pandas as pd
 from PySide6.QtWidgets import QTableView, QHeaderView
 from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex, Slot
 
 
+# Rows formatted together as display strings
+BLOCK_ROWS = 256
+
+# Blocks of rows kept formatted at most
+CACHE_BLOCKS = 64
+
+# Rows read from a row source each time the view needs more
+FETCH_ROWS = 1_000
+
+# Ranges of removed or restored rows notified one by one at most, beyond
+# which the model is reset
+MAX_REMOVED_RANGES = 256
+
+# Looked up once: data() is called for every role of every visible cell
+# and the Qt.DisplayRole shortcut is resolved on each access
+DISPLAY_ROLE = Qt.ItemDataRole.DisplayRole
+
+
+def format_column(values):
+    """Convert a column of values to display strings.
+
+    The strings are those given by str() on each value, but numeric
+    columns are converted by NumPy in a single call.
+
+    Args:
+        values (pandas.Series): Values to format.
+
+    Returns:
+        list: Display strings of the values.
+    """
+    if isinstance(values.dtype, np.dtype) and values.dtype.kind in 'biuf':
+        return values.to_numpy().astype(str).tolist()
+    return values.to_numpy(dtype=object).astype(str).tolist()
+
+
+def _ranges(rows):
+    """Split sorted row positions into ranges of consecutive rows.
+
+    Args:
+        rows (numpy.ndarray): Sorted row positions.
+
+    Returns:
+        list: First and last row of each range.
+    """
+    if len(rows) == 0:
+        return []
+    breaks = np.flatnonzero(np.diff(rows) != 1) + 1
+    starts = rows[np.r_[0, breaks]]
+    stops = rows[np.r_[breaks - 1, len(rows) - 1]]
+    return list(zip(starts.tolist(), stops.tolist()))
+
+
 class VirtualTableModel(QAbstractTableModel):
     """Build a data model from a pandas DataFrame for Table View.
 
@@ -17,6 +78,17 @@ class VirtualTableModel(QAbstractTableModel):
     DataFrame. This model will provide the data for our Table View.
     It inherits from QAbstractTableModel that allows efficient data
     management for GUIs.
+
+    Display strings are cached by blocks of BLOCK_ROWS rows. Within a
+    block each column is formatted the first time one of its cells is
+    shown, so wide frames only pay for their visible columns. The
+    CACHE_BLOCKS most recently used blocks are kept.
+
+    When the data comes from a RowSource, only its first page of rows is
+    read at first and views fetch the next pages through canFetchMore and
+    fetchMore as they scroll. Fetched pages are kept apart and cells are
+    formatted from the pages holding them; the pages are only joined
+    into one frame when it is needed as a whole, such as to sort.
     """
 
     def __init__(self, data=None):
@@ -26,7 +98,56 @@ class VirtualTableModel(QAbstractTableModel):
             data (pandas.DataFrame, optional): Initial data. Defaults to None.
         """
         super().__init__()
-        self._data = data if data is not None else pd.DataFrame()
+        self._cache = OrderedDict()
+        self._source = None
+        self._set_frame(data if data is not None else pd.DataFrame())
+
+    def _set_frame(self, data):
+        """Store a new data frame and its shape, discarding formatted cells.
+
+        Args:
+            data (pandas.DataFrame): New data frame.
+        """
+        self._data = data
+        # Pages fetched after the rows of _data and their first rows
+        self._pages = []
+        self._page_starts = []
+        self._rows = len(data)
+        self._columns = len(data.columns) if not data.empty else 0
+        self.clear_cache()
+
+    def _join_pages(self):
+        """Append the fetched pages to the data frame."""
+        if self._pages:
+            self._data = pd.concat([self._data] + self._pages,
+                                   ignore_index=True)
+            self._pages = []
+            self._page_starts = []
+
+    def _format_rows(self, start, stop, column):
+        """Format the cells of a column within a range of rows.
+
+        Args:
+            start (int): First row.
+            stop (int): Row after the last one.
+            column (int): Column index.
+
+        Returns:
+            list: Display strings of the cells.
+        """
+        strings = []
+        if start < len(self._data):
+            strings = format_column(self._data.iloc[start:stop, column])
+            start = len(self._data)
+
+        page = bisect_right(self._page_starts, start) - 1
+        while start < stop and 0 <= page < len(self._pages):
+            first = self._page_starts[page]
+            strings += format_column(
+                self._pages[page].iloc[start - first:stop - first, column])
+            start = first + len(self._pages[page])
+            page += 1
+        return strings
 
     def rowCount(self, parent=QModelIndex()):
         """Return the number of rows in the data frame.
@@ -38,7 +159,7 @@ class VirtualTableModel(QAbstractTableModel):
         Returns:
             int: Number of rows.
         """
-        return len(self._data)
+        return self._rows
 
     def columnCount(self, parent=QModelIndex()):
         """Return the number of columns in the data frame.
@@ -50,7 +171,7 @@ class VirtualTableModel(QAbstractTableModel):
         Returns:
             int: Number of columns.
         """
-        return len(self._data.columns) if not self._data.empty else 0
+        return self._columns
 
     def headerData(self, section, orientation, role):
         """Set header for the table.
@@ -63,10 +184,10 @@ class VirtualTableModel(QAbstractTableModel):
         Returns:
             str: Header text or None.
         """
-        if role == Qt.DisplayRole:
-            if orientation == Qt.Horizontal:
+        if role == DISPLAY_ROLE:
+            if orientation == Qt.Orientation.Horizontal:
                 return self._data.columns[section]
-            elif orientation == Qt.Vertical:
+            elif orientation == Qt.Orientation.Vertical:
                 return str(section + 1)
         return None
 
@@ -81,10 +202,228 @@ class VirtualTableModel(QAbstractTableModel):
         Returns:
             str: Cell value or None.
         """
-        if role == Qt.DisplayRole and index.isValid():
-            return str(self._data.iat[index.row(), index.column()])
+        if role == DISPLAY_ROLE and index.isValid():
+            block, offset = divmod(index.row(), BLOCK_ROWS)
+            return self._formatted(block, index.column())[offset]
         return None
 
+    def _formatted(self, block, column):
+        """Return the display strings of a column within a block of rows.
+
+        Args:
+            block (int): Index of the block of rows.
+            column (int): Column index.
+
+        Returns:
+            list: Display strings of the cells of the block.
+        """
+        columns = self._cache.get(block)
+        if columns is None:
+            columns = self._cache[block] = {}
+            if len(self._cache) > CACHE_BLOCKS:
+                self._cache.popitem(last=False)
+        else:
+            self._cache.move_to_end(block)
+
+        strings = columns.get(column)
+        if strings is None:
+            start = block * BLOCK_ROWS
+            strings = columns[column] = self._format_rows(
+                start, start + BLOCK_ROWS, column)
+        return strings
+
+    def canFetchMore(self, parent=QModelIndex()):
+        """Return whether the row source has rows left to read.
+
+        Args:
+            parent (QModelIndex, optional): Parent index. Defaults to
+              QModelIndex().
+
+        Returns:
+            bool: True if fetchMore can add rows.
+        """
+        return (not parent.isValid() and self._source is not None
+                and not self._source.exhausted)
+
+    def fetchMore(self, parent=QModelIndex()):
+        """Append the next page of rows of the row source.
+
+        Args:
+            parent (QModelIndex, optional): Parent index. Defaults to
+              QModelIndex().
+        """
+        if not self.canFetchMore(parent):
+            return
+
+        rows = self._source.fetch(FETCH_ROWS)
+        if rows.empty:
+            return
+
+        first = self._rows
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        # The last block may have been formatted while it was incomplete
+        self._cache.pop(first // BLOCK_ROWS, None)
+        self._pages.append(rows)
+        self._page_starts.append(first)
+        self._rows = first + len(rows)
+        self._columns = len(rows.columns)
+        self.endInsertRows()
+
+    def fetch_all(self):
+        """Read every row left in the row source."""
+        while self.canFetchMore():
+            self.fetchMore()
+
+    def _release_source(self):
+        """Close the row source, if any."""
+        if self._source is not None:
+            self._source.close()
+            self._source = None
+
+    def set_source(self, source):
+        """Show the rows of a row source, reading its first page.
+
+        Args:
+            source (RowSource): Source of the rows.
+        """
+        self.beginResetModel()
+        self._release_source()
+        self._source = source
+        self._set_frame(source.fetch(FETCH_ROWS))
+        self.endResetModel()
+
+    def clear_cache(self):
+        """Discard every formatted cell."""
+        self._cache.clear()
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        """Sort the rows by the values of a column.
+
+        Args:
+            column (int): Column index.
+            order (Qt.SortOrder, optional): Sort order. Defaults to
+              Qt.AscendingOrder.
+        """
+        # Rows fetched later could not be placed in order
+        self.fetch_all()
+        self._join_pages()
+        if self._data.empty:
+            return
+
+        self.layoutAboutToBeChanged.emit()
+        self._set_frame(self._data.sort_values(
+            self._data.columns[column],
+            ascending=order == Qt.AscendingOrder,
+            kind='stable',
+            ignore_index=True
+        ))
+        self.layoutChanged.emit()
+
+    def row(self, row):
+        """Return the values of a row.
+
+        Args:
+            row (int): Row index.
+
+        Returns:
+            pandas.Series: Values of the row.
+        """
+        self._join_pages()
+        return self._data.iloc[row]
+
+    def apply_change(self, data, change):
+        """Update the data frame with the result of a known change.
+
+        Filled columns are notified with dataChanged, removed rows with
+        rowsRemoved and restored rows with rowsInserted, so views keep
+        their selection and scroll position. Any other change resets the
+        model.
+
+        Args:
+            data (pandas.DataFrame): New data frame.
+            change (Change): Change from the current data frame to the new
+              one, as given by DataManager.last_change, or None if unknown.
+        """
+        self._join_pages()
+        if change is None or list(data.columns) != list(self._data.columns):
+            self.setDataFrame(data)
+        elif change.kind == 'fill' and len(data) == self._rows:
+            self._fill(data, change.columns)
+        elif (change.kind == 'delete'
+              and len(data) == self._rows - len(change.rows)):
+            self._remove(data, change.rows)
+        elif (change.kind == 'insert'
+              and len(data) == self._rows + len(change.rows)):
+            self._insert(data, change.rows)
+        else:
+            self.setDataFrame(data)
+
+    def _fill(self, data, columns):
+        """Replace the data frame after the values of some columns changed.
+
+        Args:
+            data (pandas.DataFrame): New data frame.
+            columns (tuple): Names of the changed columns.
+        """
+        self._data = data
+        positions = [data.columns.get_loc(name) for name in columns]
+        for formatted in self._cache.values():
+            for position in positions:
+                formatted.pop(position, None)
+
+        if self._rows == 0:
+            return
+        for position in positions:
+            self.dataChanged.emit(
+                self.index(0, position),
+                self.index(self._rows - 1, position),
+                [DISPLAY_ROLE]
+            )
+
+    def _remove(self, data, rows):
+        """Replace the data frame after some rows were removed.
+
+        Args:
+            data (pandas.DataFrame): New data frame.
+            rows (numpy.ndarray): Sorted positions of the removed rows in
+              the current data frame.
+        """
+        if len(rows) == 0:
+            self._data = data
+            return
+
+        ranges = _ranges(rows)
+        if len(ranges) > MAX_REMOVED_RANGES:
+            self.setDataFrame(data)
+            return
+
+        # Removed last to first so earlier positions remain valid
+        for start, stop in reversed(ranges):
+            self.beginRemoveRows(QModelIndex(), start, stop)
+            self._rows -= stop - start + 1
+            self.endRemoveRows()
+        self._set_frame(data)
+
+    def _insert(self, data, rows):
+        """Replace the data frame after some rows were restored.
+
+        Args:
+            data (pandas.DataFrame): New data frame.
+            rows (numpy.ndarray): Sorted positions of the restored rows in
+              the new data frame.
+        """
+        ranges = _ranges(rows)
+        if len(ranges) > MAX_REMOVED_RANGES:
+            self.setDataFrame(data)
+            return
+
+        # Inserted first to last so each range lands at its final position
+        for start, stop in ranges:
+            self.beginInsertRows(QModelIndex(), start, stop)
+            self._rows += stop - start + 1
+            self.endInsertRows()
+        self._set_frame(data)
+
     def setDataFrame(self, data):
         """Update the data frame.
 
@@ -92,7 +431,8 @@ class VirtualTableModel(QAbstractTableModel):
             data (pandas.DataFrame): New data frame.
         """
         self.beginResetModel()
-        self._data = data
+        self._release_source()
+        self._set_frame(data)
         self.endResetModel()
 
 
@@ -146,4 +486,24 @@ class VirtualTableView(QTableView):
         Args:
             data (pandas.DataFrame): New data to display.
         """
-        self.model().setDataFrame(data)
\ No newline at end of file
+        self.model().setDataFrame(data)
+
+    @Slot(pd.DataFrame, object)
+    def update_data(self, data, change):
+        """Update the table data after a known change.
+
+        Args:
+            data (pandas.DataFrame): New data to display.
+            change (Change): Change from the displayed data, or None if
+              unknown.
+        """
+        self.model().apply_change(data, change)
+
+    @Slot(object)
+    def set_source(self, source):
+        """Show the rows of a row source as the user scrolls.
+
+        Args:
+            source (RowSource): Source of the rows.
+        """
+        self.model().set_source(source)
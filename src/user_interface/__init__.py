@@ -1,10 +1,22 @@
-from user_interface.chooseColumn import ChooseColumn
-from user_interface.ShowRegression import RegressionGraph
-from user_interface.openFile import ChooseFile
-from user_interface.prepMenu import PrepMenu
-from user_interface.repModel import RepModel
-from user_interface.VirtualTable import VirtualTableModel, VirtualTableView
-from user_interface.mainWindow import MainWindow
+"""Widgets of the graphical interface.
+
+The widgets are imported when first accessed (PEP 562), so importing one
+of them does not import the modules of the others.
+"""
+
+from importlib import import_module
+
+# Module defining each widget exported by the package
+_WIDGETS = {
+    "ChooseColumn": "user_interface.chooseColumn",
+    "RegressionGraph": "user_interface.ShowRegression",
+    "ChooseFile": "user_interface.openFile",
+    "PrepMenu": "user_interface.prepMenu",
+    "RepModel": "user_interface.repModel",
+    "VirtualTableModel": "user_interface.VirtualTable",
+    "VirtualTableView": "user_interface.VirtualTable",
+    "MainWindow": "user_interface.mainWindow",
+}
 
 
 __all__ = [
@@ -16,4 +28,17 @@ __all__ = [
     "VirtualTableView",
     "MainWindow",
     "RepModel"
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    if name not in _WIDGETS:
+        raise AttributeError(
+            f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_WIDGETS[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_WIDGETS))
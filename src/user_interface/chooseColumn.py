@@ -7,7 +7,11 @@ import pandas as pd
 from PySide6.QtCore import Signal, Slot, Qt
 from PySide6.QtWidgets import (
     QHBoxLayout,
+    QLabel,
+    QListWidget,
+    QListWidgetItem,
     QMessageBox,
+    QSpinBox,
     QVBoxLayout,
     QWidget,
 )
@@ -20,17 +24,24 @@ class ChooseColumn(QWidget):
     """Widget for selecting input and output columns for regression analysis.
 
     Provides combo boxes for column selection and a button to generate a
-    regression model. Emits signals for communication with other components.
+    regression model. Further input columns can be checked in a list, and
+    a degree above one adds powers of the inputs to the model. Emits
+    signals for communication with other components.
 
     Signals:
         send_selection: Signal for checking NaN values (int)
         selected: Signal indicating valid selection made (bool)
         make_regression: Signal to trigger regression model creation
+        fit_all_pairs: Signal to fit every pair of numeric columns
     """
 
+    # Highest degree offered for polynomial terms
+    MAX_DEGREE = 5
+
     send_selection = Signal(int)
     selected = Signal(bool)
     make_regression = Signal()
+    fit_all_pairs = Signal()
 
     def __init__(self):
         """Initialize the widget with selection menus and generate button."""
@@ -52,12 +63,30 @@ class ChooseColumn(QWidget):
             event=self.on_combo_box2_changed
         )
         
+        self._extra_label = QLabel('Additional inputs')
+        self._extra_menu = QListWidget()
+        self._extra_menu.setMaximumHeight(90)
+
+        self._degree_label = QLabel('Degree')
+        self._degree_input = QSpinBox()
+        self._degree_input.setRange(1, self.MAX_DEGREE)
+        degree_layout = QHBoxLayout()
+        degree_layout.addWidget(self._degree_label)
+        degree_layout.addWidget(self._degree_input)
+
         self.create_model = helper.create_button(
             text="Generate Model",
             event=self.on_create_model
         )
 
         self.create_model.setEnabled(False)
+
+        self.fit_pairs = helper.create_button(
+            text="Fit All Pairs",
+            event=self.fit_all_pairs.emit
+        )
+
+        self.fit_pairs.setEnabled(False)
         
         self.selected.connect(self.enable_button)
 
@@ -70,7 +99,10 @@ class ChooseColumn(QWidget):
             items=[
                 title_layout,
                 self._input_menu,
-                self._output_menu
+                self._output_menu,
+                self._extra_label,
+                self._extra_menu,
+                degree_layout
             ]
         )
 
@@ -99,7 +131,16 @@ class ChooseColumn(QWidget):
             menu.addItem(default)
             menu.addItems(items)
 
+        self._extra_menu.clear()
+        for column in items:
+            item = QListWidgetItem(str(column))
+            item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
+            item.setCheckState(Qt.Unchecked)
+            self._extra_menu.addItem(item)
+        self._degree_input.setValue(1)
+
         self.setEnabled(True)
+        self.fit_pairs.setEnabled(True)
 
     def check_selection(self, menu):
         """Verify that different columns are selected for input and output.
@@ -128,13 +169,59 @@ class ChooseColumn(QWidget):
             self._output_menu.currentText()
         ]
 
+    def extra_inputs(self):
+        """Return the checked additional input columns.
+
+        The selected input and output columns are left out even if
+        checked.
+
+        Returns:
+            List with the names of the additional input columns.
+        """
+        selected = set(self.selection())
+        checked = (self._extra_menu.item(row)
+                   for row in range(self._extra_menu.count()))
+        return [item.text() for item in checked
+                if item.checkState() == Qt.Checked
+                and item.text() not in selected]
+
+    def degree(self):
+        """Return the highest power of the inputs in the model.
+
+        Returns:
+            Degree selected, 1 for a linear model.
+        """
+        return self._degree_input.value()
+
+    def column_name(self, index):
+        """Return the column name at the given position of the data.
+
+        Args:
+            index: Position of the column, as sent by send_selection.
+
+        Returns:
+            Name of the column.
+        """
+        return self._input_menu.itemText(index + 1)
+
+    def select_pair(self, input_col, output_col):
+        """Select the given input and output columns.
+
+        Args:
+            input_col: Name of the input column.
+            output_col: Name of the output column.
+        """
+        self._output_menu.setCurrentIndex(0)
+        self._input_menu.setCurrentText(input_col)
+        self._output_menu.setCurrentText(output_col)
+
     def on_combo_box1_changed(self, index):
         """Handle changes in the input column selection.
 
         Args:
             index: Index of the selected item in the input combo box.
         """
-        if index != 0:
+        if index > 0:
             self.send_selection.emit(index - 1)
             if self._output_menu.currentIndex() != 0:
                 self.check_selection(menu=self._input_menu)
@@ -147,7 +234,7 @@ class ChooseColumn(QWidget):
         Args:
             index: Index of the selected item in the output combo box.
         """
-        if index != 0:
+        if index > 0:
             self.send_selection.emit(index - 1)
             if self._input_menu.currentIndex() != 0:
                 self.check_selection(menu=self._output_menu)
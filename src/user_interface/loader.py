@@ -0,0 +1,108 @@
+"""Module for running file loading tasks outside of the GUI thread.
+
+This module provides a QRunnable based task that executes a loading
+function (such as FileReader.parse_file or load_model) in Qt's global
+thread pool and reports its progress and result back to the main thread
+through queued signals.
+"""
+
+import threading
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+from data_management import LoadCancelled
+
+
+class LoaderSignals(QObject):
+    """Signals emitted by a LoadTask.
+
+    They are created on the main thread, so every emission from the
+    worker thread is queued and delivered on the main thread.
+
+    Signals:
+        progress: Rows read, bytes read and total bytes of the file
+        finished: Result returned by the loading function
+        failed: Error message if the loading function raised
+        cancelled: Emitted when the task was cancelled before its function
+            returned
+    """
+
+    progress = Signal(int, int, int)
+    finished = Signal(object)
+    failed = Signal(str)
+    cancelled = Signal()
+
+
+class LoadTask(QRunnable):
+    """Run a loading function in a worker thread.
+
+    The function receives the given arguments. If report_progress is
+    True, it also receives progress and cancel keyword arguments
+    compatible with FileReader.parse_file.
+    """
+
+    def __init__(self, function, *args, report_progress=False, **kwargs):
+        """Initialize the task.
+
+        Args:
+            function: Callable doing the actual loading.
+            *args: Positional arguments for the function.
+            report_progress: Whether to pass progress and cancel
+              callbacks to the function.
+            **kwargs: Keyword arguments for the function.
+        """
+        super().__init__()
+        self.setAutoDelete(False)
+
+        self.signals = LoaderSignals()
+        self._function = function
+        self._args = args
+        self._kwargs = kwargs
+        self._cancel_event = threading.Event()
+
+        if report_progress:
+            self._kwargs['progress'] = self._report_progress
+            self._kwargs['cancel'] = self._cancel_event.is_set
+
+    def _report_progress(self, rows: int, bytes_read: int, total_bytes: int):
+        """Forward a progress event to the main thread."""
+        self.signals.progress.emit(rows, bytes_read, total_bytes)
+
+    def cancel(self) -> None:
+        """Ask the task to stop as soon as possible."""
+        self._cancel_event.set()
+
+    def is_cancelled(self) -> bool:
+        """Return whether the task has been asked to stop."""
+        return self._cancel_event.is_set()
+
+    def run(self) -> None:
+        """Execute the loading function and emit its outcome.
+
+        A task cancelled before it starts does not call the function. Once
+        the function has returned its result is always published, even if
+        a cancel arrived meanwhile, since the work it did is complete.
+        """
+        if self.is_cancelled():
+            self.signals.cancelled.emit()
+            return
+
+        try:
+            result = self._function(*self._args, **self._kwargs)
+        except LoadCancelled:
+            self.signals.cancelled.emit()
+            return
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+            return
+
+        self.signals.finished.emit(result)
+
+
+def start_task(task: LoadTask) -> None:
+    """Queue a task in Qt's global thread pool.
+
+    Args:
+        task: The task to run.
+    """
+    QThreadPool.globalInstance().start(task)
@@ -25,6 +25,10 @@ from PySide6.QtCore import Qt, Slot, Signal
 import pandas as pd
 
 from data_management import DataManager, Model
+from data_management.regressionEngine import (
+    fit_all_pairs,
+    fit_all_pairs_chunks,
+)
 from user_interface import (
     ChooseColumn,
     ChooseFile,
@@ -33,6 +37,8 @@ from user_interface import (
     RepModel,
 )
 import user_interface.ui_helpers as helper
+from user_interface.loader import LoadTask, start_task
+from user_interface.pairsDialog import PairsDialog
 from user_interface.predictions import Predict
 
 
@@ -68,7 +74,10 @@ class MainWindow(QMainWindow):
         self.setGeometry(100, 100, 1000, 550)
 
         self._data_manager = DataManager()
+        self._locked_widgets = []
+        self._pending_regression = None
         self._model = Model()
+        self._pairs_task = None
 
         # Set up main layout and content widget
         self._main_layout = QVBoxLayout()
@@ -171,6 +180,7 @@ class MainWindow(QMainWindow):
         # Create model button layout
         self._gen_button_layout = QHBoxLayout()
         self._gen_button_layout.addWidget(self._select_cols.create_model)
+        self._gen_button_layout.addWidget(self._select_cols.fit_pairs)
         self._gen_button_layout.setAlignment(Qt.AlignCenter)
 
         # Add components to main layout
@@ -201,7 +211,17 @@ class MainWindow(QMainWindow):
         self._choose_file_menu.file_selected.connect(
             self._select_cols.update_selection
         )
+        self._choose_file_menu.columns_loaded.connect(self.get_data)
+        self._choose_file_menu.columns_loaded.connect(self._table.set_data)
+        self._choose_file_menu.columns_loaded.connect(self.columns_ready)
+        self._choose_file_menu.file_selected.connect(
+            self._preprocess.update_columns
+        )
+        self._choose_file_menu.columns_loaded.connect(
+            self._preprocess.update_columns
+        )
         self._choose_file_menu.hide_show.connect(self.hide_show_data)
+        self._choose_file_menu.preview.connect(self.show_preview)
 
         # Column selection connections
         self._select_cols.send_selection.connect(self.show_nan_values)
@@ -209,7 +229,10 @@ class MainWindow(QMainWindow):
 
         # Preprocessing connections
         self._preprocess.preprocess_request.connect(self.handle_preprocess)
-        self._preprocess.processed_data.connect(self._table.set_data)
+        self._preprocess.undo_request.connect(self.handle_undo)
+        self._preprocess.redo_request.connect(self.handle_redo)
+        self._preprocess.processed_data.connect(self._table.update_data)
+        self._preprocess.running.connect(self.lock_data)
 
         # Model info connections
         self.is_model.connect(self._graph.make_graph)
@@ -224,8 +247,29 @@ class MainWindow(QMainWindow):
             self._predict.update_model
         )
 
-        # Regression connection
+        # Regression connections
         self._select_cols.make_regression.connect(self.handle_regression)
+        self._select_cols.fit_all_pairs.connect(self.handle_fit_all_pairs)
+
+    @Slot(bool)
+    def lock_data(self, locked):
+        """
+        Disable every action that replaces or reads the data, or restore them.
+
+        Args:
+            locked (bool): Whether a worker is computing from the data.
+        """
+        if locked:
+            widgets = (self._choose_file_menu, self._select_cols,
+                       self._select_cols.create_model,
+                       self._select_cols.fit_pairs)
+            self._locked_widgets = [w for w in widgets if w.isEnabled()]
+            for widget in self._locked_widgets:
+                widget.setEnabled(False)
+        else:
+            for widget in self._locked_widgets:
+                widget.setEnabled(True)
+            self._locked_widgets = []
 
     @Slot(pd.DataFrame)
     def get_data(self, data):
@@ -237,6 +281,23 @@ class MainWindow(QMainWindow):
                                from the user's file selection.
         """
         self._data_manager.data = data
+        self._preprocess.update_history(self._data_manager)
+
+    @Slot(object)
+    def show_preview(self, source):
+        """
+        Show the first rows of a dataset while it is loading.
+
+        Args:
+            source (RowSource): Source reading the rows of the dataset, or
+                None to show the current data again.
+        """
+        if source is None:
+            data = self._data_manager.data
+            self._table.set_data(data if data is not None else pd.DataFrame())
+        else:
+            self._table.setVisible(True)
+            self._table.set_source(source)
 
     @Slot(int)
     def show_nan_values(self, index):
@@ -251,7 +312,10 @@ class MainWindow(QMainWindow):
         with the analysis, prompting them to consider preprocessing steps
         if necessary.
         """
-        col_name = self._data_manager.data.columns[index]
+        col_name = self._select_cols.column_name(index)
+        if col_name not in self._data_manager.data.columns:
+            return
+
         num_nan = self._data_manager.detect(column=col_name)
 
         if num_nan > 0:
@@ -264,10 +328,23 @@ class MainWindow(QMainWindow):
 
     @Slot(bool)
     def activate_preprocess(self, selected):
+        """
+        Enable the preprocessing menu if the selected columns have NaN values.
 
+        Args:
+            selected (bool): Whether a valid pair of columns is selected.
+
+        Datasets loaded in two phases get their selected columns loaded
+        first; the NaN values are then counted by columns_ready.
+        """
         if selected:
 
             columns = self._select_cols.selection()
+            if self._choose_file_menu.load_columns(
+                    columns + self._select_cols.extra_inputs()):
+                self._preprocess.activate_menu(False)
+                return
+
             nan = 0
 
             for c in columns:
@@ -282,6 +359,22 @@ class MainWindow(QMainWindow):
         else:
             self._preprocess.activate_menu(False)
 
+    @Slot(pd.DataFrame)
+    def columns_ready(self, data):
+        """
+        Resume the column selection once its columns have been loaded.
+
+        A regression requested while its columns were loading is generated
+        now, provided the loaded columns are the ones it needs.
+
+        Args:
+            data (pd.DataFrame): The projected columns of the dataset.
+        """
+        self.activate_preprocess(True)
+        pending, self._pending_regression = self._pending_regression, None
+        if pending is not None and set(pending) == set(data.columns):
+            self.handle_regression()
+
     @Slot()
     def handle_preprocess(self):
         """
@@ -298,32 +391,66 @@ class MainWindow(QMainWindow):
             manager=self._data_manager
         )
 
+    @Slot()
+    def handle_undo(self):
+        """
+        Undo the last preprocessing operation and check the selected
+        columns for NaN values again.
+        """
+        self._preprocess.undo(self._data_manager)
+        self.activate_preprocess(self._select_cols.create_model.isEnabled())
+
+    @Slot()
+    def handle_redo(self):
+        """
+        Redo the last undone preprocessing operation and check the selected
+        columns for NaN values again.
+        """
+        self._preprocess.redo(self._data_manager)
+        self.activate_preprocess(self._select_cols.create_model.isEnabled())
+
     @Slot()
     def handle_regression(self):
         """
         Handle the regression model generation request.
 
         This method:
-            1. Checks for NaN values in the selected columns
+            1. Checks for NaN values in the selected and additional input
+               columns
             2. Attempts to generate the regression model if data is clean
             3. Updates the visualization components
             4. Handles any errors that occur during model generation
         
         If NaN values are found, prompts the user to preprocess the data first.
+        Additional inputs that a dataset loaded in two phases has not read
+        yet are loaded first, and the model is generated once they arrive.
         """
         columns = self._select_cols.selection()
+        inputs = [columns[0]] + self._select_cols.extra_inputs()
+        degree = self._select_cols.degree()
+
+        if not set(inputs + columns).issubset(self._data_manager.data.columns):
+            needed = columns + inputs[1:]
+            if self._choose_file_menu.load_columns(needed):
+                self._pending_regression = needed
+                return
+            helper.show_error_message(
+                'The selected columns are still loading, please wait.'
+            )
+            return
 
         num_nan = sum(
             self._data_manager.detect(column)
-            for column in columns[:2]
+            for column in inputs + [columns[1]]
         )
 
         if num_nan == 0:
             try:
                 self._model.create_from_data(
                     data=self._data_manager.data,
-                    input_col=columns[0],
-                    output_col=columns[1]
+                    input_col=inputs[0] if len(inputs) == 1 else inputs,
+                    output_col=columns[1],
+                    degree=degree
                 )
                 self.is_model.emit(self._model)
                 self._show_model_components(True)
@@ -337,6 +464,53 @@ class MainWindow(QMainWindow):
                 'before generating model.'
             )
 
+    @Slot()
+    def handle_fit_all_pairs(self):
+        """
+        Fit a regression for every pair of numeric columns.
+
+        The fits run in a worker thread. Datasets loaded in two phases are
+        streamed from their file, as only their selected columns are in
+        memory. The results are shown in a sortable dialog.
+        """
+        if self._choose_file_menu.projected:
+            task = LoadTask(fit_all_pairs_chunks,
+                            self._choose_file_menu.dataset_chunks())
+        else:
+            task = LoadTask(fit_all_pairs, self._data_manager.data)
+
+        task.signals.finished.connect(self._show_pairs)
+        task.signals.failed.connect(
+            lambda message: helper.show_error_message(
+                f'unexpected error: {message}')
+        )
+        for signal in (task.signals.finished, task.signals.failed):
+            signal.connect(
+                lambda *_: self._select_cols.fit_pairs.setEnabled(True)
+            )
+
+        self._pairs_task = task
+        self._select_cols.fit_pairs.setEnabled(False)
+        start_task(task)
+
+    @Slot(object)
+    def _show_pairs(self, pairs):
+        """
+        Show the fits of every pair of columns.
+
+        Args:
+            pairs (pd.DataFrame): The fits returned by fit_all_pairs.
+        """
+        if pairs.empty:
+            helper.show_error_message(
+                'At least two numeric columns are needed to fit pairs.'
+            )
+            return
+
+        dialog = PairsDialog(pairs, parent=self)
+        dialog.pair_selected.connect(self._select_cols.select_pair)
+        dialog.show()
+
     def _show_model_components(self, show: bool):
         """
         Show or hide model-related components.
@@ -385,6 +559,7 @@ class MainWindow(QMainWindow):
         self._preprocess.setVisible(show)
         self._preprocess.toggle_input(checked=False)
         self._select_cols.create_model.setVisible(show)
+        self._select_cols.fit_pairs.setVisible(show)
         self._graph.setVisible(False)
         self._model_info.setVisible(not show)
         self._predict.setVisible(not show)
\ No newline at end of file
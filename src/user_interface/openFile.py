@@ -1,18 +1,37 @@
 # Standard library imports
+from pathlib import Path
+
 import pandas as pd
 
 # Third-party imports
-from PySide6.QtCore import Signal
+from PySide6.QtCore import Signal, Slot
 from PySide6.QtWidgets import (
     QFileDialog,
     QHBoxLayout,
+    QInputDialog,
+    QProgressBar,
     QSizePolicy,
     QWidget,
 )
 
 # Local imports
 import user_interface.ui_helpers as helper
-from src.data_management import FileReader, Model, load_model, ParseError
+from user_interface.loader import LoadTask, start_task
+from src.data_management import (
+    DatasetCache,
+    FileReader,
+    Model,
+    SQLiteReader,
+    load_model,
+)
+from src.data_management.rowSources import read_preview
+
+# Rows parsed per chunk when streaming CSV files and SQLite tables
+CHUNK_SIZE = 100_000
+
+# Files with more columns than this are loaded in two phases: the header
+# first, then only the columns selected for the regression
+PROJECTION_THRESHOLD = 50
 
 
 class ChooseFile(QWidget):
@@ -23,13 +42,24 @@ class ChooseFile(QWidget):
 
     Signals:
         file_selected: Emitted when a dataset is selected, contains pd.DataFrame
+            (only the header when the dataset is loaded in two phases)
+        columns_loaded: Emitted with the selected columns of a dataset loaded
+            in two phases, contains pd.DataFrame
         loaded_model: Emitted when a model is loaded, contains Model instance
         hide_show: Emitted to toggle visibility of elements based on file loading
+        preview: Emitted while a dataset is loading with a RowSource
+            holding its first rows, and with None if the load fails or is
+            cancelled
+
+    Files are parsed in a worker thread; a progress bar and a cancel
+    button are shown while a load is running.
     """
 
     file_selected = Signal(pd.DataFrame)
+    columns_loaded = Signal(pd.DataFrame)
     loaded_model = Signal(Model)
     hide_show = Signal(bool)
+    preview = Signal(object)
 
     def __init__(self):
         """Initialize the ChooseFile widget.
@@ -39,6 +69,15 @@ class ChooseFile(QWidget):
         """
         super().__init__()
 
+        self._dataset_path = None
+        self._dataset_table = None
+        self._projected = False
+        self._loaded_columns = []
+        self._task = None
+        self._previewing = False
+        self._preview_task = None
+        self._reader = FileReader(cache=DatasetCache())
+
         layout = QHBoxLayout()
 
         # Create UI elements
@@ -52,6 +91,13 @@ class ChooseFile(QWidget):
             text="Load Model",
             event=self._load_model_event
         )
+        self._progress_bar = QProgressBar()
+        self._progress_bar.setVisible(False)
+        self._cancel_button = helper.create_button(
+            text="Cancel",
+            event=self.cancel_loading
+        )
+        self._cancel_button.setVisible(False)
 
         # Set object names for styling
         self._file_indicator.setObjectName("filepath")
@@ -71,6 +117,8 @@ class ChooseFile(QWidget):
             items=[
                 self._file_indicator,
                 self._path_label,
+                self._progress_bar,
+                self._cancel_button,
                 self._open_dataset_button,
                 self._load_model_button,
             ]
@@ -97,31 +145,284 @@ class ChooseFile(QWidget):
             options=options
         )
 
-        if file_path:
-            try:
-                self.read_dataset(path=file_path)
-                self._path_label.setText(f"{file_path}")
-            except Exception:
-                pass
+        if not file_path:
+            return
+
+        if Path(file_path).suffix in {'.db', '.sqlite'}:
+            # Counting the rows of every table can take a while
+            task = LoadTask(self._list_tables, file_path)
+            self._start(task, lambda tables, path=file_path:
+                        self._tables_listed(path, tables))
+            return
+
+        self.read_dataset(path=file_path)
+
+    @staticmethod
+    def _list_tables(path: str) -> dict:
+        """List the tables of a SQLite database. Runs in a worker thread.
+
+        Args:
+            path: The path to the database file.
+
+        Returns:
+            Dictionary mapping table names to numbers of rows.
+        """
+        with SQLiteReader(path) as database:
+            return database.tables()
+
+    def _tables_listed(self, path: str, tables: dict) -> None:
+        """Load the table of a SQLite database chosen by the user.
+
+        Args:
+            path: The path to the database file.
+            tables: Tables of the database with their numbers of rows.
+        """
+        self._cancel_task()
+        table = self._choose_table(tables)
+        if table is not None:
+            self.read_dataset(path=path, table=table)
+
+    def _choose_table(self, tables: dict):
+        """Ask which table of a SQLite database should be loaded.
+
+        Args:
+            tables: Tables of the database with their numbers of rows.
+
+        Returns:
+            The chosen table name, or None if the user cancelled. The
+            user is only asked when the database has several tables.
+        """
+        if len(tables) <= 1:
+            return next(iter(tables), None)
+
+        items = [f"{name} ({rows:,} rows)" for name, rows in tables.items()]
+        item, accepted = QInputDialog.getItem(
+            self, "Select Table", "Table to load:", items, 0, False
+        )
+        if not accepted:
+            return None
+        return list(tables)[items.index(item)]
+
+    @property
+    def projected(self) -> bool:
+        """Whether the current dataset is loaded only by selected columns."""
+        return self._projected
+
+    def dataset_chunks(self):
+        """Stream the rows of the current dataset from its file.
+
+        Returns:
+            Iterator of DataFrame chunks of every column.
+        """
+        return self._reader.iter_chunks(self._dataset_path,
+                                        chunk_size=CHUNK_SIZE,
+                                        table=self._dataset_table)
+
+    def _start(self, task: LoadTask, on_finished) -> None:
+        """Run a loading task in the background, cancelling any previous one.
+
+        Args:
+            task: The task to run.
+            on_finished: Slot receiving the task result on the main thread,
+                unless the task has been cancelled or replaced meanwhile.
+        """
+        self._cancel_task()
+
+        task.signals.progress.connect(self._show_progress)
+        task.signals.finished.connect(
+            lambda result, t=task: self._publish(t, on_finished, result)
+        )
+        task.signals.failed.connect(self._show_failure)
+        for signal in (task.signals.finished, task.signals.failed,
+                       task.signals.cancelled):
+            signal.connect(lambda *_, t=task: self._task_done(t))
+
+        self._task = task
+        self._set_loading(True)
+        start_task(task)
+
+    def _publish(self, task: LoadTask, on_finished, result) -> None:
+        """Pass the result of a task on if it is still the current one."""
+        if task is self._task:
+            on_finished(result)
+
+    def _set_loading(self, loading: bool) -> None:
+        """Show or hide the progress widgets while a load is running.
+
+        Args:
+            loading: Whether a load is running.
+        """
+        self._progress_bar.setRange(0, 0)
+        self._progress_bar.setVisible(loading)
+        self._cancel_button.setVisible(loading)
+        self._open_dataset_button.setEnabled(not loading)
+        self._load_model_button.setEnabled(not loading)
+
+    def _task_done(self, task: LoadTask) -> None:
+        """Release a finished task and hide the progress widgets."""
+        if task is self._task:
+            self._task = None
+            self._set_loading(False)
+
+    @Slot(int, int, int)
+    def _show_progress(self, rows: int, bytes_read: int, total_bytes: int):
+        """Update the progress bar with the bytes read so far."""
+        if total_bytes:
+            self._progress_bar.setRange(0, 100)
+            self._progress_bar.setValue(int(100 * bytes_read / total_bytes))
+        self._progress_bar.setFormat(f"{rows:,} rows")
+
+    @Slot(str)
+    def _show_failure(self, message: str) -> None:
+        """Display the error raised by a loading task."""
+        helper.show_error_message(f"ERROR: {message}")
+
+    def _cancel_task(self) -> None:
+        """Cancel the running loading task, if any."""
+        if self._task is not None:
+            task, self._task = self._task, None
+            task.cancel()
+            self._set_loading(False)
+
+    def cancel_loading(self) -> None:
+        """Cancel the running load, if any, and withdraw its preview."""
+        self._cancel_task()
+        self._close_preview()
+
+    def _open_preview(self, path: str, table=None) -> None:
+        """Show the first rows of a dataset while it is being loaded.
+
+        The rows are read in a worker thread; failures are ignored, as the
+        load itself reports why the file cannot be read.
+
+        Args:
+            path: The path to the file being loaded.
+            table: Table being read from SQLite files.
+        """
+        task = LoadTask(read_preview, path, table)
+        task.signals.finished.connect(
+            lambda source, t=task: self._show_preview(t, source)
+        )
+        self._preview_task = task
+        start_task(task)
+
+    def _show_preview(self, task: LoadTask, source) -> None:
+        """Publish the first rows of a dataset that is still loading."""
+        if task is not self._preview_task:
+            return
+        self._preview_task = None
+        if source is not None:
+            self._previewing = True
+            self.preview.emit(source)
+
+    def _close_preview(self, *_) -> None:
+        """Withdraw the preview of a dataset that was not loaded."""
+        if self._preview_task is not None:
+            self._preview_task.cancel()
+            self._preview_task = None
+        if self._previewing:
+            self._previewing = False
+            self.preview.emit(None)
+
+    def _read_dataset_task(self, path: str, table=None, progress=None,
+                           cancel=None):
+        """Read a dataset, or only its header if it is too wide.
+
+        Runs in a worker thread.
+
+        Args:
+            path: The path to the file to be loaded.
+            table: Table to read from SQLite files.
+            progress: Progress callback for FileReader.parse_file.
+            cancel: Cancellation callback for FileReader.parse_file.
+
+        Returns:
+            Tuple with the path, the table, the DataFrame and whether only
+            the header was read.
+        """
+        columns = self._reader.read_columns(path, table=table)
 
-    def read_dataset(self, path: str):
+        if len(columns) > PROJECTION_THRESHOLD:
+            return path, table, pd.DataFrame(columns=columns), True
+
+        df = self._reader.parse_file(path, chunk_size=CHUNK_SIZE,
+                                     progress=progress, cancel=cancel,
+                                     optimize=True, table=table)
+        return path, table, df, False
+
+    def read_dataset(self, path: str, table=None):
         """Load file content into DataFrame and emit file_selected signal.
 
-        Handles various file formats (CSV, Excel, SQLite) and potential
-        errors during file processing.
+        Handles various file formats (CSV, Excel, SQLite). The file is
+        parsed in a worker thread, CSV files and SQLite tables being
+        streamed in chunks so the progress bar can follow the load and
+        the user can cancel it.
+        Wide files only have their header read here; their rows are
+        loaded later by load_columns. The first rows of CSV files and
+        SQLite tables are previewed while the file is loading.
 
         Args:
             path: The path to the file to be loaded.
+            table: Table to read from SQLite files, the first one by
+              default (optional).
+        """
+        # The preview is queued first so it is not held up by the load
+        self.cancel_loading()
+        self._open_preview(path, table)
+
+        task = LoadTask(self._read_dataset_task, path, table,
+                        report_progress=True)
+        task.signals.failed.connect(self._close_preview)
+        self._start(task, self._dataset_loaded)
+
+    @Slot(object)
+    def _dataset_loaded(self, result):
+        """Publish a dataset read by read_dataset.
+
+        Args:
+            result: Tuple returned by _read_dataset_task.
+        """
+        path, table, df, projected = result
+
+        self._preview_task = None
+        self._previewing = False
+        self._dataset_path = path
+        self._dataset_table = table
+        self._projected = projected
+        self._loaded_columns = []
+        self._path_label.setText(f"{path}")
+        self._path_label.setToolTip(
+            f"{self._reader.bytes_saved / 1024 ** 2:.1f} MB saved by "
+            "compacting column types"
+        )
+        self.file_selected.emit(df)
+        self.hide_show.emit(True)
+
+    def load_columns(self, columns: list) -> bool:
+        """Load only the given columns of a dataset read in two phases.
+
+        The columns are read in a worker thread and columns_loaded is
+        emitted with the projected DataFrame when they are ready.
+
+        Args:
+            columns: Names of the columns to load.
+
+        Returns:
+            True if a load was started, False if the dataset was fully
+            loaded or the columns are already loaded.
         """
-        reader = FileReader()
+        if not self._projected or columns == self._loaded_columns:
+            return False
 
-        try:
-            df = reader.parse_file(path)
-            self.file_selected.emit(df)
-            self.hide_show.emit(True)
-        except Exception as e:
-            helper.show_error_message(f"ERROR: {e}")
-            raise ParseError('couldn not read file')
+        task = LoadTask(self._reader.parse_file, self._dataset_path,
+                        chunk_size=CHUNK_SIZE, columns=list(columns),
+                        optimize=True, table=self._dataset_table,
+                        report_progress=True)
+        task.signals.finished.connect(
+            lambda _, c=list(columns): setattr(self, '_loaded_columns', c)
+        )
+        self._start(task, self.columns_loaded.emit)
+        return True
 
     def _load_model_event(self):
         """Open a file dialog to select and load a model file.
@@ -131,7 +432,7 @@ class ChooseFile(QWidget):
         the user interface.
         """
         options = QFileDialog.Options()
-        allowed_extensions = "Compatible files (*.joblib)"
+        allowed_extensions = "Compatible files (*.tlm *.joblib)"
         file_path, _ = QFileDialog.getOpenFileName(
             self,
             "Select File: ",
@@ -141,10 +442,19 @@ class ChooseFile(QWidget):
         )
 
         if file_path:
-            try:
-                model = load_model(file_path=file_path)
-                self._path_label.setText(f"{file_path}")
-                self.hide_show.emit(False)
-                self.loaded_model.emit(model)
-            except Exception:
-                helper.show_error_message(f"Could not read model file")
\ No newline at end of file
+            task = LoadTask(load_model, file_path=file_path)
+            self._start(
+                task,
+                lambda model, path=file_path: self._model_loaded(path, model)
+            )
+
+    def _model_loaded(self, path: str, model: Model) -> None:
+        """Publish a model read by _load_model_event.
+
+        Args:
+            path: The path of the model file.
+            model: The loaded model.
+        """
+        self._path_label.setText(f"{path}")
+        self.hide_show.emit(False)
+        self.loaded_model.emit(model)
\ No newline at end of file
@@ -0,0 +1,67 @@
+"""Module for displaying the regressions between every pair of columns."""
+
+# Standard library imports
+import pandas as pd
+
+# Third-party imports
+from PySide6.QtCore import Qt, Signal
+from PySide6.QtWidgets import QDialog, QHeaderView, QVBoxLayout
+
+# Local imports
+from user_interface import ui_helpers as helper
+from user_interface.VirtualTable import VirtualTableModel, VirtualTableView
+
+
+class PairsDialog(QDialog):
+    """Dialog listing the fit of every pair of numeric columns.
+
+    The fits are shown in a virtual table that can be sorted by clicking
+    on its headers, best R² first. Double-clicking a row selects its pair
+    of columns.
+
+    Signals:
+        pair_selected: Emitted with the input and output column names
+    """
+
+    pair_selected = Signal(str, str)
+
+    def __init__(self, pairs: pd.DataFrame, parent=None):
+        """Initialize the dialog.
+
+        Args:
+            pairs: DataFrame returned by fit_all_pairs.
+            parent: Parent widget (optional).
+        """
+        super().__init__(parent)
+        self.setWindowTitle('All Pairs')
+        self.resize(800, 500)
+
+        layout = QVBoxLayout()
+
+        self._summary = helper.create_label(
+            text=f'{len(pairs)} pairs fitted, double-click a row to '
+                 'select its columns'
+        )
+
+        self._table = VirtualTableView(VirtualTableModel(pairs))
+        self._table.horizontalHeader().setSectionResizeMode(
+            QHeaderView.Stretch
+        )
+        self._table.horizontalHeader().setSortIndicator(
+            list(pairs.columns).index('r2'), Qt.DescendingOrder
+        )
+        self._table.setSortingEnabled(True)
+        self._table.doubleClicked.connect(self._on_double_click)
+
+        helper.set_layout(layout=layout, items=[self._summary, self._table])
+        self.setLayout(layout)
+
+    def _on_double_click(self, index):
+        """Emit the pair of columns of the clicked row.
+
+        Args:
+            index: Index of the clicked cell.
+        """
+        pair = self._table.model().row(index.row())
+        self.pair_selected.emit(str(pair['x']), str(pair['y']))
+        self.accept()
@@ -1,12 +1,17 @@
 """Module for making predictions with created or loaded models.
 
 This module contains the widget that allows users to make predictions
-with a created or loaded model.
+with a created or loaded model, for values typed in or for every row of
+a file.
 """
 
+import copy
 import os
 import sys
 from PySide6.QtWidgets import (
+    QFileDialog,
+    QMessageBox,
+    QProgressBar,
     QWidget,
     QLabel,
     QVBoxLayout,
@@ -22,6 +27,8 @@ sys.path.append(repo_root)
 
 import user_interface.ui_helpers as helper
 from src.data_management import Model
+from data_management.scoring import score_file
+from user_interface.loader import LoadTask, start_task
 
 
 class Predict(QWidget):
@@ -48,32 +55,42 @@ class Predict(QWidget):
 
         # Initialize instance variables
         self._model = None
-        self._x_label = QLabel()
-        self._x_label.setObjectName('prediction')
-        self._x_input = helper.create_text_box(enabled=True)
-        self._x_input.setPlaceholderText('Enter a value.')
+        self._x_labels = []
+        self._x_inputs = []
         self._result_label = QLabel()
         self._result_label.setObjectName('prediction')
         self._predict_button = helper.create_button(
             text='Predict',
             event=self._predict
         )
+        self._score_button = helper.create_button(
+            text='Score File',
+            event=self._score_file
+        )
+        self._cancel_button = helper.create_button(
+            text='Cancel',
+            event=self._cancel_scoring
+        )
+        self._cancel_button.setVisible(False)
+        self._progress_bar = QProgressBar()
+        self._progress_bar.setVisible(False)
+        self._task = None
 
         # Create button layout
         button_layout = QHBoxLayout()
+        button_layout.addWidget(self._progress_bar)
+        button_layout.addWidget(self._cancel_button)
+        button_layout.addWidget(self._score_button)
         button_layout.addWidget(self._predict_button)
         button_layout.setAlignment(Qt.AlignRight)
 
-        # Create input layout
-        input_layout = QGridLayout()
-        input_layout.addWidget(self._x_label, 0, 0)
-        input_layout.addWidget(self._x_input, 0, 1)
-        input_layout.addWidget(self._result_label, 1, 0, 1, 1)
-        
+        # Create input layout, with one row per input of the model
+        self._input_layout = QGridLayout()
+
         # Set main layout components
         helper.set_layout(
             layout=layout,
-            items=[input_layout, button_layout]
+            items=[self._input_layout, self._result_label, button_layout]
         )
 
         layout.setAlignment(Qt.AlignCenter)
@@ -87,20 +104,101 @@ class Predict(QWidget):
             model (Model): New model to use for predictions.
         """
         self._model = model
-        text = f"{self._model.x_name}:"
-        self._x_label.setText(text)
-        self._x_input.setText('')
+
+        for widget in self._x_labels + self._x_inputs:
+            self._input_layout.removeWidget(widget)
+            widget.deleteLater()
+        self._x_labels = []
+        self._x_inputs = []
+
+        for row, name in enumerate(self._model.x_names):
+            label = QLabel(f"{name}:")
+            label.setObjectName('prediction')
+            text_box = helper.create_text_box(enabled=True)
+            text_box.setPlaceholderText('Enter a value.')
+            self._input_layout.addWidget(label, row, 0)
+            self._input_layout.addWidget(text_box, row, 1)
+            self._x_labels.append(label)
+            self._x_inputs.append(text_box)
+
         self._result_label.setText('')
 
     def _predict(self) -> None:
-        """Make a prediction using the current model and input value."""
-        input_value = self._x_input.text()
-        
+        """Make a prediction using the current model and input values."""
         try:
-            prediction = (self._model.slope * float(input_value) +
-                         self._model.intercept)
+            values = [float(text_box.text()) for text_box in self._x_inputs]
+            prediction = self._model.predict(values)
             self._result_label.setText(
                 f'{self._model.y_name}: {prediction:.3f}'
             )
         except ValueError:
-            helper.show_error_message('you must enter a valid number')
\ No newline at end of file
+            helper.show_error_message('you must enter a valid number')
+
+    def _score_file(self) -> None:
+        """Write the predictions for every row of a file to a CSV file.
+
+        The file is scored chunk by chunk in a worker thread, with a copy
+        of the model so a model generated meanwhile does not change the
+        predictions part-way through the file.
+        """
+        input_file, _ = QFileDialog.getOpenFileName(
+            self,
+            "Select File to Score",
+            "",
+            "Compatible files (*.csv *.xlsx *.xls *.sqlite *.db)"
+        )
+        if not input_file:
+            return
+
+        output_file, _ = QFileDialog.getSaveFileName(
+            self,
+            "Save Predictions",
+            "",
+            "CSV Files (*.csv)"
+        )
+        if not output_file:
+            return
+
+        # Fitting rebinds the attributes of the model, so a shallow copy
+        # keeps the current coefficients without copying the fitted data
+        task = LoadTask(score_file, copy.copy(self._model), input_file,
+                        output_file, report_progress=True)
+        task.signals.progress.connect(self._show_progress)
+        for signal in (task.signals.finished, task.signals.failed,
+                       task.signals.cancelled):
+            signal.connect(lambda *_: self._set_scoring(False))
+        task.signals.finished.connect(
+            lambda rows: QMessageBox.information(
+                self, "Scoring File", f"{rows} rows scored"))
+        task.signals.failed.connect(
+            lambda message: helper.show_error_message(
+                f'file could not be scored: {message}'))
+
+        self._task = task
+        self._set_scoring(True)
+        start_task(task)
+
+    def _set_scoring(self, scoring: bool) -> None:
+        """Show the progress widgets while a file is being scored.
+
+        Args:
+            scoring: Whether a file is being scored.
+        """
+        self._progress_bar.setRange(0, 0)
+        self._progress_bar.setVisible(scoring)
+        self._cancel_button.setVisible(scoring)
+        self._score_button.setEnabled(not scoring)
+        if not scoring:
+            self._task = None
+
+    @Slot(int, int, int)
+    def _show_progress(self, rows: int, done: int, total: int) -> None:
+        """Update the progress bar with the work done so far."""
+        if total:
+            self._progress_bar.setRange(0, 100)
+            self._progress_bar.setValue(int(100 * done / total))
+
+    def _cancel_scoring(self) -> None:
+        """Cancel the file being scored, if any."""
+        if self._task is not None:
+            self._task.cancel()
@@ -1,30 +1,56 @@
 """Module for preprocessing menu widget implementation."""
 
 from data_management.dataManager import DataManager
+from data_management.imputation import METHODS
 
 from PySide6.QtWidgets import (
     QWidget,
+    QComboBox,
     QGridLayout,
     QMessageBox,
     QButtonGroup,
+    QProgressBar,
+    QSpinBox,
     QVBoxLayout,
     QHBoxLayout,
 )
 from PySide6.QtCore import Signal, Slot, Qt
 import pandas as pd
 import user_interface.ui_helpers as helper
+from user_interface.loader import LoadTask, start_task
+
+
+# Imputation methods of DataManager.impute by their label in the menu
+IMPUTE_METHODS = {
+    'Linear interpolation': 'linear',
+    'Time interpolation': 'time',
+    'Forward fill': 'ffill',
+    'Backward fill': 'bfill',
+    'Group mean': 'group_mean',
+    'Regression': 'regression',
+}
 
 
 class PrepMenu(QWidget):
-    """Widget class for preprocessing options menu."""
+    """Widget class for preprocessing options menu.
 
+    Applied operations can be undone and redone with the Undo and Redo
+    buttons. Imputations run in a worker thread with a progress bar and
+    a cancel button; running emits True when one starts and False when it
+    ends, so the data is not replaced or used meanwhile.
+    """
+
+    running = Signal(bool)
     preprocess_request = Signal()
-    processed_data = Signal(pd.DataFrame)
+    undo_request = Signal()
+    redo_request = Signal()
+    processed_data = Signal(pd.DataFrame, object)
 
     def __init__(self):
         """Initialize the preprocessing menu widget."""
         super().__init__()
         self._manager = DataManager()
+        self._task = None
 
         # Declare layouts
         main_layout = QVBoxLayout()
@@ -54,13 +80,42 @@ class PrepMenu(QWidget):
         self._median_option = helper.create_radio_button(
             text='Replace with median')
         
+        self._impute_option = helper.create_radio_button(
+            text='Impute with')
+
         self._input_number = helper.create_text_box(enabled=False)
         self._input_number.setVisible(False)
+
+        self._method_menu = QComboBox()
+        self._method_menu.addItems(list(IMPUTE_METHODS))
+        self._method_menu.setEnabled(False)
+        self._by_menu = QComboBox()
+        self._by_menu.setToolTip('Time, group or predictor column')
+        self._by_menu.setEnabled(False)
+        self._limit_input = QSpinBox()
+        self._limit_input.setRange(0, 1_000_000)
+        self._limit_input.setSpecialValueText('No limit')
+        self._limit_input.setToolTip(
+            'Largest number of consecutive values filled')
+        self._limit_input.setEnabled(False)
+
+        self._progress_bar = QProgressBar()
+        self._progress_bar.setVisible(False)
+        self._cancel_button = helper.create_button(
+            text='Cancel', event=self.cancel_impute)
+        self._cancel_button.setVisible(False)
         
         self._apply_button = helper.create_button(text='Apply', 
                                                 event=self.on_apply_button)
         self._apply_button.setEnabled(False)
 
+        self._undo_button = helper.create_button(
+            text='Undo', event=self.undo_request.emit)
+        self._undo_button.setEnabled(False)
+        self._redo_button = helper.create_button(
+            text='Redo', event=self.redo_request.emit)
+        self._redo_button.setEnabled(False)
+
     def _setup_button_group(self):
         """Set up button group for radio buttons."""
         self._preprocessing_opts = QButtonGroup()
@@ -68,13 +123,18 @@ class PrepMenu(QWidget):
             self._remove_option,
             self._constant_option,
             self._mean_option,
-            self._median_option
+            self._median_option,
+            self._impute_option
         ]:
             self._preprocessing_opts.addButton(button)
 
     def _setup_signals(self):
         """Connect widget signals."""
         self._constant_option.toggled.connect(self.toggle_input)
+        self._impute_option.toggled.connect(self.toggle_impute)
+        self._method_menu.currentIndexChanged.connect(
+            lambda _: self.toggle_impute(self._impute_option.isChecked())
+        )
 
     def _build_layout(self, main_layout):
         """Build the widget layout."""
@@ -90,8 +150,16 @@ class PrepMenu(QWidget):
         self._opts_layout.addWidget(self._mean_option, 1, 0)
         self._opts_layout.addWidget(self._median_option, 2, 0)
         self._opts_layout.addWidget(self._remove_option, 3, 0)
+        self._opts_layout.addWidget(self._impute_option, 4, 0)
+        self._opts_layout.addWidget(self._method_menu, 4, 1)
+        self._opts_layout.addWidget(self._by_menu, 5, 1)
+        self._opts_layout.addWidget(self._limit_input, 6, 1)
 
         button_layout = QVBoxLayout()
+        button_layout.addWidget(self._undo_button)
+        button_layout.addWidget(self._redo_button)
+        button_layout.addWidget(self._progress_bar)
+        button_layout.addWidget(self._cancel_button)
         button_layout.addWidget(self._apply_button)
         button_layout.setAlignment(Qt.AlignBottom)
 
@@ -115,11 +183,13 @@ class PrepMenu(QWidget):
             self._mean_option,
             self._median_option,
             self._remove_option,
+            self._impute_option,
             self._apply_button
         ]:
             element.setEnabled(enabled)
 
         self.toggle_input(checked=False)
+        self.toggle_impute(checked=False)
         
         # Reset button group selection
         self._preprocessing_opts.setExclusive(False)
@@ -138,6 +208,28 @@ class PrepMenu(QWidget):
         self._input_number.setVisible(checked)
         self._input_number.setText('')
 
+    @Slot(bool)
+    def toggle_impute(self, checked: bool):
+        """Enable the inputs of the selected imputation method.
+
+        Args:
+            checked: Boolean indicating if the imputation option is selected.
+        """
+        method = IMPUTE_METHODS[self._method_menu.currentText()]
+        self._method_menu.setEnabled(checked)
+        self._by_menu.setEnabled(checked and METHODS[method] is not None)
+        self._limit_input.setEnabled(checked and method in {'ffill', 'bfill'})
+
+    @Slot(pd.DataFrame)
+    def update_columns(self, data):
+        """List the columns of the data as time, group or predictor column.
+
+        Args:
+            data: DataFrame whose columns are listed.
+        """
+        self._by_menu.clear()
+        self._by_menu.addItems([str(column) for column in data.columns])
+
     def on_apply_button(self):
         """Handle apply button click."""
         self.preprocess_request.emit()
@@ -150,7 +242,11 @@ class PrepMenu(QWidget):
             manager: DataManager instance to perform operations.
         """
         choice = self._preprocessing_opts.checkedButton()
-        
+
+        if choice is self._impute_option:
+            self._start_impute(columns, manager)
+            return
+
         try:
             if choice is self._remove_option:
                 manager.delete(columns=columns)
@@ -162,14 +258,133 @@ class PrepMenu(QWidget):
                 constant_value = float(self._input_number.text())
                 manager.replace(columns=columns, value=constant_value)
 
-            self.processed_data.emit(manager.data)
-            QMessageBox.information(
-                self,
-                "Successful preprocess",
+            self._processed(
+                manager,
                 f"{columns[0]} and {columns[1]} no longer have null values"
             )
 
         except Exception as e:
             helper.show_error_message(
                 message=f"preprocess could not be completed: {e}"
-            )
\ No newline at end of file
+            )
+
+    def _processed(self, manager: DataManager, message: str):
+        """Publish the data of a completed preprocess.
+
+        Args:
+            manager: DataManager instance holding the processed data.
+            message: Text of the confirmation shown to the user.
+        """
+        self.processed_data.emit(manager.data, manager.last_change)
+        self.update_history(manager)
+        QMessageBox.information(self, "Successful preprocess", message)
+
+    def _start_impute(self, columns, manager: DataManager):
+        """Impute the selected columns in a worker thread.
+
+        The worker only computes the imputed values; they are written to
+        the manager on the main thread once the task has finished.
+
+        Args:
+            columns: List of columns to impute.
+            manager: DataManager instance to perform the imputation.
+        """
+        method = IMPUTE_METHODS[self._method_menu.currentText()]
+        by = self._by_menu.currentText() if self._by_menu.isEnabled() else None
+        limit = self._limit_input.value() or None
+
+        task = LoadTask(manager.compute_imputation, list(columns), method,
+                        by=by, limit=limit, report_progress=True)
+        task.signals.progress.connect(self._show_progress)
+        for signal in (task.signals.finished, task.signals.failed,
+                       task.signals.cancelled):
+            signal.connect(lambda *_: self._set_running(False, manager))
+        task.signals.finished.connect(
+            lambda fills: self._imputed(columns, manager, fills))
+        task.signals.failed.connect(
+            lambda message: helper.show_error_message(
+                message=f"preprocess could not be completed: {message}"))
+
+        self._task = task
+        self._set_running(True, manager)
+        start_task(task)
+
+    def _imputed(self, columns, manager: DataManager, fills):
+        """Write and publish the values of a completed imputation.
+
+        Args:
+            columns: List of imputed columns.
+            manager: DataManager instance that computed the values.
+            fills: Imputed values, as returned by compute_imputation.
+        """
+        manager.apply_imputation(fills)
+        remaining = sum(manager.detect(column) for column in columns)
+        if remaining:
+            message = f"{remaining} null values could not be imputed"
+        else:
+            message = (f"{columns[0]} and {columns[1]} no longer have "
+                       "null values")
+        self._processed(manager, message)
+
+    def _set_running(self, running: bool, manager: DataManager):
+        """Show the progress widgets while an imputation is running.
+
+        The history cannot be changed until the imputation ends, and the
+        running signal tells the other widgets to leave the data alone.
+
+        Args:
+            running: Whether an imputation is running.
+            manager: DataManager instance performing the imputation.
+        """
+        self._progress_bar.setRange(0, 0)
+        self._progress_bar.setVisible(running)
+        self._cancel_button.setVisible(running)
+        self._apply_button.setEnabled(not running)
+        if running:
+            self._undo_button.setEnabled(False)
+            self._redo_button.setEnabled(False)
+        else:
+            self._task = None
+            self.update_history(manager)
+        self.running.emit(running)
+
+    @Slot(int, int, int)
+    def _show_progress(self, rows: int, done: int, total: int):
+        """Update the progress bar with the work done so far."""
+        if total:
+            self._progress_bar.setRange(0, 100)
+            self._progress_bar.setValue(int(100 * done / total))
+
+    def cancel_impute(self):
+        """Cancel the running imputation, if any."""
+        if self._task is not None:
+            self._task.cancel()
+
+    def undo(self, manager: DataManager):
+        """Undo the last preprocessing operation.
+
+        Args:
+            manager: DataManager instance holding the history.
+        """
+        if manager.undo():
+            self.processed_data.emit(manager.data, manager.last_change)
+        self.update_history(manager)
+
+    def redo(self, manager: DataManager):
+        """Apply again the last undone preprocessing operation.
+
+        Args:
+            manager: DataManager instance holding the history.
+        """
+        if manager.redo():
+            self.processed_data.emit(manager.data, manager.last_change)
+        self.update_history(manager)
+
+    def update_history(self, manager: DataManager):
+        """Enable the undo and redo buttons according to the history.
+
+        Args:
+            manager: DataManager instance holding the history.
+        """
+        self._undo_button.setEnabled(manager.can_undo)
+        self._redo_button.setEnabled(manager.can_redo)
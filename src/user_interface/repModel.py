@@ -126,7 +126,7 @@ class RepModel(QWidget):
             self,
             "Save Model",
             "",
-            "Joblib Files (*.joblib)"
+            "TrendLine Models (*.tlm)"
         )
         
         if not file_path:
@@ -142,7 +142,11 @@ class RepModel(QWidget):
                 mse=self._model.mse,
                 description=self.description_input.toPlainText(),
                 slope=self._model.slope,
-                intercept=self._model.intercept
+                intercept=self._model.intercept,
+                inputs=self._model.x_names,
+                coefficients=self._model.coefficients,
+                degree=self._model.degree or 1,
+                statistics=self._model.statistics
             )
             QMessageBox.information(
                 self,